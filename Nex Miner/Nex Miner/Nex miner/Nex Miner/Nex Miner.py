@@ -22,6 +22,13 @@ from data.scripts.anim_loader import AnimationManager
 from data.scripts.text import Font
 from data.scripts.core_funcs import load_img, write_f
 from data.scripts.gemini_agent import GeminiAgent
+from data.scripts.ai_backends import create_backend
+from data.scripts.directive_pool import DirectivePool
+from data.scripts.asset_bundle import BUNDLE_PATH, mount_bundle, load_image, open_asset, asset_exists, list_dir
+from data.scripts.sound_manager import SoundManager, MusicPlayer, create_audio_backend
+from data.scripts.quality import EffectBudget
+from data.scripts.debug_stats import DebugStats
+from data.scripts.config_schema import ConfigError, validate_config, validate_references, compile_biome, compile_flags
 from data.scripts.game_states.boot_up_state import BootUpState
 from dotenv import load_dotenv # <--- ADD THIS LINE
 
@@ -35,8 +42,12 @@ class Game:
     and state management.
     """
     def __init__(self):
+        # Packed assets from `python -m data.scripts.asset_bundle`, if they were built
+        mount_bundle(self.get_path(*BUNDLE_PATH), BASE_DIR)
         self.load_configs()
         self.save_data = self.load_save()
+        # Quality level: particle budget and which optional effects are drawn
+        self.effects = EffectBudget(self.save_data['settings'].get('quality', 'auto'))
 
         pygame.mixer.pre_init(44100, -16, 2, 512)
         pygame.init()
@@ -60,17 +71,30 @@ class Game:
         self.clock = pygame.time.Clock()
 
         # AI Agent Initialization
+        # NEX_AI_BACKEND=local swaps Gemini for the offline template backend (tests, CI, benchmarks).
         try:
             api_key = os.environ.get("GEMINI_API_KEY")
-            self.ai_agent = GeminiAgent(api_key=api_key)
+            backend_name = os.environ.get("NEX_AI_BACKEND", "gemini")
+            backend_options = {}
+            if backend_name == 'local':
+                backend_options = {
+                    'perk_ids': list(self.perks.keys()),
+                    'latency': float(os.environ.get("NEX_AI_LATENCY", 0)),
+                    'seed': int(os.environ.get("NEX_AI_SEED", 0)),
+                }
+            self.ai_agent = GeminiAgent(backend=create_backend(backend_name, api_key=api_key, **backend_options))
         except Exception as e:
             print(f"--- AI AGENT FAILED TO INITIALIZE ---")
             print(f"Error: {e}")
             print(f"Please ensure you have a valid Gemini API key set as an environment variable (GEMINI_API_KEY) or in the main game script.")
             self.ai_agent = None 
+        self.directive_pool = DirectivePool(self)
             
         # State Management
         self.states = []
+        self.last_frame_state = None # The state that drew what's in self.display
+        self.last_frame_overlay = False # Whether the debug overlay is drawn over it
+        self.present_full = True # Next frame goes to the window whole, even for a DIRTY_RECTS state
         self.time_meter_max = 120
         self.COMBO_DURATION = 180
         
@@ -91,12 +115,16 @@ class Game:
         self.apply_settings()
         self.upgrade_keys = list(self.upgrades.keys())
         self.unlock_notifications = set()
+        # F3 toggles the overlay. NEX_DEBUG_DUMP=<file> appends a JSON snapshot every NEX_DEBUG_INTERVAL seconds
+        self.debug = DebugStats(self, dump_path=os.environ.get("NEX_DEBUG_DUMP"), dump_interval=float(os.environ.get("NEX_DEBUG_INTERVAL", 30)),
+                                overlay=os.environ.get("NEX_DEBUG_OVERLAY") == "1")
 
     def update_window_mode(self):
         resizable = self.save_data['settings'].get('resizable_window', False)
         flags = RESIZABLE if resizable else 0
         default_size = (self.DISPLAY_SIZE[0] * self.SCALE, self.DISPLAY_SIZE[1] * self.SCALE)
         self.screen = pygame.display.set_mode(default_size, flags, 32)
+        self.present_full = True
         
     def notify_unlock(self, category):
         self.unlock_notifications.add(category)
@@ -127,49 +155,68 @@ class Game:
                 'artifacts': self.get_path('data', 'configs', 'artifacts.json'),
             }
             for name, path in config_paths.items():
-                if not os.path.exists(path):
+                if not asset_exists(path):
                     print(f"FATAL ERROR: Config file not found at {path}. Exiting.")
                     pygame.quit()
                     sys.exit()
-            with open(config_paths['upgrades'], 'r') as f: self.upgrades = json.load(f)
-            with open(config_paths['perks'], 'r') as f: self.perks = json.load(f)
-            with open(config_paths['biomes'], 'r') as f: self.biomes = json.load(f)
-            with open(config_paths['characters'], 'r') as f: self.characters = json.load(f)
-            with open(config_paths['curses'], 'r') as f: self.curses = json.load(f)
-            with open(config_paths['challenges'], 'r') as f: self.challenges = json.load(f)
-            with open(config_paths['artifacts'], 'r') as f: self.artifacts = json.load(f)
+            with open_asset(config_paths['upgrades']) as f: self.upgrades = json.load(f)
+            with open_asset(config_paths['perks']) as f: self.perks = json.load(f)
+            with open_asset(config_paths['biomes']) as f: self.biomes = json.load(f)
+            with open_asset(config_paths['characters']) as f: self.characters = json.load(f)
+            with open_asset(config_paths['curses']) as f: self.curses = json.load(f)
+            with open_asset(config_paths['challenges']) as f: self.challenges = json.load(f)
+            with open_asset(config_paths['artifacts']) as f: self.artifacts = json.load(f)
         except (json.JSONDecodeError) as e:
             print(f"FATAL ERROR: Could not parse a JSON config file. It may have a syntax error. Reason: {e}")
             pygame.quit()
             sys.exit()
 
+        configs = {name: getattr(self, name) for name in config_paths}
+        try:
+            for name, data in configs.items(): validate_config(name, data)
+            validate_references(configs)
+        except ConfigError as e:
+            print(f"FATAL ERROR: Invalid config file. {e}")
+            pygame.quit()
+            sys.exit()
+
+        # Read-only views for gameplay hot paths; the raw dicts above stay around for the menus
+        self.compiled_biomes = tuple(compile_biome(biome) for biome in self.biomes)
+        self.perk_bits = compile_flags(self.perks)
+        self.curse_bits = compile_flags(self.curses)
+        self.spawn_samplers = {} # (biome index, disabled tiles, curse mask) -> compile_spawn_sampler() result
+
     def load_assets(self):
         anim_path = self.get_path('data', 'images', 'animations')
         self.animation_manager = AnimationManager(anim_path)
         self.white_font = Font(self.get_path('data', 'fonts', 'small_font.png'), (251, 245, 239))
         self.black_font = Font(self.get_path('data', 'fonts', 'small_font.png'), (0, 0, 1))
         self.backgrounds = {}
+        self.background_cache = {} # (far path, near path) -> load_biome_bgs() layers, kept for the session
         sfx_dir = self.get_path('data', 'sfx')
-        self.sounds = {}
-        for sound_filename in os.listdir(sfx_dir):
+        # NEX_AUDIO_BACKEND=null mutes sound effects (headless runs, benchmarks)
+        audio_backend = os.environ.get("NEX_AUDIO_BACKEND", "mixer") if pygame.mixer.get_init() else 'null'
+        self.sounds = SoundManager(create_audio_backend(audio_backend))
+        for sound_filename in list_dir(sfx_dir):
             if sound_filename.endswith(('.wav', '.ogg')):
                 sound_name = os.path.splitext(sound_filename)[0]
-                self.sounds[sound_name] = pygame.mixer.Sound(os.path.join(sfx_dir, sound_filename))
-
-        # --- FIX: Create fallback aliases for sounds to prevent crashes if files are missing. ---
-        self.sounds.setdefault('upgrade', self.sounds.get('chest_open'))
-        self.sounds.setdefault('super_jump', self.sounds.get('jump'))
-        self.sounds.setdefault('collect_item', self.sounds.get('coin'))
-        self.sounds.setdefault('coin_end', self.sounds.get('coin'))
-        self.sounds.setdefault('time_slow_start', self.sounds.get('warp'))
-        self.sounds.setdefault('time_slow_end', self.sounds.get('chest_open'))
-        self.sounds.setdefault('time_empty', self.sounds.get('death'))
-        self.sounds.setdefault('land', self.sounds.get('death'))
-        self.sounds.setdefault('directive_complete', self.sounds.get('upgrade', self.sounds.get('chest_open')))
-        self.sounds.setdefault('artifact_equip', self.sounds.get('coin'))
-        self.sounds.setdefault('shoot', self.sounds.get('jump'))
-        # --- ADDED THIS LINE to prevent the crash ---
-        self.sounds.setdefault('combo_end', self.sounds.get('coin_end'))
+                self.sounds.load(sound_name, os.path.join(sfx_dir, sound_filename))
+
+        # Fallback aliases for sounds without a file of their own
+        self.sounds.alias('upgrade', 'chest_open')
+        self.sounds.alias('super_jump', 'jump')
+        self.sounds.alias('explosion', 'super_jump')
+        self.sounds.alias('collect_item', 'coin')
+        self.sounds.alias('coin_end', 'coin')
+        self.sounds.alias('time_slow_start', 'warp')
+        self.sounds.alias('time_slow_end', 'chest_open')
+        self.sounds.alias('time_empty', 'death')
+        self.sounds.alias('land', 'death')
+        self.sounds.alias('directive_complete', 'upgrade')
+        self.sounds.alias('artifact_equip', 'coin')
+        self.sounds.alias('shoot', 'jump')
+        self.sounds.alias('combo_end', 'coin_end')
+        self.sounds.load_in_background()
 
 
         self.item_icons = {
@@ -187,31 +234,55 @@ class Game:
                 icon_path = self.get_path('data', 'images', 'perk_icons', f'{perk_name}.png')
                 self.perk_icons[perk_name] = load_img(icon_path)
             except pygame.error: pass
-        pygame.mixer.music.load(self.get_path('data', 'music.mp3'))
-        pygame.mixer.music.play(-1)
+        self.music = MusicPlayer()
+        self.play_biome_music(None)
         
     def apply_settings(self):
         sfx_vol = self.save_data['settings'].get('sfx_volume', 1.0)
-        for name, sound in self.sounds.items():
-            original_vol = self.original_volumes.get(name, 1.0)
-            if sound: sound.set_volume(original_vol * sfx_vol)
+        self.sounds.set_volumes(self.original_volumes, sfx_vol)
         music_vol = self.save_data['settings'].get('music_volume', 1.0)
-        pygame.mixer.music.set_volume(music_vol)
+        self.music.set_volume(music_vol)
+
+    def get_music_path(self, biome_index):
+        music = self.compiled_biomes[biome_index].music if biome_index is not None else None
+        return self.get_path(*music.replace('\\', '/').split('/')) if music else self.get_path('data', 'music.mp3')
+
+    def play_biome_music(self, biome_index):
+        """Switches to the biome's track (None for the menu track) and preloads the next biome's."""
+        self.music.play(self.get_music_path(biome_index))
+        next_index = 0 if biome_index is None else biome_index + 1
+        if next_index < len(self.compiled_biomes): self.music.preload(self.get_music_path(next_index))
 
     def load_biome_bgs(self, biome_info):
-        try:
-            far_path_components = biome_info['bg_layers'][0].replace('\\', '/').split('/')
-            near_path_components = biome_info['bg_layers'][1].replace('\\', '/').split('/')
-            bg_far_path = self.get_path(*far_path_components)
-            bg_near_path = self.get_path(*near_path_components)
-            far_surf = pygame.image.load(bg_far_path).convert()
-            self.backgrounds['far'] = pygame.transform.scale(far_surf, self.DISPLAY_SIZE)
-            near_surf = pygame.image.load(bg_near_path).convert()
-            near_surf.set_colorkey((0,0,0))
-            self.backgrounds['near'] = pygame.transform.scale(near_surf, self.DISPLAY_SIZE)
-        except (pygame.error, FileNotFoundError) as e:
-            print(f"Warning: Could not load background for biome {biome_info['name']}. Reason: {e}")
-            self.backgrounds['far'], self.backgrounds['near'] = None, None
+        """
+        Sets self.backgrounds to the biome's parallax layers. Each layer is a strip of
+        the display-sized image stacked twice, so any scroll offset is one blit of a
+        DISPLAY_SIZE window of it. 'near' is colorkeyed (RLE encoded), 'far' is opaque.
+        'same' is set when both layers come from the same file. Layers are built once
+        per file pair and reused across biome changes and runs.
+        """
+        far_path, near_path = biome_info['bg_layers'][0], biome_info['bg_layers'][1]
+        key = (far_path, near_path)
+        if key not in self.background_cache:
+            try:
+                scaled = {} # Both layers are usually the same file; decode and scale it once
+                for path in key:
+                    if path not in scaled:
+                        bg_path = self.get_path(*path.replace('\\', '/').split('/'))
+                        scaled[path] = pygame.transform.scale(load_image(bg_path).convert(), self.DISPLAY_SIZE)
+                layers = {'far': self.make_background_strip(scaled[far_path]), 'near': self.make_background_strip(scaled[near_path], colorkey=(0, 0, 0)), 'same': far_path == near_path}
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Warning: Could not load background for biome {biome_info['name']}. Reason: {e}")
+                layers = {'far': None, 'near': None, 'same': False}
+            self.background_cache[key] = layers
+        self.backgrounds = self.background_cache[key]
+
+    def make_background_strip(self, img, colorkey=None):
+        w, h = img.get_size()
+        strip = pygame.Surface((w, h * 2)).convert()
+        strip.blit(img, (0, 0)); strip.blit(img, (0, h))
+        if colorkey is not None: strip.set_colorkey(colorkey, pygame.RLEACCEL)
+        return strip
 
     def load_save(self):
         SAVE_FILE = self.get_path('save.json')
@@ -224,6 +295,7 @@ class Game:
                 data['settings'].setdefault("music_volume", 1.0)
                 data['settings'].setdefault("screen_shake", True)
                 data['settings'].setdefault("resizable_window", False)
+                data['settings'].setdefault("quality", "auto")
                 if 'characters' not in data: data['characters'] = {}
                 data['characters'].setdefault("unlocked", ["operator"])
                 data['characters'].setdefault("selected", "operator")
@@ -243,6 +315,7 @@ class Game:
                 data['artifacts'].setdefault("unlocked", [])
                 data['artifacts'].setdefault("equipped", None)
                 data.setdefault('active_directive', None)
+                data.setdefault('directive_pool', [])
                 # --- NEW: Add generated_character field ---
                 data.setdefault('generated_character', None)
                 return data
@@ -251,13 +324,14 @@ class Game:
                 "banked_coins": 100, 
                 "upgrades": {key: 0 for key in self.upgrades}, 
                 "high_score": 0,
-                "settings": {"sfx_volume": 1.0, "music_volume": 1.0, "screen_shake": True, "resizable_window": False},
+                "settings": {"sfx_volume": 1.0, "music_volume": 1.0, "screen_shake": True, "resizable_window": False, "quality": "auto"},
                 "characters": {"unlocked": ["operator"], "selected": "operator"},
                 "compendium": {"perks": [], "curses": [], "items": []},
                 "stats": {"play_time": 0, "total_coins": 0, "runs_started": 0, "daily_challenge_high_score": 0},
                 "biomes_unlocked": ["Sector 01: The Core"],
                 "artifacts": {"unlocked": [], "equipped": None},
                 "active_directive": None,
+                "directive_pool": [],
                 "generated_character": None
             }
             self.write_save(default_save)
@@ -272,6 +346,7 @@ class Game:
         last_time = pygame.time.get_ticks()
         while True:
             current_time = pygame.time.get_ticks()
+            self.effects.frame_start()
             dt = (current_time - last_time) / 1000.0
             last_time = current_time
 
@@ -282,26 +357,42 @@ class Game:
                 if event.type == VIDEORESIZE:
                     if self.save_data['settings'].get('resizable_window', False):
                         self.screen = pygame.display.set_mode(event.size, RESIZABLE, 32)
+                    self.present_full = True
+                elif event.type in (VIDEOEXPOSE, WINDOWEXPOSED):
+                    self.present_full = True
+                elif event.type == KEYDOWN and event.key == K_F3:
+                    self.debug.toggle_overlay()
+                    self.present_full = True
             
             current_state = self.get_current_state()
             if not current_state: break
 
             current_state.handle_events(events)
             current_state.update()
+            self.debug.update(current_state)
+
+            # None is a full redraw; an empty list means nothing on screen changed
+            dirty_rects = current_state.take_dirty_rects() if current_state.DIRTY_RECTS else None
+            if self.debug.overlay: dirty_rects = None # Its numbers change under any state
+            if current_state is not self.last_frame_state: self.present_full = True # The window shows another state
+            if dirty_rects == [] and not self.present_full:
+                self.clock.tick(60)
+                continue
 
             self.display.fill((0, 0, 1))
             current_state.render(self.display)
+            if self.debug.overlay: self.debug.render_overlay(self.display, current_state)
+            self.last_frame_state = current_state
+            self.last_frame_overlay = self.debug.overlay
 
             render_offset = [0, 0]
-            if self.save_data['settings'].get('screen_shake', True):
+            if self.save_data['settings'].get('screen_shake', True) and self.effects.screen_shake:
                 screen_shake = getattr(current_state, 'screen_shake', 0)
                 if screen_shake > 0:
                     render_offset[0] = random.randint(0, int(screen_shake)) - int(screen_shake) // 2
                     render_offset[1] = random.randint(0, int(screen_shake)) - int(screen_shake) // 2
             
             # --- MODIFIED: Replaced rendering logic for fixed aspect ratio ---
-            self.screen.fill((0, 0, 0)) # Fill window with black for letter/pillarboxing
-
             # Calculate the scaled dimensions while maintaining the aspect ratio
             win_w, win_h = self.screen.get_size()
             
@@ -315,20 +406,61 @@ class Game:
             # Center the scaled surface in the window
             x_pos = (win_w - new_w) // 2
             y_pos = (win_h - new_h) // 2
-            
-            # Apply screen shake to the final blit position
-            blit_pos = (x_pos + render_offset[0], y_pos + render_offset[1])
 
-            # Scale the game surface and blit it
-            scaled_surf = pygame.transform.scale(self.display, (new_w, new_h))
-            self.screen.blit(scaled_surf, blit_pos)
-            pygame.display.update()
+            # Regions can only be scaled on their own when every display pixel covers a
+            # whole block of window pixels; otherwise they'd land on a different grid
+            scale = new_w // self.DISPLAY_SIZE[0]
+            if (dirty_rects is not None and not self.present_full and render_offset == [0, 0]
+                    and (new_w, new_h) == (self.DISPLAY_SIZE[0] * scale, self.DISPLAY_SIZE[1] * scale)):
+                self.present_rects(dirty_rects, scale, (x_pos, y_pos))
+            else:
+                self.screen.fill((0, 0, 0)) # Fill window with black for letter/pillarboxing
+
+                # Apply screen shake to the final blit position
+                blit_pos = (x_pos + render_offset[0], y_pos + render_offset[1])
+
+                # Scale the game surface and blit it
+                scaled_surf = pygame.transform.scale(self.display, (new_w, new_h))
+                self.screen.blit(scaled_surf, blit_pos)
+                pygame.display.update()
+                self.present_full = False
+            self.effects.frame_end()
             self.clock.tick(60)
 
+    def present_rects(self, rects, scale, offset):
+        """ Scales just `rects` of the display into the window and updates only those. """
+        display_rect = self.display.get_rect()
+        updated = []
+        for rect in rects:
+            rect = rect.clip(display_rect)
+            if not rect.w or not rect.h: continue
+            window_rect = pygame.Rect(offset[0] + rect.x * scale, offset[1] + rect.y * scale, rect.w * scale, rect.h * scale)
+            pygame.transform.scale(self.display.subsurface(rect), window_rect.size, self.screen.subsurface(window_rect))
+            updated.append(window_rect)
+        if updated: pygame.display.update(updated)
+
+    def capture_frame(self, state, tint=None):
+        """
+        Background for an overlay state: a copy of the last frame `state` presented,
+        which is still in self.display until the next render. Only if another state
+        drew that frame, or the debug overlay is drawn over it, is `state` rendered
+        again. tint, an RGBA color, is blended over the copy here once, so the
+        overlay doesn't have to every frame.
+        """
+        frame = self.display.copy()
+        if self.last_frame_state is not state or self.last_frame_overlay:
+            state.render(frame)
+        if tint:
+            overlay = pygame.Surface(self.DISPLAY_SIZE, pygame.SRCALPHA)
+            overlay.fill(tint)
+            frame.blit(overlay, (0, 0))
+        return frame
+
     def get_current_state(self):
         return self.states[-1] if self.states else None
 
     def push_state(self, new_state):
+        self.animation_manager.prefetch(new_state.ANIMATIONS)
         if self.states:
             self.states[-1].exit_state()
         new_state.enter_state()
@@ -0,0 +1,137 @@
+# data/scripts/ai_backends.py
+import json
+import random
+import re
+import time
+import zlib
+
+# Items the gameplay state knows how to use. Kept here so the local backend
+# doesn't need the loaded item icons to build a starting loadout.
+DEFAULT_ITEMS = ['cube', 'warp', 'jump', 'bomb', 'freeze', 'shield', 'hourglass']
+
+
+class GeminiBackend:
+    """ Sends prompts to the Google Gemini API. """
+    def __init__(self, api_key):
+        # Imported here so the game (and the local backend) still work on machines
+        # without the google-generativeai package installed.
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel('gemini-1.5-flash')
+
+    def generate(self, prompt, request_type='chat'):
+        return self.model.generate_content(prompt).text
+
+    def generate_stream(self, prompt, request_type='chat'):
+        for chunk in self.model.generate_content(prompt, stream=True):
+            yield chunk.text
+
+
+class LocalBackend:
+    """
+    Offline stand-in for the Mainframe. Builds directives and characters from
+    templates, so the UI and save flows can run without a network connection.
+    Output is deterministic for a given seed and sequence of prompts.
+    """
+    DIRECTIVE_TEMPLATES = [
+        {'objective_type': 'collect_coins', 'values': [40, 60, 80, 120], 'flavor_text': "Siphon {value} nanocoins from the data-stream."},
+        {'objective_type': 'destroy_tiles_dash', 'values': [5, 8, 12], 'flavor_text': "Purge {value} corrupted data-blocks with a dash."},
+        {'objective_type': 'reach_combo', 'values': [5, 8, 10, 15], 'flavor_text': "Push the Overclock past {value}x efficiency."},
+    ]
+    REWARD_ITEMS = ['shield', 'bomb', 'warp', 'jump', 'freeze', 'hourglass']
+    CHAT_LINES = [
+        "The tower remembers every fall. Climb with purpose, Operative.",
+        "Chests reward the bold. Dash through the falling blocks to feed your Overclock.",
+        "Energy is finite. Spend your Focus on dashes that matter.",
+        "The deeper sectors reward those who keep their Overclock alive.",
+    ]
+    NAME_PREFIXES = ['Null', 'Vector', 'Echo', 'Cipher', 'Flux', 'Static']
+    NAME_SUFFIXES = ['Runner', 'Warden', 'Drifter', 'Shade', 'Seeker', 'Breaker']
+    # Keywords in the player's answer that steer the generated perks.
+    THEME_PERKS = {
+        'greed': 'greedy', 'coin': 'greedy', 'rich': 'greedy',
+        'fast': 'acrobat', 'speed': 'acrobat', 'run': 'acrobat',
+        'destroy': 'overcharge', 'explode': 'overcharge',
+        'safe': 'safeguard', 'careful': 'safeguard', 'protect': 'safeguard',
+        'fall': 'feather_fall', 'fly': 'feather_fall',
+        'smart': 'module_recycler', 'tech': 'technician',
+    }
+
+    def __init__(self, perk_ids=(), item_ids=None, latency=0.0, seed=0):
+        self.perk_ids = list(perk_ids)
+        self.item_ids = list(item_ids) if item_ids else list(DEFAULT_ITEMS)
+        self.latency = latency
+        self.seed = seed
+        self.calls = 0
+
+    STREAM_CHUNK_SIZE = 8
+
+    def generate(self, prompt, request_type='chat'):
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return self.build_response(prompt, request_type)
+
+    def generate_stream(self, prompt, request_type='chat'):
+        # Spread the latency across the chunks so the first one arrives early, like a real stream
+        text = self.build_response(prompt, request_type)
+        chunks = [text[i:i + self.STREAM_CHUNK_SIZE] for i in range(0, len(text), self.STREAM_CHUNK_SIZE)]
+        for chunk in chunks:
+            if self.latency > 0:
+                time.sleep(self.latency / len(chunks))
+            yield chunk
+
+    def build_response(self, prompt, request_type):
+        self.calls += 1
+        rng = random.Random(zlib.crc32(prompt.encode('utf-8')) ^ (self.seed * 1000003 + self.calls))
+
+        if request_type == 'directive':
+            return json.dumps(self.make_directive(rng, 'Directive Insight' in prompt))
+        elif request_type == 'character':
+            return json.dumps(self.make_character(rng, prompt))
+        return rng.choice(self.CHAT_LINES)
+
+    def make_directive(self, rng, improved=False):
+        template = rng.choice(self.DIRECTIVE_TEMPLATES)
+        value = rng.choice(template['values'])
+        directive = {
+            'objective_type': template['objective_type'],
+            'value': value,
+            'flavor_text': template['flavor_text'].format(value=value),
+        }
+        if rng.random() < 0.5:
+            directive['reward_type'] = 'coins'
+            directive['reward_value'] = rng.randrange(50, 201, 10) + (50 if improved else 0)
+        else:
+            directive['reward_type'] = 'item'
+            directive['reward_value'] = rng.choice(self.REWARD_ITEMS)
+        return directive
+
+    def make_character(self, rng, prompt):
+        # Only theme off the player's own answer, not the perk lists in the rest of the prompt
+        answer = re.search(r'response is: "(.*?)"', prompt)
+        lowered = (answer.group(1) if answer else prompt).lower()
+        perks = []
+        for keyword, perk in self.THEME_PERKS.items():
+            if keyword in lowered and perk in self.perk_ids and perk not in perks:
+                perks.append(perk)
+        spare_perks = [p for p in self.perk_ids if p not in perks]
+        while len(perks) < 2 and spare_perks:
+            perks.append(spare_perks.pop(rng.randrange(len(spare_perks))))
+
+        name = f"{rng.choice(self.NAME_PREFIXES)} {rng.choice(self.NAME_SUFFIXES)}"
+        return {
+            'id': 'generated_operative',
+            'name': name,
+            'desc': f"A locally fabricated operative. The {name} was compiled without a Mainframe uplink.",
+            'unlock_cost': 0,
+            'mods': {'innate_perks': perks[:2], 'starting_item': rng.choice(self.item_ids)},
+        }
+
+
+def create_backend(name, api_key=None, **kwargs):
+    """ Builds the backend registered under `name` ('gemini' or 'local'). """
+    if name == 'local':
+        return LocalBackend(**kwargs)
+    if name == 'gemini':
+        return GeminiBackend(api_key)
+    raise ValueError(f"Unknown AI backend '{name}'. Expected 'gemini' or 'local'.")
@@ -1,22 +1,37 @@
 
 
 import os, json
+import threading
+from bisect import bisect_right
 import pygame
+from .asset_bundle import load_image, open_asset, asset_exists, list_dir, is_asset_dir
+from .texture_atlas import TextureAtlas
 
 COLORKEY = (0, 0, 0)
 
+# Used for any key an animation's config.json leaves out (or all of them, if it has none).
+# 'frames' defaults to 5 ticks per image.
+DEFAULT_CONFIG = {
+    'loop': True,
+    'speed': 1.0,
+    'centered': False,
+    'paused': False,
+    'outline': None,
+    'offset': [0, 0],
+}
+
 def load_img(path, colorkey):
-    img = pygame.image.load(path).convert()
+    img = load_image(path).convert()
     img.set_colorkey(colorkey)
     return img
 
 class AnimationData:
-    def __init__(self, path, colorkey=None):
+    def __init__(self, path, colorkey=None, atlas=None):
         self.id = os.path.basename(path) # More robust way to get the final part of a path
         self.image_list = []
 
         # Iterate through files in the animation directory (path is now absolute)
-        for img_filename in os.listdir(path):
+        for img_filename in list_dir(path):
             if img_filename.endswith('.png'):
                 full_img_path = os.path.join(path, img_filename)
                 # --- FIX: More robust frame number parsing ---
@@ -30,37 +45,39 @@ class AnimationData:
 
         # Construct the full, absolute path to the config file
         config_path = os.path.join(path, 'config.json')
+        self.config = dict(DEFAULT_CONFIG, frames=[5 for _ in range(len(self.image_list))])
+        self.config['offset'] = list(self.config['offset'])
         try:
-            with open(config_path, 'r') as f:
-                self.config = json.load(f)
+            with open_asset(config_path) as f:
+                self.config.update(json.load(f))
         except FileNotFoundError:
-            # Create a default config if not found
-            self.config = {
-                'frames': [5 for _ in range(len(self.image_list))],
-                'loop': True,
-                'speed': 1.0,
-                'centered': False,
-                'paused': False,
-                'outline': None,
-                'offset': [0, 0],
-            }
-            # Write the default config back to the correct absolute path
-            with open(config_path, 'w') as f:
-                json.dump(self.config, f)
-        
+            pass # Defaults only live in memory; the animation folder is left as it is
+
         # Sort and process the loaded images
         self.image_list.sort()
         self.image_list = [v[1] for v in self.image_list]
+        # Frames become views into the shared atlas pages; frame_regions has the raw (page, rect) for batched blits
+        self.frame_regions = [atlas.add(img) if atlas else None for img in self.image_list]
+        self.image_list = [atlas.subsurface(region) if region else img for img, region in zip(self.image_list, self.frame_regions)]
         self.frame_surfs = []
         total = 0
         for i, frame in enumerate(self.config['frames']):
             total += frame
             if i < len(self.image_list): # Safety check
                 self.frame_surfs.append([total, self.image_list[i]])
-
-    @property
-    def duration(self):
-        return sum(self.config['frames'])
+        self.frame_ends = [f[0] for f in self.frame_surfs]
+        self.frame_images = [f[1] for f in self.frame_surfs]
+        self.duration = sum(self.config['frames'])
+        # frame_lookup[int(frame)] is the index of the image shown at that tick (integer frame lengths only)
+        self.frame_lookup = None
+        if self.frame_ends and all(isinstance(f, int) for f in self.config['frames']):
+            self.frame_lookup = [bisect_right(self.frame_ends, tick) for tick in range(self.frame_ends[-1])]
+
+    def frame_index(self, frame):
+        lookup = self.frame_lookup
+        if lookup is not None and 0 <= frame < len(lookup): return lookup[int(frame)]
+        # Past the last frame, the last image stays up
+        return min(bisect_right(self.frame_ends, frame), len(self.frame_ends) - 1)
 
 class Animation:
     def __init__(self, animation_data):
@@ -71,6 +88,7 @@ class Animation:
         self.calc_img()
         self.rotation = 0
         self.just_looped = False
+        self.shared = False # Advanced once per frame by AnimationManager.update_shared, not by play()
 
     def render(self, surf, pos, offset=(0, 0)):
         if not self.img: return # Safety check
@@ -100,14 +118,12 @@ class Animation:
             self.img = pygame.Surface((1,1), pygame.SRCALPHA) # Fallback if no frames loaded
             return
             
-        for frame_data in self.data.frame_surfs:
-            if frame_data[0] > self.frame:
-                self.img = frame_data[1]
-                return
-        # If frame is beyond the last frame's duration, use the last image
-        self.img = self.data.frame_surfs[-1][1]
+        self.img = self.data.frame_images[self.data.frame_index(self.frame)]
 
     def play(self, dt=1/60, time_scale=1.0): # Using dt is better than assuming 60fps
+        if not self.shared: self.advance(dt, time_scale)
+
+    def advance(self, dt=1/60, time_scale=1.0):
         self.just_looped = False
         if not self.paused:
             # Animation speed calculation should be frame-rate independent
@@ -116,8 +132,8 @@ class Animation:
         if self.data.config.get('loop', False):
             # MODIFIED: Prevent infinite loop on animations with 0 duration.
             if self.data.duration > 0:
-                while self.frame >= self.data.duration:
-                    self.frame -= self.data.duration
+                if self.frame >= self.data.duration:
+                    self.frame %= self.data.duration
                     self.just_looped = True
             else:
                 self.frame = 0 # If duration is 0, just reset the frame
@@ -151,28 +167,81 @@ class Animation:
         self.paused = False
 
 class AnimationManager:
+    """
+    Startup only lists the animation folders; each one is loaded (frames decoded and
+    packed into the atlas) the first time get(), new() or shared() asks for it.
+    prefetch() loads a list of them on a background thread instead, which is how states
+    warm up their ANIMATIONS manifest before they need it.
+    """
     # Now accepts the base path to the animations directory during initialization
     def __init__(self, anim_base_path):
-        self.animations = {}
-        if not os.path.exists(anim_base_path):
+        self.paths = {} # anim id -> folder, for every animation on disk
+        self.animations = {} # anim id -> AnimationData, for the ones loaded so far
+        self.shared_animations = {}
+        self.atlas = TextureAtlas()
+        self.load_lock = threading.Lock()
+        if not asset_exists(anim_base_path):
             print(f"Animation directory not found at {anim_base_path}")
             return
         
-        for anim_dir_name in os.listdir(anim_base_path):
+        for anim_dir_name in list_dir(anim_base_path):
             # Construct the full, absolute path for each animation
             full_path = os.path.join(anim_base_path, anim_dir_name)
-            if os.path.isdir(full_path):
-                self.animations[anim_dir_name] = AnimationData(full_path, COLORKEY)
+            if is_asset_dir(full_path):
+                self.paths[anim_dir_name] = full_path
+
+    def __contains__(self, anim_id):
+        return anim_id in self.paths
+
+    def get(self, anim_id):
+        """The AnimationData for anim_id, loading it now if it isn't yet. None if there's no such animation."""
+        data = self.animations.get(anim_id)
+        if data is None and anim_id in self.paths:
+            with self.load_lock: # The background loader may be on it already
+                data = self.animations.get(anim_id)
+                if data is None:
+                    data = self.animations[anim_id] = AnimationData(self.paths[anim_id], COLORKEY, self.atlas)
+        return data
+
+    def prefetch(self, anim_ids):
+        missing = [anim_id for anim_id in anim_ids if anim_id in self.paths and anim_id not in self.animations]
+        if missing:
+            threading.Thread(target=self._load_all, args=(missing,), daemon=True).start()
+
+    def _load_all(self, anim_ids):
+        for anim_id in anim_ids:
+            try:
+                self.get(anim_id)
+            except (pygame.error, ValueError, KeyError) as e:
+                print(f"Warning: Could not prefetch animation '{anim_id}'. Reason: {e}")
 
     def new(self, anim_id):
-        if anim_id in self.animations:
-            return Animation(self.animations[anim_id])
+        data = self.get(anim_id)
+        if data is not None:
+            return Animation(data)
         else:
             print(f"Warning: Animation '{anim_id}' not found.")
-            # Create an empty, dummy AnimationData if the path does not exist
+            # Fall back to another animation if the path does not exist
             # This is safer and prevents crashes down the line
-            dummy_path = self.animations.get('player_idle').id if 'player_idle' in self.animations else list(self.animations.keys())[0] if self.animations else '.'
-            if dummy_path != '.':
-                return Animation(self.animations[dummy_path])
+            fallback = 'player_idle' if 'player_idle' in self.paths else next(iter(self.paths), None)
+            if fallback is not None:
+                return Animation(self.get(fallback))
             else:
-                return None
\ No newline at end of file
+                return None
+
+    def shared(self, anim_id):
+        """
+        One Animation for every entity that asks for anim_id, on a single clock that
+        update_shared() advances once per frame. For entities spawned in bulk (coins,
+        turrets, projectiles) that don't need their own timing.
+        """
+        anim = self.shared_animations.get(anim_id)
+        if anim is None:
+            anim = self.new(anim_id)
+            if anim:
+                anim.shared = True
+                self.shared_animations[anim_id] = anim
+        return anim
+
+    def update_shared(self, dt=1/60, time_scale=1.0):
+        for anim in self.shared_animations.values(): anim.advance(dt, time_scale)
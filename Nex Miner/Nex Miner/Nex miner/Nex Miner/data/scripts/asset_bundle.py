@@ -0,0 +1,158 @@
+# data/scripts/asset_bundle.py
+import io
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+BUNDLE_MAGIC = b'NEXB'
+BUNDLE_VERSION = 1
+BUNDLE_HEADER = struct.Struct('<4sII') # magic, version, index length
+BUNDLE_PATH = ('data', 'assets.bundle')
+# Directories packed by build_bundle(), relative to the game folder. Music stays a loose
+# file since MusicPlayer streams it.
+PACKED_DIRS = ('data/configs', 'data/fonts', 'data/sfx', 'data/images')
+# Images bigger than this once decoded (the full-size background art) are packed as their
+# PNG bytes instead, so the bundle doesn't balloon; they're decoded from memory on load.
+MAX_RAW_IMAGE_BYTES = 4 * 1024 * 1024
+
+
+class AssetBundle:
+    """
+    Read-only view of a file written by build_bundle(). The whole file is memory-mapped
+    and the JSON index at its head maps each packed path (relative to the game folder,
+    '/'-separated) to a byte range. Images are stored already decoded, as raw RGB/RGBA
+    pixels, so image() wraps the mapped bytes in a Surface without touching a PNG
+    decoder (except for the few over MAX_RAW_IMAGE_BYTES). Everything else comes back
+    as the original file bytes.
+    """
+    def __init__(self, path, base_dir):
+        self.base_dir = base_dir
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(self.map, 'madvise'):
+            self.map.madvise(mmap.MADV_WILLNEED) # Start one readahead of the whole file
+        magic, version, index_length = BUNDLE_HEADER.unpack_from(self.map, 0)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise ValueError(f"'{path}' is not a version {BUNDLE_VERSION} asset bundle")
+        self.entries = json.loads(self.map[BUNDLE_HEADER.size:BUNDLE_HEADER.size + index_length])
+        self.data_start = BUNDLE_HEADER.size + index_length # Entry offsets count from here
+        self.dirs = {}
+        for key in self.entries:
+            parent, name = key.rsplit('/', 1)
+            self.dirs.setdefault(parent, []).append(name)
+            while '/' in parent: # Intermediate folders, so animation folders can be listed
+                parent, name = parent.rsplit('/', 1)
+                children = self.dirs.setdefault(parent, [])
+                if name not in children: children.append(name)
+
+    def key(self, path):
+        return os.path.relpath(os.path.abspath(path), self.base_dir).replace(os.sep, '/')
+
+    def has(self, path):
+        return self.key(path) in self.entries
+
+    def read(self, path):
+        entry = self.entries[self.key(path)]
+        start = self.data_start + entry['offset']
+        return self.map[start:start + entry['length']]
+
+    def image(self, path):
+        entry = self.entries[self.key(path)]
+        start = self.data_start + entry['offset']
+        if entry['format'] == 'png':
+            return pygame.image.load(io.BytesIO(self.map[start:start + entry['length']]), 'img.png')
+        pixels = memoryview(self.map)[start:start + entry['length']]
+        return pygame.image.frombuffer(pixels, entry['size'], entry['format'])
+
+
+def build_bundle(base_dir, out_path):
+    """
+    Packs every file under PACKED_DIRS into one bundle at out_path. PNGs are decoded
+    here, at build time. Run it again after changing any packed asset (the game reads
+    the bundle in preference to the loose files), or delete the bundle while editing.
+    """
+    to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+    entries, blobs, offset = {}, [], 0
+    for packed_dir in PACKED_DIRS:
+        for root, dirs, files in os.walk(os.path.join(base_dir, *packed_dir.split('/'))):
+            dirs.sort()
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                key = os.path.relpath(path, base_dir).replace(os.sep, '/')
+                entry = {}
+                with open(path, 'rb') as f: data = f.read()
+                if filename.lower().endswith('.png'):
+                    img = pygame.image.load(path)
+                    entry['size'] = list(img.get_size())
+                    if img.get_width() * img.get_height() * 4 > MAX_RAW_IMAGE_BYTES:
+                        entry['format'] = 'png' # Keep the file bytes
+                    else:
+                        if img.get_flags() & pygame.SRCALPHA or img.get_colorkey() is not None:
+                            # Bake palette/colorkey transparency into the alpha channel
+                            flat = pygame.Surface(img.get_size(), pygame.SRCALPHA)
+                            flat.blit(img, (0, 0))
+                            entry['format'], img = 'RGBA', flat
+                        else:
+                            entry['format'] = 'RGB'
+                        data = to_bytes(img, entry['format'])
+                entry['offset'], entry['length'] = offset, len(data)
+                entries[key] = entry
+                blobs.append(data)
+                offset += len(data)
+
+    index = json.dumps(entries).encode('utf-8')
+    with open(out_path, 'wb') as f:
+        f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(index)))
+        f.write(index)
+        for blob in blobs: f.write(blob)
+    return len(entries)
+
+
+# The bundle mounted by the game at startup, if one was built. The helpers below read
+# from it when it has the file and fall back to the loose file otherwise.
+_bundle = None
+
+def mount_bundle(path, base_dir):
+    global _bundle
+    if os.environ.get("NEX_ASSET_BUNDLE", "1") == "0" or not os.path.isfile(path):
+        return False
+    try:
+        _bundle = AssetBundle(path, base_dir)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring asset bundle '{path}'. Reason: {e}")
+        return False
+    return True
+
+def load_image(path):
+    """Drop-in for pygame.image.load."""
+    if _bundle and _bundle.has(path): return _bundle.image(path)
+    return pygame.image.load(path)
+
+def open_asset(path):
+    """Binary file object for a packed asset, for json.load, pygame.mixer.Sound, etc."""
+    if _bundle and _bundle.has(path): return io.BytesIO(_bundle.read(path))
+    return open(path, 'rb')
+
+def asset_exists(path):
+    return bool(_bundle and _bundle.has(path)) or os.path.exists(path)
+
+def list_dir(path):
+    if _bundle:
+        names = _bundle.dirs.get(_bundle.key(path))
+        if names is not None: return list(names)
+    return os.listdir(path)
+
+def is_asset_dir(path):
+    if _bundle and _bundle.key(path) in _bundle.dirs: return True
+    return os.path.isdir(path)
+
+
+if __name__ == '__main__':
+    # python -m data.scripts.asset_bundle, from the game folder
+    game_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    out = os.path.join(game_dir, *BUNDLE_PATH)
+    count = build_bundle(game_dir, out)
+    print(f"Packed {count} assets into {out} ({os.path.getsize(out) // 1024} KB)")
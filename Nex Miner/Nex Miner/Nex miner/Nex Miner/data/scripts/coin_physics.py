@@ -0,0 +1,144 @@
+# data/scripts/coin_physics.py
+try:
+    import numpy as np
+except ImportError:
+    np = None # Coins fall back to Item.update one at a time
+
+HAS_NUMPY = np is not None
+
+# Must match Item.update
+COIN_GRAVITY = 0.2
+COIN_MAX_FALL = 3
+COIN_FRICTION = 0.05
+COIN_PICKUP_DELAY = 30
+
+# Below this many coins, per-Item updates are cheaper than setting up the arrays
+COIN_BATCH_MIN = 24
+
+class CoinSimulator:
+    """
+    Steps every coin in one go. Positions, velocities and ages are gathered from the
+    coin Items into NumPy arrays, moved against a tile occupancy grid (rather than
+    Entity.move against one rect per tile), pulled by the magnet, tested against the
+    player rect, then written back. Coins are smaller than a tile, so each one only
+    ever overlaps a 2x2 block of cells.
+    """
+    def __init__(self, game):
+        self.game = game
+        self.grid = np.zeros((1, game.WINDOW_TILE_SIZE[0]), dtype=bool)
+        self.grid_top = 0 # Tile row of grid[0]
+        self.grid_version = None
+
+    def refresh_grid(self, tiles, tile_version):
+        # GameplayState bumps tile_version whenever the tiles change
+        if tile_version == self.grid_version: return
+        self.grid_version = tile_version
+        width = self.game.WINDOW_TILE_SIZE[0]
+        if not tiles:
+            self.grid, self.grid_top = np.zeros((1, width), dtype=bool), 0
+            return
+        rows = [pos[1] for pos in tiles]
+        self.grid_top = min(rows)
+        self.grid = np.zeros((max(rows) - self.grid_top + 1, width), dtype=bool)
+        for tile_x, tile_y in tiles:
+            if 0 <= tile_x < width: self.grid[tile_y - self.grid_top, tile_x] = True
+
+    def solid(self, cols, rows):
+        grid_rows = rows - self.grid_top
+        inside = (grid_rows >= 0) & (grid_rows < self.grid.shape[0]) & (cols >= 0) & (cols < self.grid.shape[1])
+        hit = np.zeros(cols.shape, dtype=bool)
+        hit[inside] = self.grid[grid_rows[inside], cols[inside]]
+        return hit
+
+    def wall_hit(self, first_cols, last_cols, top, h):
+        # The edge walls are the outer two columns, but only span the screen vertically
+        last = self.grid.shape[1] - 1
+        return (((first_cols <= 0) & (last_cols >= 0)) | ((first_cols <= last) & (last_cols >= last))) & (top < self.game.DISPLAY_SIZE[1]) & (top + h > 0)
+
+    def overlapping(self, coins, height):
+        """
+        Which of `coins` already overlap a tile or an edge wall before they move, as a
+        list of bools. step() pushes coins out along the cell grid, while Entity.move
+        takes whichever overlapping rect comes first in its list, so these give different
+        results for a coin that starts inside the stack. Coins like that go through
+        Item.update instead.
+        """
+        pos = np.array([coin.pos for coin in coins], dtype=float)
+        size = np.array([coin.size for coin in coins], dtype=np.int64)
+        w, h = size[:, 0], size[:, 1]
+        c0, c1, r0, r1, top = self._cells(pos, w, h, height, self.game.TILE_SIZE)
+        hit = self.solid(c0, r0) | self.solid(c1, r0) | self.solid(c0, r1) | self.solid(c1, r1) | self.wall_hit(c0, c1, top, h)
+        return hit.tolist()
+
+    def step(self, coins, time_scale, height, player, magnet_level=0, magnet_radius_sq=0):
+        """Moves `coins` (Items) one frame and returns the indices of the ones the player picked up."""
+        tile = self.game.TILE_SIZE
+        pos = np.array([coin.pos for coin in coins], dtype=float)
+        vel = np.array([coin.velocity for coin in coins], dtype=float)
+        size = np.array([coin.size for coin in coins], dtype=np.int64)
+        age = np.array([coin.time for coin in coins], dtype=float) + time_scale
+        w, h = size[:, 0], size[:, 1]
+
+        vel[:, 1] = np.minimum(vel[:, 1] + COIN_GRAVITY, COIN_MAX_FALL)
+        vx = vel[:, 0]
+        vel[:, 0] = np.where(vx > COIN_FRICTION, vx - COIN_FRICTION, np.where(vx < -COIN_FRICTION, vx + COIN_FRICTION, 0.0))
+
+        # Horizontal pass, then vertical, like Entity.move
+        dx = vel[:, 0] * time_scale
+        pos[:, 0] += dx
+        c0, c1, r0, r1, top = self._cells(pos, w, h, height, tile)
+        s0 = self.solid(c0, r0) | self.solid(c0, r1) | self.wall_hit(c0, c0, top, h)
+        s1 = self.solid(c1, r0) | self.solid(c1, r1) | self.wall_hit(c1, c1, top, h)
+        hit = (dx > 0) & (s0 | s1)
+        pos[hit, 0] = (np.where(s1, c1, c0)[hit] * tile - w[hit])
+        hit = (dx < 0) & (s0 | s1)
+        pos[hit, 0] = (np.where(s0, c0, c1)[hit] + 1) * tile
+
+        dy = vel[:, 1] * time_scale
+        pos[:, 1] += dy
+        c0, c1, r0, r1, top = self._cells(pos, w, h, height, tile)
+        s0 = self.solid(c0, r0) | self.solid(c1, r0)
+        s1 = self.solid(c0, r1) | self.solid(c1, r1)
+        hit = (dy > 0) & (s0 | s1)
+        pos[hit, 1] = np.trunc(np.where(s1, r1, r0)[hit] * tile - height) - h[hit]
+        hit = (dy < 0) & (s0 | s1)
+        pos[hit, 1] = np.trunc(np.where(s0, r0, r1)[hit] * tile - height) + tile
+        # Walls come after the tiles in the rect list Entity.move resolves, so they win
+        hit = (dy != 0) & self.wall_hit(c0, c1, top, h)
+        pos[hit, 1] = np.where(dy > 0, -h, self.game.DISPLAY_SIZE[1])[hit]
+
+        if magnet_level > 0:
+            player_center = player.center
+            dist_x = player_center[0] - (pos[:, 0] + w // 2)
+            dist_y = player_center[1] - (pos[:, 1] + h // 2)
+            dist_sq = dist_x ** 2 + dist_y ** 2
+            near = dist_sq < magnet_radius_sq
+            dist = np.sqrt(dist_sq)
+            dist[dist_sq <= 0] = 1
+            vel[near, 0] += (dist_x / dist)[near] * time_scale
+            vel[near, 1] += (dist_y / dist)[near] * time_scale
+
+        player_rect = player.rect
+        left, top = np.floor(pos[:, 0]), np.floor(pos[:, 1])
+        picked = (age > COIN_PICKUP_DELAY) & (left < player_rect.right) & (left + w > player_rect.left) & (top < player_rect.bottom) & (top + h > player_rect.top)
+
+        for coin, coin_pos, coin_vel, coin_age in zip(coins, pos.tolist(), vel.tolist(), age.tolist()):
+            coin.pos[0], coin.pos[1] = coin_pos
+            coin.velocity[0], coin.velocity[1] = coin_vel
+            coin.time = coin_age
+        return np.flatnonzero(picked).tolist()
+
+    def _cells(self, pos, w, h, height, tile):
+        # Tile columns/rows under the first and last pixel of each coin rect
+        left = np.floor(pos[:, 0]).astype(np.int64)
+        top = np.floor(pos[:, 1]).astype(np.int64)
+        c0, c1 = left // tile, (left + w - 1) // tile
+        # Tile rows sit at pygame.Rect(..., row * tile - height, ...), which truncates toward
+        # zero, so rows can overlap by a pixel around y = 0; take the outermost ones touched
+        first, last = top, top + h - 1
+        r0 = np.floor((first + height) / tile).astype(np.int64) - 1
+        r1 = np.floor((last + height) / tile).astype(np.int64) + 1
+        for _ in range(2):
+            r0 += np.trunc(r0 * tile - height) + tile <= first # Lowest row whose bottom is below the first pixel
+            r1 -= np.trunc(r1 * tile - height) > last # Highest row whose top is above the last pixel
+        return c0, c1, r0, r1, top
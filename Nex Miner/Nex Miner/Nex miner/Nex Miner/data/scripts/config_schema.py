@@ -0,0 +1,142 @@
+# data/scripts/config_schema.py
+from collections import namedtuple
+
+NUMBER = (int, float)
+
+# Base drop weights for falling tiles; biomes add to these through 'special_spawn_rate'.
+BASE_SPAWN_WEIGHTS = {'tile': 70, 'fragile': 8, 'bounce': 5, 'chest': 3, 'spike': 2, 'greed': 2}
+
+class ConfigError(Exception):
+    """Raised when a file in data/configs doesn't match the expected schema."""
+    pass
+
+# Required fields for each entry of each config file. Optional fields are checked in OPTIONAL_FIELDS.
+ENTRY_FIELDS = {
+    'upgrades': {'name': str, 'desc': str, 'base_cost': NUMBER, 'max_level': int},
+    'perks': {'name': str, 'desc': str},
+    'curses': {'name': str, 'desc': str},
+    'characters': {'name': str, 'desc': str, 'unlock_cost': NUMBER, 'mods': dict},
+    'artifacts': {'name': str, 'desc': str, 'unlock_req': dict, 'mod': dict},
+    'challenges': {'name': str, 'desc': str, 'win_condition': dict, 'start_layout': list, 'falling_tiles': list},
+    'biomes': {'name': str, 'score_req': NUMBER, 'bg_color': list, 'bg_layers': list, 'available_tiles': list},
+}
+OPTIONAL_FIELDS = {
+    'biomes': {'special_spawn_rate': dict, 'special_entities': dict, 'ambient_hazard': dict, 'music': str},
+}
+
+BiomeConfig = namedtuple('BiomeConfig', [
+    'name', 'score_req', 'bg_color', 'bg_layers', 'available_tiles',
+    'spawn_table', # ((tile_type, weight), ...) for the non-elite roll, already merged and filtered
+    'has_motherlode', 'has_unstable', 'special_entities', 'ambient_hazard',
+    'music', # Track path like bg_layers, or None for the default track
+])
+
+UpgradeStats = namedtuple('UpgradeStats', [
+    'jumps_max', 'speed', 'item_luck', 'magnet_level', 'magnet_radius_sq',
+    'combo_shield', 'focus_max', 'focus_recharge', 'curse_rerolls', 'starting_item',
+])
+
+def _check_type(value, expected, where):
+    if not isinstance(value, expected) or (expected is NUMBER and isinstance(value, bool)):
+        names = ' or '.join(t.__name__ for t in expected) if isinstance(expected, tuple) else expected.__name__
+        raise ConfigError(f"{where}: expected {names}, got {type(value).__name__}")
+
+def validate_config(name, data):
+    """Checks one loaded config file against its schema. Raises ConfigError on the first problem."""
+    if name == 'biomes':
+        _check_type(data, list, f"{name}.json")
+        entries = [(f"{name}.json[{i}]", entry) for i, entry in enumerate(data)]
+        if not entries: raise ConfigError(f"{name}.json: at least one biome is required")
+    else:
+        _check_type(data, dict, f"{name}.json")
+        entries = [(f"{name}.json['{key}']", entry) for key, entry in data.items()]
+
+    for where, entry in entries:
+        _check_type(entry, dict, where)
+        for field, expected in ENTRY_FIELDS[name].items():
+            if field not in entry: raise ConfigError(f"{where}: missing required field '{field}'")
+            _check_type(entry[field], expected, f"{where}.{field}")
+        for field, expected in OPTIONAL_FIELDS.get(name, {}).items():
+            if field in entry: _check_type(entry[field], expected, f"{where}.{field}")
+
+    if name == 'biomes':
+        for where, biome in entries:
+            if len(biome['bg_color']) != 3: raise ConfigError(f"{where}.bg_color: expected [r, g, b]")
+            if len(biome['bg_layers']) != 2: raise ConfigError(f"{where}.bg_layers: expected [far, near] image paths")
+            for tile, rate in biome.get('special_spawn_rate', {}).items():
+                _check_type(rate, NUMBER, f"{where}.special_spawn_rate.{tile}")
+            if 'special_entities' in biome:
+                _check_type(biome['special_entities'].get('type'), str, f"{where}.special_entities.type")
+                _check_type(biome['special_entities'].get('spawn_rate'), NUMBER, f"{where}.special_entities.spawn_rate")
+            if 'ambient_hazard' in biome:
+                _check_type(biome['ambient_hazard'].get('type'), str, f"{where}.ambient_hazard.type")
+                _check_type(biome['ambient_hazard'].get('speed'), NUMBER, f"{where}.ambient_hazard.speed")
+
+def validate_references(configs):
+    """Cross-file checks, run after every file passed validate_config."""
+    for key, char in configs['characters'].items():
+        for perk in char['mods'].get('innate_perks', []):
+            if perk not in configs['perks']:
+                raise ConfigError(f"characters.json['{key}'].mods.innate_perks: unknown perk '{perk}'")
+    for key, artifact in configs['artifacts'].items():
+        if 'type' not in artifact['mod']: raise ConfigError(f"artifacts.json['{key}'].mod: missing required field 'type'")
+
+def compile_biome(data):
+    available = frozenset(data['available_tiles'])
+    weights = dict(BASE_SPAWN_WEIGHTS)
+    for special, chance in data.get('special_spawn_rate', {}).items():
+        weights[special] = weights.get(special, 0) + chance
+    return BiomeConfig(
+        name=data['name'],
+        score_req=data['score_req'],
+        bg_color=tuple(data['bg_color']),
+        bg_layers=tuple(data['bg_layers']),
+        available_tiles=available,
+        spawn_table=tuple((tile, weight) for tile, weight in weights.items() if tile in available),
+        has_motherlode='motherlode' in available,
+        has_unstable='unstable' in available,
+        special_entities=data.get('special_entities'),
+        ambient_hazard=data.get('ambient_hazard'),
+        music=data.get('music'),
+    )
+
+def compile_spawn_sampler(biome, disabled_tiles=(), high_stakes=False):
+    """
+    Builds the cumulative-weight table update_tile_spawning draws from, for one
+    (biome, disabled tiles, curses) combination. Returns (tile_types, cum_weights),
+    or None if nothing can spawn. Feeding cum_weights straight to random.choices
+    gives the same draws as passing the raw weights, so seeded runs don't change.
+    """
+    tile_types, cum_weights, total = [], [], 0
+    for tile, weight in biome.spawn_table:
+        if tile in disabled_tiles: continue
+        total += weight
+        tile_types.append('spike' if high_stakes and tile == 'greed' else tile)
+        cum_weights.append(total)
+    return (tuple(tile_types), tuple(cum_weights)) if tile_types else None
+
+def compile_flags(keys):
+    """Assigns each perk/curse id its own bit, so a set of them packs into one int."""
+    return {key: 1 << i for i, key in enumerate(sorted(keys))}
+
+def flags_mask(flags, keys):
+    mask = 0
+    for key in keys: mask |= flags.get(key, 0)
+    return mask
+
+def compile_upgrade_stats(levels):
+    """Turns the upgrade levels in save_data['upgrades'] into the numbers gameplay actually uses."""
+    magnet_level = levels.get('coin_magnet', 0)
+    focus_level = levels.get('focus_mastery', 0)
+    return UpgradeStats(
+        jumps_max=2 + levels.get('jumps', 0),
+        speed=1.4 + levels.get('speed', 0) * 0.08,
+        item_luck=3 + levels.get('item_luck', 0),
+        magnet_level=magnet_level,
+        magnet_radius_sq=(20 + magnet_level * 10) ** 2,
+        combo_shield=levels.get('combo_shield', 0),
+        focus_max=100 + focus_level * 15,
+        focus_recharge=0.4 + focus_level * 0.05,
+        curse_rerolls=levels.get('curse_reroll', 0),
+        starting_item=levels.get('starting_item', 0) > 0,
+    )
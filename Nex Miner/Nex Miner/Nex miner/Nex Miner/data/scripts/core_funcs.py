@@ -1,9 +1,10 @@
 import pygame, math
+from .asset_bundle import load_image
 
 # --- NEW: Shared image loading function ---
 def load_img(path):
     """Loads an image, converts it, and sets a black colorkey."""
-    img = pygame.image.load(path).convert()
+    img = load_image(path).convert()
     img.set_colorkey((0, 0, 0))
     return img
 # --- END NEW ---
@@ -110,4 +111,40 @@ def get_line(start, end):
  
     if swapped:
         points.reverse()
-    return points
\ No newline at end of file
+    return points
+
+def line_clear(start, end, solid_rows):
+    """
+    Walks the same cells as get_line(start, end) and returns False as soon as one is
+    blocked. Blocked cells come from row bitmaps: bit x of solid_rows[y] is set for a
+    solid tile at (x, y). Flat lines are tested a whole horizontal run at a time.
+    """
+    x1, y1 = start
+    x2, y2 = end
+    is_steep = abs(y2 - y1) > abs(x2 - x1)
+    if is_steep:
+        x1, y1 = y1, x1
+        x2, y2 = y2, x2
+    if x1 > x2: # Direction doesn't matter for a yes/no answer
+        x1, x2 = x2, x1
+        y1, y2 = y2, y1
+
+    dx = x2 - x1
+    dy = abs(y2 - y1)
+    error = int(dx / 2.0)
+    ystep = 1 if y1 < y2 else -1
+    y = y1
+    run_start = x1
+    for x in range(x1, x2 + 1):
+        error -= dy
+        if is_steep:
+            if y >= 0 and (solid_rows.get(x, 0) >> y) & 1: return False
+        elif error < 0 or x == x2:
+            # The run of cells on row y ends here
+            first = max(run_start, 0)
+            if x >= first and solid_rows.get(y, 0) & (((1 << (x - first + 1)) - 1) << first): return False
+            run_start = x + 1
+        if error < 0:
+            y += ystep
+            error += dx
+    return True
\ No newline at end of file
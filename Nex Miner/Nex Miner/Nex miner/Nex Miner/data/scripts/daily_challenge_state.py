@@ -4,11 +4,12 @@ import datetime
 import random
 from .state import State
 from .gameplay_state import GameplayState, render_panel_9slice
+from .asset_bundle import load_image
 
 class DailyChallengeState(State):
     def __init__(self, game):
         super().__init__(game)
-        self.panel_img = pygame.image.load(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
+        self.panel_img = load_image(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
         self.get_daily_seed()
         
         # We need to make sure the key exists before we try to check it
@@ -0,0 +1,190 @@
+# data/scripts/debug_stats.py
+import gc
+import itertools
+import json
+import sys
+import time
+from collections import Counter
+
+import pygame
+
+from .ui_utils import GLOW_CACHE, PhaseFrames
+from .text import Font
+
+# Object collections read off the current state, when it has them (GameplayState does)
+COUNTED = ('sparks', 'tiles', 'tile_drops', 'items', 'projectiles', 'turrets', 'turret_projectiles', 'ghosts', 'data_nodes')
+# Per-state surface caches: attribute -> label
+STATE_CACHES = {'ghost_frames': 'ghost_frames', 'combo_fonts': 'combo_fonts', 'hologram_char_imgs': 'hologram_chars', 'holo_line_frames': 'holo_lines'}
+OVERLAY_REFRESH = 30 # Frames between overlay snapshots
+
+
+def surface_bytes(surf):
+    # Subsurfaces (atlas frames, display regions) share their parent's pixels
+    if not isinstance(surf, pygame.Surface) or surf.get_parent() is not None: return 0
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+def cached_bytes(value, seen=None):
+    """Pixel bytes held by a cache entry: a Surface, a Font's letters, baked PhaseFrames, or a list of those."""
+    seen = set() if seen is None else seen
+    if id(value) in seen: return 0 # Frames that share one image
+    seen.add(id(value))
+    if isinstance(value, pygame.Surface): return surface_bytes(value)
+    if isinstance(value, Font): return sum(surface_bytes(letter) for letter in value.letters)
+    if isinstance(value, PhaseFrames): value = value.frames
+    if isinstance(value, (list, tuple)): return sum(cached_bytes(item, seen) for item in value)
+    return 0
+
+def approx_size(obj, depth=2):
+    """sys.getsizeof of obj plus the lists, tuples and dicts inside it, `depth` levels down."""
+    size = sys.getsizeof(obj)
+    if depth <= 0: return size
+    if isinstance(obj, dict): children = obj.values()
+    elif isinstance(obj, (list, tuple)): children = obj
+    else: return size
+    return size + sum(approx_size(child, depth - 1) for child in children)
+
+def object_size(obj):
+    """sys.getsizeof of obj plus its attributes, whether they live in __slots__ or __dict__."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'): size += approx_size(obj.__dict__)
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, '__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ('__dict__', '__weakref__') and hasattr(obj, name):
+                size += approx_size(getattr(obj, name), 1) # One level down, like the values of a __dict__
+    return size
+
+def approx_bytes(collection, sample=8):
+    """Rough footprint of a collection of game objects: a few measured, scaled up to all of them."""
+    count = len(collection)
+    entries = collection.values() if isinstance(collection, dict) else collection
+    picked = list(itertools.islice(entries, sample))
+    if not picked: return 0
+    # Entities only count their own attributes; what those point at (the game, shared images) is counted elsewhere
+    each = sum(object_size(e) if hasattr(e, '__dict__') or hasattr(type(e), '__slots__') else approx_size(e) for e in picked) / len(picked)
+    return int(each * count)
+
+
+class DebugStats:
+    """
+    Counts of live game objects and caches, with rough byte sizes, for spotting leaks
+    in long sessions. sample() runs every frame and keeps a high-water mark of each
+    count per state class. The overlay (toggled with F3) shows a snapshot refreshed
+    every OVERLAY_REFRESH frames. If dump_path is set, a full snapshot is appended
+    to it as one JSON line every dump_interval seconds. A full snapshot adds GC
+    stats and the most common object types.
+    """
+    def __init__(self, game, dump_path=None, dump_interval=30.0, overlay=False):
+        self.game = game
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.overlay = overlay
+        self.high_water = {} # state class name -> count name -> most seen
+        self.last_dump = time.perf_counter()
+        self.overlay_lines = []
+        self.overlay_age = OVERLAY_REFRESH
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.overlay_age = OVERLAY_REFRESH
+
+    def counts(self, state):
+        counts = {name: len(getattr(state, name)) for name in COUNTED if hasattr(state, name)}
+        counts['glow_cache'] = len(GLOW_CACHE)
+        for attr, label in STATE_CACHES.items():
+            if hasattr(state, attr): counts[label] = len(getattr(state, attr))
+        return counts
+
+    def sample(self, state):
+        marks = self.high_water.setdefault(type(state).__name__, {})
+        for name, count in self.counts(state).items():
+            if count > marks.get(name, 0): marks[name] = count
+
+    def update(self, state):
+        self.sample(state)
+        if self.dump_path and time.perf_counter() - self.last_dump >= self.dump_interval:
+            self.last_dump = time.perf_counter()
+            self.dump(state)
+
+    def snapshot(self, state, full=False):
+        game = self.game
+        objects = {name: {'count': len(getattr(state, name)), 'bytes': approx_bytes(getattr(state, name))} for name in COUNTED if hasattr(state, name)}
+        caches = {'glow': {'count': len(GLOW_CACHE), 'bytes': cached_bytes(list(GLOW_CACHE.values()))}}
+        for attr, label in STATE_CACHES.items():
+            cache = getattr(state, attr, None)
+            if cache is not None: caches[label] = {'count': len(cache), 'bytes': cached_bytes(list(cache.values()))}
+        if hasattr(state, 'hud_widgets'):
+            widgets = state.hud_widgets.values()
+            caches['hud'] = {'count': len(widgets), 'bytes': sum(surface_bytes(w.surf) for w in widgets), 'redraws': sum(w.redraws for w in widgets)}
+
+        manager = game.animation_manager
+        loose_frames = [img for data in list(manager.animations.values()) for img in data.image_list]
+        assets = {
+            'animations': {'loaded': len(manager.animations), 'known': len(manager.paths), 'atlas_pages': len(manager.atlas.pages),
+                           'bytes': sum(surface_bytes(p) for p in manager.atlas.pages) + sum(surface_bytes(img) for img in loose_frames)},
+            'item_icons': {'count': len(game.item_icons), 'bytes': cached_bytes(list(game.item_icons.values()))},
+            'perk_icons': {'count': len(game.perk_icons), 'bytes': cached_bytes(list(game.perk_icons.values()))},
+            'backgrounds': {'count': len(game.background_cache), 'bytes': cached_bytes([s for layers in game.background_cache.values() for s in layers.values()])},
+        }
+        snapshot = {
+            'time': round(time.time(), 1),
+            'state': type(state).__name__,
+            'quality': game.effects.level,
+            'objects': objects,
+            'caches': caches,
+            'assets': assets,
+            'sounds': game.sounds.get_stats(),
+            'effects': game.effects.get_stats(),
+            'high_water': self.high_water,
+        }
+        if hasattr(state, 'lights'): snapshot['lights'] = {'scale': state.lights.scale, 'drawn': state.lights.drawn, 'lit_area': state.lights.lit_area}
+        for attr in ('coin_pool', 'projectile_pool', 'turret_projectile_pool'):
+            if hasattr(state, attr): snapshot.setdefault('pools', {})[attr] = getattr(state, attr).get_stats()
+        if full:
+            # Walks every tracked object, so only for dumps
+            all_objects = gc.get_objects()
+            fonts = [obj for obj in all_objects if isinstance(obj, Font)]
+            assets['fonts'] = {'count': len(fonts), 'bytes': cached_bytes(fonts)}
+            snapshot['gc'] = {
+                'counts': gc.get_count(),
+                'generations': gc.get_stats(),
+                'objects': len(all_objects),
+                'top_types': Counter(type(obj).__name__ for obj in all_objects).most_common(15),
+            }
+        return snapshot
+
+    def dump(self, state):
+        try:
+            with open(self.dump_path, 'a') as f:
+                f.write(json.dumps(self.snapshot(state, full=True)) + '\n')
+        except OSError as e:
+            print(f"Warning: Could not write debug stats to '{self.dump_path}'. Reason: {e}")
+            self.dump_path = None
+
+    def render_overlay(self, surface, state):
+        self.overlay_age += 1
+        if self.overlay_age >= OVERLAY_REFRESH:
+            self.overlay_age = 0
+            self.overlay_lines = self.format_lines(self.snapshot(state))
+        font, shadow = self.game.white_font, self.game.black_font
+        y = 2
+        for line in self.overlay_lines:
+            shadow.render(line, surface, (3, y + 1))
+            font.render(line, surface, (2, y))
+            y += font.line_height + 1
+
+    def format_lines(self, snapshot):
+        kb = lambda n: f"{n / 1024:.0f}k"
+        marks = snapshot['high_water'].get(snapshot['state'], {})
+        lines = [f"{snapshot['state']} - quality {snapshot['quality']}"]
+        objects = [f"{name} {entry['count']}/{marks.get(name, 0)} {kb(entry['bytes'])}" for name, entry in snapshot['objects'].items()]
+        caches = [f"{name} {entry['count']} {kb(entry['bytes'])}" for name, entry in snapshot['caches'].items()]
+        # Two to a line, so the gameplay list fits on screen
+        lines += ['  '.join(objects[i:i + 2]) for i in range(0, len(objects), 2)]
+        lines += ['cache ' + '  '.join(caches[i:i + 2]) for i in range(0, len(caches), 2)]
+        anims = snapshot['assets']['animations']
+        lines.append(f"anims: {anims['loaded']}/{anims['known']} pages {anims['atlas_pages']} {kb(anims['bytes'])}")
+        sounds = snapshot['sounds']
+        lines.append(f"sfx: {sounds['active']}/{sounds['channels']} decoded {sounds['decoded']}")
+        lines.append(f"gc: {gc.get_count()}")
+        return lines
@@ -0,0 +1,82 @@
+# data/scripts/directive_pool.py
+import threading
+import time
+
+from .gemini_agent import validate_directive
+
+def has_directive_insight(save_data):
+    return save_data['upgrades'].get('prophecy_clarity', 0) > 0
+
+def build_directive_prompt(save_data):
+    directive_insight = has_directive_insight(save_data)
+    return f"You are the Mainframe AI in the roguelike game 'Nex Miner'. Generate a mission directive for the player's next run. The directive must be a valid JSON object with keys 'objective_type', 'value', 'reward_type', 'reward_value', and 'flavor_text'. Objective types: 'collect_coins', 'destroy_tiles_dash', 'reach_combo'. Reward types: 'coins' (value 50-200) or 'item' (value 'shield', 'bomb', 'warp', etc.). {'Make the reward slightly better due to Directive Insight.' if directive_insight else ''} Respond ONLY with the JSON. Example: {{\"objective_type\": \"reach_combo\", \"value\": 15, \"reward_type\": \"item\", \"reward_value\": \"shield\", \"flavor_text\": \"System Overclock to 1500% efficiency is requested...\"}}"
+
+class DirectivePool:
+    """
+    Keeps a few pre-generated directives in save_data['directive_pool'] so the hub
+    can hand one out instantly. Refills happen on a background thread whenever
+    the pool drops below REFILL_THRESHOLD. Each entry is stored as
+    {'insight': bool, 'directive': {...}}, so ones generated before Prophecy Clarity
+    was bought are thrown out instead of handed out.
+    """
+    TARGET_SIZE = 3
+    REFILL_THRESHOLD = 2
+    RETRY_DELAY = 30 # seconds to wait after a failed request before trying again
+
+    def __init__(self, game):
+        self.game = game
+        self.lock = threading.Lock()
+        self.refilling = False
+        self.retry_at = 0
+        self.dirty = False # True when the pool changed and save.json is behind
+        # Bare directives come from saves before entries were tagged; they were generated
+        # without insight. Drop anything that was corrupted or hand-edited in the save file.
+        entries = [{'insight': False, 'directive': e} if validate_directive(e) else e for e in game.save_data.setdefault('directive_pool', [])]
+        self.directives = [e for e in entries if isinstance(e, dict) and isinstance(e.get('insight'), bool) and validate_directive(e.get('directive'))]
+        game.save_data['directive_pool'] = self.directives
+
+    def __len__(self):
+        return len(self.directives)
+
+    def take(self):
+        """Returns a ready directive, or None if the pool has none for the current upgrades."""
+        insight = has_directive_insight(self.game.save_data)
+        with self.lock:
+            current = [e for e in self.directives if e['insight'] == insight]
+            if len(current) != len(self.directives):
+                self.directives[:] = current # Same list as save_data['directive_pool']
+                self.dirty = True
+            entry = self.directives.pop(0) if self.directives else None
+            if entry: self.dirty = True
+        self.maybe_refill()
+        return entry['directive'] if entry else None
+
+    def maybe_refill(self):
+        if not self.game.ai_agent or self.refilling or time.time() < self.retry_at: return
+        if len(self.directives) >= self.REFILL_THRESHOLD: return
+        self.refilling = True
+        # The prompt is built here so the save data is only read on the main thread
+        prompt = build_directive_prompt(self.game.save_data)
+        threading.Thread(target=self._refill, args=(prompt, has_directive_insight(self.game.save_data)), daemon=True).start()
+
+    def _refill(self, prompt, insight):
+        try:
+            while len(self.directives) < self.TARGET_SIZE:
+                try:
+                    directive = self.game.ai_agent.generate(prompt, 'directive')
+                except Exception:
+                    directive = None
+                if not isinstance(directive, dict):
+                    self.retry_at = time.time() + self.RETRY_DELAY
+                    return
+                with self.lock:
+                    self.directives.append({'insight': insight, 'directive': directive})
+                    self.dirty = True
+        finally:
+            self.refilling = False
+
+    def save_if_dirty(self):
+        if self.dirty:
+            with self.lock:
+                self.dirty = False
+                self.game.write_save(self.game.save_data)
@@ -4,10 +4,20 @@ from ..entity import Entity
 from ..core_funcs import normalize
 
 class Item(Entity):
+    __slots__ = ('state', 'velocity', 'time')
+    SHARED_ANIMATION = True
+
     def __init__(self, assets, pos, size, type, state, velocity=[0, 0]):
         super().__init__(assets, pos, size, type)
         self.state = state
-        self.velocity = velocity
+        self.velocity = list(velocity)
+        self.time = 0
+
+    def respawn(self, assets, pos, size, type, state, velocity=(0, 0)):
+        self.assets = assets
+        super().respawn(pos, size, type)
+        self.state = state
+        self.velocity[0], self.velocity[1] = velocity[0], velocity[1]
         self.time = 0
 
     def update(self, tiles, time_scale=1.0):
@@ -1,9 +1,19 @@
 # Cavyn Source/data/scripts/entities/player.py
 import random
 import math 
+import pygame
 from ..entity import Entity
 
+GHOST_CACHE_SIZE = 256 # Poses kept by ghost_image(); rotation is continuous under slow-mo, so it's capped
+
 class Player(Entity):
+    __slots__ = (
+        'state', 'velocity', 'right', 'left', 'speed', 'jumps', 'jumps_max', 'jumping', 'jump_rot',
+        'air_time', 'coyote_timer', 'jump_buffer_timer', 'dash_timer', 'DASH_SPEED', 'DASH_DURATION',
+        'FOCUS_METER_MAX', 'FOCUS_RECHARGE_RATE', 'focus_meter', 'is_charging_dash', 'FOCUS_DASH_COST',
+        'wall_contact_timer', 'is_wall_sliding',
+    )
+
     def __init__(self, assets, pos, size, type, state):
         super().__init__(assets, pos, size, type)
         self.state = state
@@ -23,9 +33,8 @@ class Player(Entity):
         self.DASH_DURATION = 8
         
         # Apply Focus Mastery upgrade
-        focus_level = self.state.game.save_data['upgrades'].get('focus_mastery', 0)
-        self.FOCUS_METER_MAX = 100 + focus_level * 15
-        self.FOCUS_RECHARGE_RATE = 0.4 + focus_level * 0.05
+        self.FOCUS_METER_MAX = self.state.stats.focus_max
+        self.FOCUS_RECHARGE_RATE = self.state.stats.focus_recharge
 
         self.focus_meter = self.FOCUS_METER_MAX
         self.is_charging_dash = False
@@ -35,10 +44,20 @@ class Player(Entity):
         # --- FIX: Initialize the collisions attribute ---
         self.collisions = {'top': False, 'bottom': False, 'left': False, 'right': False}
 
+    def ghost_image(self):
+        # The jump ghost for the current frame and pose, baked once (mirrored the way
+        # render_ghosts always drew it) and reused by every later jump in that pose
+        frame = self.active_animation.img if self.active_animation else self.current_image
+        key = (frame, self.scale[0], self.scale[1], self.flip[0], self.flip[1], self.rotation)
+        cache = self.state.ghost_frames
+        img = cache.get(key)
+        if img is None:
+            if len(cache) >= GHOST_CACHE_SIZE: cache.clear()
+            img = cache[key] = pygame.transform.flip(self.img, self.flip[0], False)
+        return img
+
     def attempt_jump(self):
-        ghost_img = self.img.copy()
-        ghost_img.set_alpha(120)
-        self.state.ghosts.append([ghost_img, self.pos.copy(), 15, self.flip[0]])
+        if self.state.game.effects.ghost_trails: self.state.ghosts.add([self.ghost_image(), self.pos.copy(), 15])
 
         jump_velocity = -5
         if self.is_wall_sliding:
@@ -48,9 +67,9 @@ class Player(Entity):
                 angle = random.uniform(math.pi * 0.75, math.pi * 1.25)
                 if self.flip[0]: angle = random.uniform(-math.pi * 0.25, math.pi * 0.25)
                 speed = random.uniform(1.5, 3.5)
-                self.state.sparks.append([self.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], random.uniform(3, 6), 0.1, (251, 245, 239), True, 0.05])
+                self.state.add_spark([self.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], random.uniform(3, 6), 0.1, (251, 245, 239), True, 0.05])
 
-        elif 'acrobat' in self.state.active_perks and self.wall_contact_timer > 0:
+        elif self.state.wall_jump and self.wall_contact_timer > 0:
             jump_velocity = -6.5
             self.wall_contact_timer = 0
 
@@ -62,7 +81,7 @@ class Player(Entity):
                 for i in range(24):
                     physics = random.choice([False, False, True])
                     direction = 1 if i % 2 else -1
-                    self.state.sparks.append([[self.center[0] + random.uniform(-7, 7), self.center[1]], [direction * (random.uniform(0.05, 0.1)) + (random.uniform(-2, 2)) * physics, random.uniform(0.05, 0.1) + random.uniform(0, 2) * physics], random.uniform(3, 6), 0.04 - 0.02 * physics, (6, 4, 1), physics, 0.05 * physics])
+                    self.state.add_spark([[self.center[0] + random.uniform(-7, 7), self.center[1]], [direction * (random.uniform(0.05, 0.1)) + (random.uniform(-2, 2)) * physics, random.uniform(0.05, 0.1) + random.uniform(0, 2) * physics], random.uniform(3, 6), 0.04 - 0.02 * physics, (6, 4, 1), physics, 0.05 * physics])
 
             if self.coyote_timer <= 0: self.jumps -= 1
             self.coyote_timer = 0
@@ -82,7 +101,7 @@ class Player(Entity):
         if self.dash_timer > 0:
             direction = 1 if self.flip[0] else -1
             self.velocity[0] = direction * self.DASH_SPEED
-            self.state.sparks.append([[self.center[0] - direction * 6, self.center[1] + random.uniform(-3, 3)], [-direction * random.uniform(1, 2), random.uniform(-0.5, 0.5)], random.uniform(2, 5), 0.15, (200, 220, 255), False, 0])
+            self.state.add_spark([[self.center[0] - direction * 6, self.center[1] + random.uniform(-3, 3)], [-direction * random.uniform(1, 2), random.uniform(-0.5, 0.5)], random.uniform(2, 5), 0.15, (200, 220, 255), False, 0])
         else: 
             target_vel_x = self.speed if self.right else -self.speed if self.left else 0
             self.velocity[0] += (target_vel_x - self.velocity[0]) * 0.3
@@ -98,11 +117,10 @@ class Player(Entity):
                     self.velocity[1] = min(self.velocity[1], 1.2)
                     if self.state.master_clock % 4 == 0:
                         direction = -1 if self.collisions['left'] else 1
-                        self.state.sparks.append([[self.center[0] + direction * 4, self.center[1]], [direction * 0.5, random.uniform(-0.2, 0.2)], random.uniform(1, 3), 0.1, (180, 180, 180), False, 0])
+                        self.state.add_spark([[self.center[0] + direction * 4, self.center[1]], [direction * 0.5, random.uniform(-0.2, 0.2)], random.uniform(1, 3), 0.1, (180, 180, 180), False, 0])
             
             if not self.is_wall_sliding:
-                gravity = 0.24 if 'feather_fall' in self.state.active_perks else 0.3
-                self.velocity[1] = min(self.velocity[1] + gravity, 4)
+                self.velocity[1] = min(self.velocity[1] + self.state.player_gravity, 4)
 
         if not self.state.dead and self.dash_timer <= 0:
             if self.velocity[0] > 0.1: self.flip[0] = True
@@ -132,11 +150,11 @@ class Player(Entity):
         if self.collisions['bottom']:
             self.velocity[1] = 0
             if was_in_air_for_long:
-                self.state.game.sounds['land'].play()
+                self.state.game.sounds.play('land')
                 for i in range(10):
                     angle = random.uniform(math.pi * 0.9, math.pi * 2.1)
                     speed = random.uniform(0.5, 1.5)
-                    self.state.sparks.append([list(self.rect.midbottom), [math.cos(angle) * speed, -math.sin(angle) * speed], random.uniform(2, 4), 0.1, (180, 180, 190), True, 0.02])
+                    self.state.add_spark([list(self.rect.midbottom), [math.cos(angle) * speed, -math.sin(angle) * speed], random.uniform(2, 4), 0.1, (180, 180, 190), True, 0.02])
 
             self.air_time = 0
             self.jumps = self.jumps_max
@@ -144,7 +162,7 @@ class Player(Entity):
             self.rotation = 0
             if self.jump_buffer_timer > 0:
                 self.jump_buffer_timer = 0
-                self.state.game.sounds['jump'].play()
+                self.state.game.sounds.play('jump')
                 self.attempt_jump()
         elif was_on_ground: self.coyote_timer = 6
         return self.collisions
\ No newline at end of file
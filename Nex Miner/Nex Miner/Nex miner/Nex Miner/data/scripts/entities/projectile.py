@@ -2,11 +2,21 @@
 from ..entity import Entity
 
 class Projectile(Entity):
+    __slots__ = ('state', 'velocity', 'health')
+    SHARED_ANIMATION = True
+
     def __init__(self, assets, pos, size, type, state, velocity=[0, 0]):
         super().__init__(assets, pos, size, type)
         self.state = state
-        self.velocity = velocity
-        self.health = 2 if 'technician' in self.state.active_perks else 1
+        self.velocity = list(velocity)
+        self.health = self.state.projectile_health
+
+    def respawn(self, assets, pos, size, type, state, velocity=(0, 0)):
+        self.assets = assets
+        super().respawn(pos, size, type)
+        self.state = state
+        self.velocity[0], self.velocity[1] = velocity[0], velocity[1]
+        self.health = self.state.projectile_health
 
     def update(self, time_scale=1.0):
         super().update(1/60, time_scale)
@@ -2,10 +2,12 @@
 import math
 import random 
 from ..entity import Entity
-from .turret_projectile import TurretProjectile
-from ..core_funcs import get_line # <<< NEW IMPORT
+from ..core_funcs import line_clear
 
 class Turret(Entity):
+    __slots__ = ('state', 'parent_tile_pos', 'health', 'action', 'fire_cooldown', 'FIRE_RATE', 'TARGET_RANGE_Y', 'los_key', 'los_clear')
+    SHARED_ANIMATION = True
+
     def __init__(self, assets, pos, size, type, state, parent_tile_pos):
         super().__init__(assets, pos, size, type)
         self.state = state
@@ -17,6 +19,8 @@ class Turret(Entity):
         self.fire_cooldown = random.randint(30, 90) # Stagger initial shots
         self.FIRE_RATE = 150 # Time between shots
         self.TARGET_RANGE_Y = 64 # Vertical range to start firing
+        self.los_key = None # (turret cell, player cell, state.tile_version) that los_clear was worked out for
+        self.los_clear = False
         
     def update(self, player_rect_world, time_scale=1.0):
         super().update(1/60, time_scale)
@@ -39,18 +43,13 @@ class Turret(Entity):
                     start_pos_grid = (int(self.center[0] // self.state.game.TILE_SIZE), int(self.center[1] // self.state.game.TILE_SIZE))
                     end_pos_grid = (int(player_rect_world.centerx // self.state.game.TILE_SIZE), int(player_rect_world.centery // self.state.game.TILE_SIZE))
                     
-                    los_clear = True
-                    # Get all grid cells between turret and player
-                    line_to_player = get_line(start_pos_grid, end_pos_grid)
-                    
-                    # Check if any of these cells contains a solid tile
-                    for pos in line_to_player:
-                        tile_key = (pos[0], pos[1])
-                        if tile_key in self.state.tiles and self.state.tiles[tile_key].get('type') not in ['chest', 'opened_chest']:
-                            los_clear = False
-                            break
+                    # Only re-trace the line when either end moved to a new cell or the tiles changed
+                    los_key = (start_pos_grid, end_pos_grid, self.state.tile_version)
+                    if los_key != self.los_key:
+                        self.los_key = los_key
+                        self.los_clear = line_clear(start_pos_grid, end_pos_grid, self.state.solid_rows)
                             
-                    if los_clear:
+                    if self.los_clear:
                         self.fire()
 
     def fire(self):
@@ -58,18 +57,15 @@ class Turret(Entity):
             return
         self.fire_cooldown = self.FIRE_RATE
         
-        if 'shoot' in self.state.game.sounds:
-            self.state.game.sounds['shoot'].play()
-        elif 'jump' in self.state.game.sounds: # Fallback sound
-             self.state.game.sounds['jump'].play()
+        self.state.game.sounds.play('shoot')
 
         # Create a projectile in world coordinates
         direction = 1 if self.flip[0] else -1
         vel = [2 * direction, 0]
         pos = list(self.center)
         
-        self.state.turret_projectiles.append(
-            TurretProjectile(self.assets, pos, (5, 3), 'turret_projectile', self.state, velocity=vel)
+        self.state.turret_projectiles.add(
+            self.state.turret_projectile_pool.acquire(self.assets, pos, (5, 3), 'turret_projectile', self.state, velocity=vel)
         )
 
     def take_damage(self, amount):
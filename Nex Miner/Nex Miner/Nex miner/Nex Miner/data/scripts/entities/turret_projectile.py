@@ -3,12 +3,22 @@ import math
 from ..entity import Entity
 
 class TurretProjectile(Entity):
+    __slots__ = ('state', 'velocity', 'time')
+    SHARED_ANIMATION = True
+
     def __init__(self, assets, pos, size, type, state, velocity=[0, 0]):
         super().__init__(assets, pos, size, type)
         self.state = state
         self.velocity = list(velocity)
         self.time = 0
 
+    def respawn(self, assets, pos, size, type, state, velocity=(0, 0)):
+        self.assets = assets
+        super().respawn(pos, size, type)
+        self.state = state
+        self.velocity[0], self.velocity[1] = velocity[0], velocity[1]
+        self.time = 0
+
     def update(self, time_scale=1.0):
         super().update(1/60, time_scale)
         self.time += 1
@@ -12,6 +12,16 @@ def collision_list(obj, obj_list):
     return hit_list
 
 class Entity:
+    # Entities are created and destroyed in bulk (coin showers, projectiles), so they
+    # use slots instead of a per-instance __dict__. Subclasses declare their own fields.
+    __slots__ = (
+        'assets', 'pos', 'size', 'type', 'flip', 'rotation', 'centered', 'opacity', 'scale',
+        'active_animation', 'height', 'current_image', 'image_base_dimensions', 'collisions',
+        '_rect', '_center', '_cache_x', '_cache_y', '_cache_centered', '_probe_rect', '_temp_rect',
+    )
+    # Subclasses spawned in bulk set this to run every instance off one AnimationManager.shared() clock
+    SHARED_ANIMATION = False
+
     def __init__(self, assets, pos, size, type):
         self.assets = assets
         self.pos = list(pos).copy()
@@ -24,9 +34,19 @@ class Entity:
         self.scale = [1, 1]
         self.active_animation = None
         self.height = 0
+        self.collisions = {'top': False, 'bottom': False, 'left': False, 'right': False}
+
+        # rect/center are cached and refreshed in place when pos or size changes (see _refresh_cache)
+        self._rect = pygame.Rect(0, 0, 0, 0)
+        self._center = [0, 0]
+        self._cache_x = self._cache_y = None
+        self._cache_centered = False
+        # Scratch rects for move(), so collision checks don't allocate
+        self._probe_rect = pygame.Rect(0, 0, 0, 0)
+        self._temp_rect = pygame.Rect(0, 0, 0, 0)
 
         # Try to set an animation based on the entity's type
-        if self.type + '_idle' in self.assets.animations:
+        if self.type + '_idle' in self.assets:
             self.set_action('idle')
             
         # --- FIX: Prevent crash on entities with no animation ---
@@ -39,14 +59,42 @@ class Entity:
             self.set_image(pygame.Surface(self.size, pygame.SRCALPHA))
 
 
+    def respawn(self, pos, size, type):
+        # Used by EntityPool: puts a recycled entity back the way __init__ leaves it,
+        # reusing its lists and animation object instead of allocating new ones.
+        self.pos[0], self.pos[1] = pos[0], pos[1]
+        self.size[0], self.size[1] = size[0], size[1]
+        self.flip[0] = self.flip[1] = False
+        self.rotation = 0
+        self.centered = False
+        self.opacity = 255
+        self.scale[0] = self.scale[1] = 1
+        self.height = 0
+        for side in self.collisions: self.collisions[side] = False
+
+        if type != self.type:
+            self.type = type
+            self.active_animation = None
+            if self.type + '_idle' in self.assets:
+                self.set_action('idle')
+        elif self.active_animation and not self.active_animation.shared:
+            self.set_action('idle')
+            self.active_animation.paused = self.active_animation.data.config['paused']
+            self.active_animation.rewind()
+        if not self.active_animation and getattr(self, 'image_base_dimensions', None) != self.size:
+            self.set_image(pygame.Surface(self.size, pygame.SRCALPHA))
+
     @property
     def img(self):
         # This branch is now safe because self.current_image is guaranteed to exist.
         if not self.active_animation:
             img = self.current_image
         else:
-            self.set_image(self.active_animation.img)
-            img = self.current_image
+            # The frame is used as-is (it's a view into the animation atlas); transforms below make copies
+            img = self.active_animation.img
+            if img is not getattr(self, 'current_image', None):
+                self.current_image = img
+                self.image_base_dimensions = list(img.get_size())
             
         if self.scale != [1, 1]:
             img = pygame.transform.scale(img, (int(self.scale[0] * self.image_base_dimensions[0]), int(self.scale[1] * self.image_base_dimensions[1])))
@@ -59,39 +107,51 @@ class Entity:
             img.set_alpha(self.opacity)
         return img
 
-    @property
-    def rect(self):
+    def _refresh_cache(self):
+        pos, size = self.pos, self.size
         if not self.centered:
-            return pygame.Rect(self.pos[0] // 1, self.pos[1] // 1, self.size[0], self.size[1])
+            self._rect.update(pos[0] // 1, pos[1] // 1, size[0], size[1])
+            self._center[0], self._center[1] = pos[0] + size[0] // 2, pos[1] + size[1] // 2
         else:
-            return pygame.Rect((self.pos[0] - self.size[0] // 2) // 1, (self.pos[1] - self.size[1] // 2) // 1, self.size[0], self.size[1])
+            self._rect.update((pos[0] - size[0] // 2) // 1, (pos[1] - size[1] // 2) // 1, size[0], size[1])
+            self._center[0], self._center[1] = pos[0], pos[1]
+        self._cache_x, self._cache_y, self._cache_centered = pos[0], pos[1], self.centered
+
+    def _cache_stale(self):
+        r = self._rect
+        return self.pos[0] != self._cache_x or self.pos[1] != self._cache_y or self.size[0] != r.w or self.size[1] != r.h or self.centered != self._cache_centered
+
+    # rect and center return the same shared objects every time. Copy them before modifying.
+    @property
+    def rect(self):
+        if self._cache_stale(): self._refresh_cache()
+        return self._rect
 
     @property
     def center(self):
-        if self.centered:
-            return self.pos.copy()
-        else:
-            return [self.pos[0] + self.size[0] // 2, self.pos[1] + self.size[1] // 2]
+        if self._cache_stale(): self._refresh_cache()
+        return self._center
 
     def set_action(self, action_id, force=False):
         animation_name = self.type + '_' + action_id
         
         # --- IMPROVEMENT: Animation Fallback for Characters ---
         is_valid_specific_anim = False
-        if animation_name in self.assets.animations:
-            if self.assets.animations[animation_name].frame_surfs:
-                is_valid_specific_anim = True
+        anim_data = self.assets.get(animation_name)
+        if anim_data and anim_data.frame_surfs:
+            is_valid_specific_anim = True
         
         # --- FIX: Make fallback logic robust for all characters ---
         # This checks if the entity is a player-like character by checking if its type exists in the game's character list.
         # This is safer than a hardcoded list and works for AI-generated characters.
         if not is_valid_specific_anim and hasattr(self, 'state') and hasattr(self.state, 'game') and self.type in self.state.game.characters:
             fallback_animation_name = 'player' + '_' + action_id
-            if fallback_animation_name in self.assets.animations and self.assets.animations[fallback_animation_name].frame_surfs:
+            fallback_data = self.assets.get(fallback_animation_name)
+            if fallback_data and fallback_data.frame_surfs:
                  animation_name = fallback_animation_name
 
         if force or (not self.active_animation) or (self.active_animation.data.id != animation_name):
-            new_anim = self.assets.new(animation_name)
+            new_anim = self.assets.shared(animation_name) if self.SHARED_ANIMATION else self.assets.new(animation_name)
             if new_anim: # Check if animation loaded successfully
                 self.active_animation = new_anim
 
@@ -134,35 +194,51 @@ class Entity:
         return True
 
     def move(self, motion, tiles, time_scale=1.0):
-        self.pos[0] += motion[0] * time_scale
-        hit_list = collision_list(self.rect, tiles)
-        temp_rect = self.rect
-        directions = {k : False for k in ['top', 'left', 'right', 'bottom']}
-        for tile in hit_list:
-            if motion[0] * time_scale > 0:
-                temp_rect.right = tile.left
-                self.pos[0] = temp_rect.x
-                directions['right'] = True
-            if motion[0] * time_scale < 0:
-                temp_rect.left = tile.right
-                self.pos[0] = temp_rect.x
-                directions['left'] = True
-            if self.centered:
-                self.pos[0] += self.size[0] // 2
-        self.pos[1] += motion[1] * time_scale
-        hit_list = collision_list(self.rect, tiles)
-        temp_rect = self.rect
-        for tile in hit_list:
-            if motion[1] * time_scale > 0:
-                temp_rect.bottom = tile.top
-                self.pos[1] = temp_rect.y
-                directions['bottom'] = True
-            if motion[1] * time_scale < 0:
-                temp_rect.top = tile.bottom
-                self.pos[1] = temp_rect.y
-                directions['top'] = True
-            if self.centered:
-                self.pos[1] += self.size[1] // 2
+        # Returns self.collisions, which is reused between calls rather than rebuilt.
+        # probe is the rect right after moving on an axis, temp is pushed out of each hit.
+        # collidelist() finds the first hit in C, so the common no-hit case never loops in Python.
+        directions = self.collisions
+        directions['top'] = directions['left'] = directions['right'] = directions['bottom'] = False
+        probe, temp_rect = self._probe_rect, self._temp_rect
+        dx, dy = motion[0] * time_scale, motion[1] * time_scale
+
+        self.pos[0] += dx
+        probe.update(self.rect)
+        first_hit = probe.collidelist(tiles)
+        if first_hit != -1:
+            temp_rect.update(probe)
+            for i in range(first_hit, len(tiles)):
+                tile = tiles[i]
+                if not probe.colliderect(tile): continue
+                if dx > 0:
+                    temp_rect.right = tile.left
+                    self.pos[0] = temp_rect.x
+                    directions['right'] = True
+                if dx < 0:
+                    temp_rect.left = tile.right
+                    self.pos[0] = temp_rect.x
+                    directions['left'] = True
+                if self.centered:
+                    self.pos[0] += self.size[0] // 2
+
+        self.pos[1] += dy
+        probe.update(self.rect)
+        first_hit = probe.collidelist(tiles)
+        if first_hit != -1:
+            temp_rect.update(probe)
+            for i in range(first_hit, len(tiles)):
+                tile = tiles[i]
+                if not probe.colliderect(tile): continue
+                if dy > 0:
+                    temp_rect.bottom = tile.top
+                    self.pos[1] = temp_rect.y
+                    directions['bottom'] = True
+                if dy < 0:
+                    temp_rect.top = tile.bottom
+                    self.pos[1] = temp_rect.y
+                    directions['top'] = True
+                if self.centered:
+                    self.pos[1] += self.size[1] // 2
         return directions
 
     def render(self, surf, offset=(0, 0)):
@@ -0,0 +1,38 @@
+# data/scripts/entity_pool.py
+
+class EntityPool:
+    """
+    Free list for one entity class. acquire() takes the same arguments as the class
+    constructor and hands back a recycled instance (via its respawn() method) when one
+    is available, so bursts of coins or projectiles don't construct new entities and
+    animations. Entities are returned with release(), normally from EntityStore.flush().
+    """
+    def __init__(self, entity_class, max_free=256):
+        self.entity_class = entity_class
+        self.max_free = max_free
+        self.free = []
+        # Metrics, shown by the debug overlay
+        self.live = 0
+        self.high_water = 0 # Most instances out of the pool at once
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            entity = self.free.pop()
+            entity.respawn(*args, **kwargs)
+            self.reused += 1
+        else:
+            entity = self.entity_class(*args, **kwargs)
+            self.created += 1
+        self.live += 1
+        if self.live > self.high_water: self.high_water = self.live
+        return entity
+
+    def release(self, entity):
+        self.live = max(0, self.live - 1)
+        if len(self.free) < self.max_free:
+            self.free.append(entity)
+
+    def get_stats(self):
+        return {'live': self.live, 'free': len(self.free), 'high_water': self.high_water, 'created': self.created, 'reused': self.reused}
@@ -0,0 +1,98 @@
+# data/scripts/entity_store.py
+
+SLOT_BITS = 20
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+class EntityStore:
+    """
+    Packed container for short-lived game objects (entities, tile drops, ghosts, data nodes).
+
+    add() returns an int handle that stays valid until that entry is killed, however the
+    store gets reordered. kill() only marks the entry: it drops out of iteration and len()
+    straight away, but is swap-removed in flush(), which the owning state calls once per
+    frame. That makes it safe to kill anything from inside nested loops. Killing twice or
+    with a stale handle does nothing. on_free, if given, is called with each entry as it is
+    actually removed (used to hand entities back to an EntityPool).
+    """
+    def __init__(self, entries=(), on_free=None):
+        self.on_free = on_free
+        self.entries = [] # Packed objects, in no particular order
+        self.handles = [] # Handle of each entry
+        self.alive = [] # False once killed, until the next flush()
+        self.slot_index = [] # slot -> position in entries
+        self.slot_gen = [] # slot -> generation of the handle currently holding it
+        self.free_slots = []
+        self.pending = [] # Slots killed since the last flush()
+        for entry in entries: self.add(entry)
+
+    def __len__(self):
+        return len(self.entries) - len(self.pending)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        # Entries added during iteration are picked up next frame
+        entries, alive = self.entries, self.alive
+        for i in range(len(entries)):
+            if alive[i]: yield entries[i]
+
+    def items(self):
+        """Yields (handle, entry) for every live entry."""
+        entries, handles, alive = self.entries, self.handles, self.alive
+        for i in range(len(entries)):
+            if alive[i]: yield handles[i], entries[i]
+
+    def add(self, entry):
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.slot_gen)
+            self.slot_gen.append(0)
+            self.slot_index.append(-1)
+        handle = (self.slot_gen[slot] << SLOT_BITS) | slot
+        self.slot_index[slot] = len(self.entries)
+        self.entries.append(entry)
+        self.handles.append(handle)
+        self.alive.append(True)
+        return handle
+
+    def _index_of(self, handle):
+        slot = handle & SLOT_MASK
+        if slot < len(self.slot_gen) and self.slot_gen[slot] == handle >> SLOT_BITS:
+            return self.slot_index[slot]
+        return -1
+
+    def is_alive(self, handle):
+        return self._index_of(handle) != -1
+
+    def get(self, handle):
+        index = self._index_of(handle)
+        return self.entries[index] if index != -1 else None
+
+    def kill(self, handle):
+        """Marks an entry for removal. Returns False if it was already dead."""
+        index = self._index_of(handle)
+        if index == -1: return False
+        slot = handle & SLOT_MASK
+        self.alive[index] = False
+        self.slot_gen[slot] += 1 # Invalidates every copy of this handle right away
+        self.pending.append(slot)
+        return True
+
+    def clear(self):
+        for handle, _ in list(self.items()): self.kill(handle)
+
+    def flush(self):
+        """Swap-removes everything killed since the last call. Not safe during iteration."""
+        entries, handles, alive, slot_index = self.entries, self.handles, self.alive, self.slot_index
+        for slot in self.pending:
+            index, last = slot_index[slot], len(entries) - 1
+            if self.on_free: self.on_free(entries[index])
+            if index != last:
+                entries[index], handles[index], alive[index] = entries[last], handles[last], alive[last]
+                slot_index[handles[index] & SLOT_MASK] = index
+            entries.pop(); handles.pop(); alive.pop()
+            slot_index[slot] = -1
+            self.free_slots.append(slot)
+        self.pending.clear()
@@ -2,6 +2,7 @@ import pygame
 from ..state import State
 from ..text import Font
 from ..gameplay_state import render_panel_9slice, GameplayState
+from ..asset_bundle import load_image
 
 class BiomeSelectState(State):
     def __init__(self, game, selected_mode):
@@ -9,7 +10,7 @@ class BiomeSelectState(State):
         self.mode = selected_mode
         self.unlocked_biomes = self.game.save_data['biomes_unlocked']
         self.selection_index = 0
-        self.panel_img = pygame.image.load(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
+        self.panel_img = load_image(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
         self.font_locked = Font(self.game.get_path('data', 'fonts', 'small_font.png'), (120, 120, 130))
         self.font_title = Font(self.game.get_path('data', 'fonts', 'small_font.png'), (255, 230, 90))
 
@@ -33,7 +34,7 @@ class BiomeSelectState(State):
             self.game.push_state(GameplayState(self.game, mode=self.mode, start_biome_index=self.selection_index))
         else:
             # Play a "fail" or "locked" sound
-            if 'combo_end' in self.game.sounds: self.game.sounds['combo_end'].play()
+            self.game.sounds.play('combo_end')
 
     def render(self, surface):
         surface.fill((22, 19, 40))
@@ -3,11 +3,14 @@ import pygame
 import math
 from ..state import State
 from .mainframe_intro_state import MainframeIntroState
+from .main_menu_state import MainMenuState
 
 class BootUpState(State):
     """
     A simple state to show a thematic boot-up sequence before the main game.
     """
+    ANIMATIONS = MainMenuState.ANIMATIONS # Loaded behind the boot text
+
     def __init__(self, game):
         super().__init__(game)
         self.timer = 0
@@ -3,6 +3,7 @@ import pygame
 from ..state import State
 from ..text import Font
 from ..gameplay_state import render_panel_9slice, GameplayState
+from ..asset_bundle import load_image
 
 class ChallengeSelectState(State):
     def __init__(self, game):
@@ -11,7 +12,7 @@ class ChallengeSelectState(State):
         self.challenges = self.game.challenges
         self.challenge_keys = list(self.challenges.keys())
         self.selection_index = 0
-        self.panel_img = pygame.image.load(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
+        self.panel_img = load_image(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
         self.highlight_font = Font(self.game.get_path('data', 'fonts', 'small_font.png'), (255, 230, 90))
 
     def handle_events(self, events):
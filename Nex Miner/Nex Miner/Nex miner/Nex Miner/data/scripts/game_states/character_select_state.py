@@ -5,6 +5,9 @@ from ..state import State
 from ..text import Font
 
 class CharacterSelectState(State):
+    # Only the hologram is animated; the rest is redrawn on input
+    DIRTY_RECTS = True
+
     def __init__(self, game):
         super().__init__(game)
         
@@ -46,18 +49,24 @@ class CharacterSelectState(State):
         self.master_clock += 1
         if self.player_anim:
             self.player_anim.play(1/60)
+        self.mark_dirty(self.display_area())
+
+    def display_area(self):
+        # The left column, between the header line and the footer, which holds render_character_display
+        return pygame.Rect(0, 26, 120, self.game.DISPLAY_SIZE[1] - 26 - 15)
 
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
+                self.mark_dirty()
                 if event.key in [pygame.K_DOWN, pygame.K_s]:
                     self.selection_index = (self.selection_index + 1) % len(self.character_keys)
                     self.update_player_animation()
-                    if 'shoot' in self.game.sounds: self.game.sounds['shoot'].play()
+                    self.game.sounds.play('shoot')
                 elif event.key in [pygame.K_UP, pygame.K_w]:
                     self.selection_index = (self.selection_index - 1 + len(self.character_keys)) % len(self.character_keys)
                     self.update_player_animation()
-                    if 'shoot' in self.game.sounds: self.game.sounds['shoot'].play()
+                    self.game.sounds.play('shoot')
                 elif event.key == pygame.K_ESCAPE:
                     self.game.pop_state()
                 elif event.key == pygame.K_RETURN:
@@ -68,7 +77,7 @@ class CharacterSelectState(State):
         unlocked_chars = self.game.save_data['characters']['unlocked']
 
         def play_confirm_sound():
-            if 'upgrade' in self.game.sounds: self.game.sounds['upgrade'].play()
+            self.game.sounds.play('upgrade')
 
         if selected_key in unlocked_chars:
             self.game.save_data['characters']['selected'] = selected_key
@@ -87,7 +96,7 @@ class CharacterSelectState(State):
                 play_confirm_sound()
                 self.game.pop_state()
             else:
-                 if 'combo_end' in self.game.sounds: self.game.sounds['combo_end'].play()
+                 self.game.sounds.play('combo_end')
     
     def render(self, surface):
         surface.fill((2, 4, 16))
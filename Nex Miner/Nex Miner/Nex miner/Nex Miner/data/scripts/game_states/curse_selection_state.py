@@ -4,6 +4,8 @@ import random
 from ..state import State
 
 class CurseSelectionState(State):
+    BACKGROUND_TINT = (40, 5, 10, 210) # Ominous red, blended into background_surf by Game.capture_frame
+
     def __init__(self, game, gameplay_state, curses_to_offer, background_surf):
         super().__init__(game)
         self.gameplay_state = gameplay_state
@@ -20,7 +22,7 @@ class CurseSelectionState(State):
                     self.selection_index = (self.selection_index - 1 + len(self.curses_to_offer)) % len(self.curses_to_offer)
                 elif event.key in [pygame.K_RETURN, pygame.K_e, pygame.K_x]:
                     chosen_curse = self.curses_to_offer[self.selection_index]
-                    self.gameplay_state.active_curses.add(chosen_curse)
+                    self.gameplay_state.add_curse(chosen_curse)
                     self.game.pop_state()
                 elif event.key == pygame.K_r:
                     self.reroll_curses()
@@ -30,7 +32,7 @@ class CurseSelectionState(State):
             return
 
         self.gameplay_state.curse_rerolls_left -= 1
-        if 'time_slow_start' in self.game.sounds: self.game.sounds['time_slow_start'].play()
+        self.game.sounds.play('time_slow_start')
         
         current_curses_offered = set(self.curses_to_offer)
         all_curses = set(self.game.curses.keys())
@@ -46,10 +48,7 @@ class CurseSelectionState(State):
         self.selection_index = 0
                     
     def render(self, surface):
-        surface.blit(self.background_surf, (0, 0))
-        overlay = pygame.Surface(self.game.DISPLAY_SIZE, pygame.SRCALPHA)
-        overlay.fill((40, 5, 10, 210)) # Ominous red overlay
-        surface.blit(overlay, (0, 0))
+        surface.blit(self.background_surf, (0, 0)) # Already tinted
 
         title = "HAZARDOUS PROTOCOL DETECTED"
         title_w = self.game.white_font.width(title, 2)
@@ -5,6 +5,7 @@ from ..text import Font
 from ..ui_utils import render_panel_9slice # CORRECTED IMPORT
 from ..gameplay_state import GameplayState
 from .main_menu_state import MainMenuState
+from ..asset_bundle import load_image
 
 class GameOverState(State):
     def __init__(self, game, score, background_surf):
@@ -19,7 +20,7 @@ class GameOverState(State):
         self.selection_index = 0
         
         self.highlight_font = Font(self.game.get_path('data', 'fonts', 'small_font.png'), (255, 230, 90))
-        self.panel_img = pygame.image.load(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
+        self.panel_img = load_image(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
 
     def enter_state(self):
         super().enter_state()
@@ -50,9 +51,7 @@ class GameOverState(State):
     def update(self):
         self.master_clock += 1
         if self.end_coin_count < self.score:
-            if self.master_clock % 3 == 0 and 'coin_end' in self.game.sounds:
-                sound = self.game.sounds['coin_end']
-                if sound: sound.play()
+            if self.master_clock % 3 == 0: self.game.sounds.play('coin_end')
             
             increment = 1 + (self.score - self.end_coin_count) // 20
             self.end_coin_count = min(self.end_coin_count + increment, self.score)
@@ -6,6 +6,7 @@ import random
 from ..state import State
 from ..text import Font
 from ..core_funcs import load_img
+from ..ui_utils import PhaseFrames
 from ..gameplay_state import GameplayState, render_panel_9slice
 from .upgrade_shop_state import UpgradeShopState
 from .settings_state import SettingsState
@@ -17,6 +18,14 @@ from ..daily_challenge_state import DailyChallengeState
 
 
 class MainMenuState(State):
+    # Runs and the shop start from here, so their sprites are loaded while the menu is up
+    ANIMATIONS = GameplayState.ANIMATIONS + UpgradeShopState.ANIMATIONS
+    # The grid only steps every few frames; in between just the animated parts are presented
+    DIRTY_RECTS = True
+    TITLE_AREA = pygame.Rect(0, 16, 320, 32)
+    CHARACTER_AREA = pygame.Rect(40, 80, 80, 80)
+    SELECTOR_AREA = pygame.Rect(150, 60, 150, 100)
+
     def __init__(self, game):
         super().__init__(game)
         # Core Menu Logic
@@ -45,6 +54,9 @@ class MainMenuState(State):
         for y in range(0, self.game.DISPLAY_SIZE[1], 2):
             pygame.draw.line(self.scanline_surface, (0, 10, 15, 80), (0, y), (self.game.DISPLAY_SIZE[0], y), 1)
         self.hologram_base_img = self.game.item_icons.get('shield') # Re-use the shield icon
+        self.hologram_base_frames = self.bake_hologram_base() if self.hologram_base_img else None
+        self.hologram_char_imgs = {} # animation frame -> translucent copy
+        self.holo_line_frames = {} # character image size -> PhaseFrames of scanline overlays
         self.bg_elements = [self.create_bg_element() for _ in range(25)]
 
         # Animated Character Display
@@ -65,30 +77,33 @@ class MainMenuState(State):
         self.update_player_animation()
         self.update_selector_target()
         self.selector_y = self.selector_y_target
-        pygame.mixer.music.set_volume(0.3 * self.game.save_data['settings'].get('music_volume', 1.0))
+        self.game.play_biome_music(None)
+        self.game.music.set_volume(0.3 * self.game.save_data['settings'].get('music_volume', 1.0))
 
 
     def update_player_animation(self):
         selected_char_key = self.game.save_data['characters']['selected']
         self.player_anim = self.game.animation_manager.new(selected_char_key + '_idle')
+        self.game.animation_manager.prefetch([selected_char_key + '_run', selected_char_key + '_jump'])
 
     def handle_events(self, events):
         super().handle_events(events)
         for event in events:
             if event.type == pygame.KEYDOWN:
+                self.mark_dirty()
                 move_sound = 'shoot' # A more 'techy' sound
                 if event.key in [pygame.K_DOWN, pygame.K_s]:
-                    if move_sound in self.game.sounds: self.game.sounds[move_sound].play()
+                    self.game.sounds.play(move_sound)
                     if self.in_submenu: self.submenu_index = (self.submenu_index + 1) % len(self.play_options)
                     else: self.selection_index = (self.selection_index + 1) % len(self.options)
                     self.update_selector_target()
                 elif event.key in [pygame.K_UP, pygame.K_w]:
-                    if move_sound in self.game.sounds: self.game.sounds[move_sound].play()
+                    self.game.sounds.play(move_sound)
                     if self.in_submenu: self.submenu_index = (self.submenu_index - 1 + len(self.play_options)) % len(self.play_options)
                     else: self.selection_index = (self.selection_index - 1 + len(self.options)) % len(self.options)
                     self.update_selector_target()
                 elif event.key == pygame.K_ESCAPE:
-                    if self.in_submenu: self.in_submenu = False; self.game.sounds['combo_end'].play(); self.update_selector_target()
+                    if self.in_submenu: self.in_submenu = False; self.game.sounds.play('combo_end'); self.update_selector_target()
                 elif event.key == pygame.K_RETURN:
                     if self.in_submenu: self.select_submenu_option()
                     else: self.select_option()
@@ -103,7 +118,7 @@ class MainMenuState(State):
     
     def select_option(self):
         option = self.options[self.selection_index]
-        self.game.sounds['coin'].play()
+        self.game.sounds.play('coin')
         if option == "MISSIONS":
             self.in_submenu = True; self.submenu_index = 0; self.update_selector_target()
         elif option == "OPERATOR HUB": self.game.push_state(PlayerHubState(self.game))
@@ -114,7 +129,7 @@ class MainMenuState(State):
 
     def select_submenu_option(self):
         option = self.play_options[self.submenu_index]
-        self.game.sounds['upgrade'].play()
+        self.game.sounds.play('upgrade')
         
         if option == "STANDARD OP": self.game.push_state(BiomeSelectState(self.game, selected_mode="classic"))
         elif option == "ZEN MODE": self.game.push_state(BiomeSelectState(self.game, selected_mode="zen"))
@@ -134,7 +149,14 @@ class MainMenuState(State):
         # Update background elements
         for i, element in sorted(enumerate(self.bg_elements), reverse=True):
             element[2] -= 1
-            if element[2] <= 0: self.bg_elements.pop(i); self.bg_elements.append(self.create_bg_element())
+            if element[2] <= 0: self.bg_elements.pop(i); self.bg_elements.append(self.create_bg_element()); self.mark_dirty()
+
+        # Grid lines sit at fractional offsets, so watch both ways they can round
+        grid_x, grid_y = (self.master_clock*0.1) % 24, (self.master_clock*0.2) % 24
+        self.watch(self.game.display.get_rect(), int(grid_x), round(grid_x), int(grid_y), round(grid_y), tuple(sorted(self.game.unlock_notifications)))
+        self.watch(self.TITLE_AREA, self.glitch_offsets())
+        self.watch(self.SELECTOR_AREA, int(self.selector_y), round(self.selector_y))
+        self.mark_dirty(self.CHARACTER_AREA)
 
     def render(self, surface):
         surface.fill((2, 4, 16))
@@ -143,7 +165,7 @@ class MainMenuState(State):
         self.render_character_display(surface)
         self.render_menu_panel(surface)
         self.render_footer_info(surface)
-        surface.blit(self.scanline_surface, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        if self.game.effects.scanlines: surface.blit(self.scanline_surface, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
 
     def render_background(self, surface):
         # Grid
@@ -165,9 +187,11 @@ class MainMenuState(State):
         sub_header = "//:HUB INTERFACE v3.1"
         w_sub = self.font_main.width(sub_header); self.font_main.render(sub_header, surface, (surface.get_width()//2 - w_sub//2, y_offset + 25))
 
+    def glitch_offsets(self):
+        return (int(self.master_clock*1.5) % 5) - 2, (int(self.master_clock*1.1) % 5) - 2
+
     def render_glitchy_text(self, surface, text, pos, font, scale=1, center=False):
-        glitch_offset_x = (int(self.master_clock*1.5) % 5) - 2
-        glitch_offset_y = (int(self.master_clock*1.1) % 5) - 2
+        glitch_offset_x, glitch_offset_y = self.glitch_offsets()
         
         x, y = pos
         w = font.width(text, scale)
@@ -177,33 +201,51 @@ class MainMenuState(State):
         self.font_green.render(text, surface, (x, y + glitch_offset_y), scale=scale)
         font.render(text, surface, (x, y), scale=scale)
 
+    def bake_hologram_base(self):
+        # (scaled image, alpha) per tick of the pulse, sharing one image per whole-pixel size
+        scaled = {}
+        def frame(clock):
+            pulse = math.sin(clock / 20) * 3
+            size = (int(self.hologram_base_img.get_width()*2.5 + pulse), int(self.hologram_base_img.get_height()*2.5 + pulse))
+            if size not in scaled: scaled[size] = pygame.transform.scale(self.hologram_base_img, size)
+            return scaled[size], 100 + pulse*10
+        return PhaseFrames(40 * math.pi, frame)
+
+    def bake_holo_lines(self, size):
+        def frame(clock):
+            holo_lines = pygame.Surface(size, pygame.SRCALPHA)
+            for y in range(0, size[1], 3):
+                alpha = 50 + math.sin((y + clock)/5) * 40
+                pygame.draw.line(holo_lines, (100, 200, 220, alpha), (0, y), (size[0], y))
+            return holo_lines
+        return PhaseFrames(10 * math.pi, frame)
+
     def render_character_display(self, surface):
         center_x, base_y = 80, 130
         
         # Hologram Base
-        if self.hologram_base_img:
-            pulse = math.sin(self.master_clock / 20) * 3
-            size = (self.hologram_base_img.get_width()*2.5 + pulse, self.hologram_base_img.get_height()*2.5 + pulse)
-            pulsing = pygame.transform.scale(self.hologram_base_img, size)
+        if self.hologram_base_frames:
+            pulsing, alpha = self.hologram_base_frames.at(self.master_clock)
             pos = (center_x - pulsing.get_width()//2, base_y - pulsing.get_height()//2)
-            pulsing.set_alpha(100 + pulse*10)
+            pulsing.set_alpha(alpha)
             surface.blit(pulsing, pos, special_flags=pygame.BLEND_RGBA_ADD)
 
         # Draw character with hologram effect
         if self.player_anim and self.player_anim.img:
-            char_img = self.player_anim.img.copy()
-            char_img.set_alpha(180) # Semi-transparent
+            frame_img = self.player_anim.img
+            char_img = self.hologram_char_imgs.get(frame_img)
+            if char_img is None:
+                char_img = self.hologram_char_imgs[frame_img] = frame_img.copy()
+                char_img.set_alpha(180) # Semi-transparent
             char_y_bob = math.sin(self.master_clock/30) * 3
             char_pos_x = center_x - char_img.get_width()//2
             char_pos_y = base_y - 25 + char_y_bob
             surface.blit(char_img, (char_pos_x, char_pos_y))
             
             # Hologram scanlines over character
-            holo_lines = pygame.Surface(char_img.get_size(), pygame.SRCALPHA)
-            for y in range(0, holo_lines.get_height(), 3):
-                alpha = 50 + math.sin((y + self.master_clock)/5) * 40
-                pygame.draw.line(holo_lines, (100, 200, 220, alpha), (0, y), (holo_lines.get_width(), y))
-            surface.blit(holo_lines, (char_pos_x, char_pos_y), special_flags=pygame.BLEND_RGBA_ADD)
+            size = char_img.get_size()
+            if size not in self.holo_line_frames: self.holo_line_frames[size] = self.bake_holo_lines(size)
+            surface.blit(self.holo_line_frames[size].at(self.master_clock), (char_pos_x, char_pos_y), special_flags=pygame.BLEND_RGBA_ADD)
             
     def render_menu_panel(self, surface):
         x_base = 160
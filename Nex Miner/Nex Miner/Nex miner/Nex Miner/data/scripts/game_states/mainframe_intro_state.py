@@ -2,10 +2,26 @@
 import pygame
 import json
 import random
+import re
 from ..state import State
 from ..text import Font
 from .main_menu_state import MainMenuState
 
+def read_partial_json_string(text, key):
+    """
+    Reads a string field out of a JSON object that may still be streaming in.
+    Returns (value, complete), or (None, False) if the field hasn't started yet.
+    """
+    match = re.search(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)(")?' % key, text)
+    if not match: return None, False
+    raw = match.group(1)
+    try:
+        value = json.loads('"' + raw + '"', strict=False)
+    except json.JSONDecodeError:
+        # A half-received escape like \u00; show everything before it for now
+        value = raw[:raw.rfind('\\')]
+    return value, match.group(2) is not None
+
 class MainframeIntroState(State):
     """
     The state where the player interacts with the Mainframe AI to generate a character.
@@ -20,6 +36,7 @@ class MainframeIntroState(State):
         self.text_to_type = ""
         self.typing_speed = 2 # characters per frame
         self.typing_timer = 0
+        self.streaming_profile = False
         
         # --- UI & Fonts ---
         font_path = self.game.get_path('data', 'fonts', 'small_font.png')
@@ -61,30 +78,49 @@ class MainframeIntroState(State):
         self.typed_text = ""
         self.typing_timer = 0
 
+    def extend_typing_text(self, text):
+        # Keep typing where we left off if the new text only adds to the old one (streamed responses)
+        if text.startswith(self.text_to_type): self.text_to_type = text
+        else: self.set_typing_text(text)
+
+    def build_profile_text(self, char_data, finished=True):
+        text = f"PROFILE FABRICATED: [{char_data.get('name', '???').upper()}].\n{char_data.get('desc', '...')}"
+        return text + "\n\nPRESS ANY KEY TO INITIALIZE." if finished else text
+
+    def stream_profile_text(self):
+        """Feeds the character's name and description into the typewriter as they stream in."""
+        if not self.streaming_profile and not self.is_typing_finished(): return
+        partial = self.game.ai_agent.partial_response
+        name, name_complete = read_partial_json_string(partial, 'name')
+        if not name_complete: return
+        desc, _ = read_partial_json_string(partial, 'desc')
+        self.streaming_profile = True
+        self.extend_typing_text(self.build_profile_text({'name': name, 'desc': desc or ''}, finished=False))
+
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if self.stage == "GREETING" and self.is_typing_finished():
                     self.stage = "QUESTION"
                     self.set_typing_text("State your core directive.")
-                    if 'upgrade' in self.game.sounds: self.game.sounds['upgrade'].play()
+                    self.game.sounds.play('upgrade')
 
                 elif self.stage == "QUESTION" and self.is_typing_finished():
                     if event.key == pygame.K_RETURN and self.input_text:
                         self.stage = "PROCESSING"
                         self.set_typing_text("QUERY RECEIVED. FABRICATING OPERATIVE PROFILE...")
-                        if 'upgrade' in self.game.sounds: self.game.sounds['upgrade'].play()
+                        self.game.sounds.play('upgrade')
                         self.generate_character()
                     elif event.key == pygame.K_BACKSPACE:
                         self.input_text = self.input_text[:-1]
-                        if 'shoot' in self.game.sounds: self.game.sounds['shoot'].play()
+                        self.game.sounds.play('shoot')
                     elif event.unicode.isprintable() and len(self.input_text) < 50:
                         self.input_text += event.unicode
-                        if 'shoot' in self.game.sounds: self.game.sounds['shoot'].play()
+                        self.game.sounds.play('shoot')
 
                 elif self.stage == "CONFIRMATION" and self.is_typing_finished():
                     self.game.replace_state(MainMenuState(self.game))
-                    if 'upgrade' in self.game.sounds: self.game.sounds['upgrade'].play()
+                    self.game.sounds.play('upgrade')
 
     def is_typing_finished(self):
         return len(self.typed_text) == len(self.text_to_type)
@@ -119,7 +155,7 @@ Here are some examples of existing characters for style and structure reference:
 {existing_chars_json}
 Now, based on the player's response ("{self.input_text}"), generate the character JSON.
 """
-        self.game.ai_agent.get_threaded_response(prompt, is_directive=True)
+        self.game.ai_agent.get_threaded_response(prompt, request_type='character', stream=True)
 
     def update(self):
         self.master_clock += 1
@@ -127,7 +163,7 @@ Now, based on the player's response ("{self.input_text}"), generate the characte
             self.typing_timer += 1
             if self.typing_timer % self.typing_speed == 0:
                 self.typed_text = self.text_to_type[:len(self.typed_text) + 1]
-                if 'coin' in self.game.sounds and self.master_clock % 2 == 0: self.game.sounds['coin'].play()
+                if self.master_clock % 2 == 0: self.game.sounds.play('coin')
 
         for i, element in sorted(enumerate(self.bg_elements), reverse=True):
             element[2] -= 1
@@ -135,7 +171,9 @@ Now, based on the player's response ("{self.input_text}"), generate the characte
                 self.bg_elements.pop(i)
                 self.create_bg_element()
 
-        if self.stage == "PROCESSING" and not self.game.ai_agent.is_thinking:
+        if self.stage == "PROCESSING" and self.game.ai_agent.is_thinking:
+            self.stream_profile_text()
+        elif self.stage == "PROCESSING":
             if isinstance(self.game.ai_agent.response, dict):
                 new_char_data = self.game.ai_agent.response
                 new_char_data['id'] = 'generated_operative'
@@ -147,7 +185,7 @@ Now, based on the player's response ("{self.input_text}"), generate the characte
                 self.game.save_data['characters']['selected'] = 'generated_operative'
                 self.game.write_save(self.game.save_data)
                 self.game.load_dynamic_character()
-                self.set_typing_text(f"PROFILE FABRICATED: [{new_char_data.get('name', '???').upper()}].\n{new_char_data.get('desc', '...')}\n\nPRESS ANY KEY TO INITIALIZE.")
+                self.extend_typing_text(self.build_profile_text(new_char_data))
             else:
                 self.set_typing_text("MAINFRAME CONNECTION INTERRUPTED.\nASSIGNING STANDBY OPERATIVE PROFILE: [Drifter].\n\nPRESS ANY KEY TO INITIALIZE.")
                 fallback_char = {"id":"generated_operative","name":"Drifter","desc":"An operative forged in silence. Resourceful and solitary.","unlock_cost":0,"mods":{"innate_perks":["acrobat"],"starting_item":"cube"}}
@@ -157,6 +195,8 @@ Now, based on the player's response ("{self.input_text}"), generate the characte
                 self.game.write_save(self.game.save_data)
                 self.game.load_dynamic_character()
             
+            # Consume the response so the hub doesn't mistake it for a directive
+            self.game.ai_agent.response = None
             self.stage = "CONFIRMATION"
 
     def render_glitchy_text(self, surface, text, pos, font, scale=1):
@@ -182,7 +222,7 @@ Now, based on the player's response ("{self.input_text}"), generate the characte
         self.render_footer_prompt(surface)
         
         # Scanline overlay
-        surface.blit(self.scanline_surface, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        if self.game.effects.scanlines: surface.blit(self.scanline_surface, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
 
     def render_background_effects(self, surface):
         # Grid
@@ -3,14 +3,19 @@ import pygame
 from ..state import State
 from ..text import Font
 from ..ui_utils import render_panel_9slice
+from ..asset_bundle import load_image
 
 class PauseState(State):
+    BACKGROUND_TINT = (10, 5, 20, 200)
+
     def __init__(self, game, gameplay_state):
         super().__init__(game)
         self.gameplay_state = gameplay_state
+        # The frozen gameplay frame, darkened once rather than re-rendered every frame
+        self.background_surf = game.capture_frame(gameplay_state, tint=self.BACKGROUND_TINT)
         self.options = ["RESUME", "RETURN TO HUB", "QUIT GAME"]
         self.selection_index = 0
-        self.panel_img = pygame.image.load(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
+        self.panel_img = load_image(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
         self.highlight_font = Font(self.game.get_path('data', 'fonts', 'small_font.png'), (255, 230, 90))
 
     def handle_events(self, events):
@@ -39,13 +44,8 @@ class PauseState(State):
         pass
 
     def render(self, surface):
-        # Render the frozen gameplay in the background
-        self.gameplay_state.render(surface)
-
-        # Darken the screen
-        overlay = pygame.Surface(self.game.DISPLAY_SIZE, pygame.SRCALPHA)
-        overlay.fill((10, 5, 20, 200))
-        surface.blit(overlay, (0, 0))
+        # The frozen, darkened gameplay in the background
+        surface.blit(self.background_surf, (0, 0))
 
         # Render the menu panel
         panel_w, panel_h = 120, 60
@@ -3,6 +3,8 @@ import pygame
 from ..state import State
 
 class PerkSelectionState(State):
+    BACKGROUND_TINT = (10, 5, 20, 200) # Blended into background_surf by Game.capture_frame
+
     def __init__(self, game, perks_to_offer, background_surf):
         super().__init__(game)
         self.perks_to_offer = perks_to_offer
@@ -30,17 +32,14 @@ class PerkSelectionState(State):
                     
                     if gameplay_state:
                         chosen_perk = self.perks_to_offer[self.selection_index]
-                        gameplay_state.active_perks.add(chosen_perk)
+                        gameplay_state.add_perk(chosen_perk)
                         gameplay_state.perks_gained_this_run += 1
-                        if 'upgrade' in self.game.sounds: self.game.sounds['upgrade'].play()
+                        self.game.sounds.play('upgrade')
                     
                     self.game.pop_state() # Exit this perk selection screen
                     
     def render(self, surface):
-        surface.blit(self.background_surf, (0, 0))
-        overlay = pygame.Surface(self.game.DISPLAY_SIZE, pygame.SRCALPHA)
-        overlay.fill((10, 5, 20, 200))
-        surface.blit(overlay, (0, 0))
+        surface.blit(self.background_surf, (0, 0)) # Already dimmed
 
         title = "SELECT UPGRADE PROTOCOL"
         title_w = self.game.white_font.width(title, 2)
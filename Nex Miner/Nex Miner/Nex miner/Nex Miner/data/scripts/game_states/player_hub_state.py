@@ -5,13 +5,18 @@ import json
 from ..state import State
 from ..text import Font
 from ..gameplay_state import render_panel_9slice
+from ..directive_pool import build_directive_prompt
+from ..asset_bundle import load_image
 
 class PlayerHubState(State):
+    # Redrawn on input, plus the few things that tick over on their own (see watch_changes)
+    DIRTY_RECTS = True
+
     def __init__(self, game):
         super().__init__(game)
         self.tabs = ["STATS", "DATABASE", "TECH", "MAINFRAME"]
         self.current_tab = 0
-        self.panel_img = pygame.image.load(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
+        self.panel_img = load_image(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
         self.font_title = Font(self.game.get_path('data', 'fonts', 'small_font.png'), (255, 230, 90))
         self.font_locked = Font(self.game.get_path('data', 'fonts', 'small_font.png'), (80, 80, 80))
         self.font_highlight = Font(self.game.get_path('data', 'fonts', 'small_font.png'), (255, 230, 90))
@@ -43,6 +48,7 @@ class PlayerHubState(State):
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
+                self.mark_dirty()
                 if event.key == pygame.K_ESCAPE: self.game.pop_state()
                 
                 is_on_mainframe = self.tabs[self.current_tab] == "MAINFRAME"
@@ -74,7 +80,7 @@ class PlayerHubState(State):
                             selected_key = unlocked_artifacts[self.artifact_selection_index]
                             if self.game.save_data['artifacts']['equipped'] == selected_key: self.game.save_data['artifacts']['equipped'] = None
                             else: self.game.save_data['artifacts']['equipped'] = selected_key
-                            self.game.write_save(self.game.save_data); self.game.sounds['artifact_equip'].play()
+                            self.game.write_save(self.game.save_data); self.game.sounds.play('artifact_equip')
 
                 # Database Navigation
                 if is_on_database:
@@ -84,31 +90,65 @@ class PlayerHubState(State):
     def update(self):
         self.master_clock += 1
         self.check_artifact_unlocks()
+        self.game.directive_pool.maybe_refill()
+        self.game.directive_pool.save_if_dirty()
         if self.game.ai_agent and not self.game.ai_agent.is_thinking:
             self.ai_input_active = True
             if isinstance(self.game.ai_agent.response, dict):
                 self.game.save_data['active_directive'] = self.game.ai_agent.response
                 self.game.write_save(self.game.save_data)
                 self.game.ai_agent.response = "A new directive has been logged for your next mission..."
+        self.watch_changes()
+
+    def panel_rect(self):
+        return pygame.Rect(10, 8, self.game.DISPLAY_SIZE[0] - 20, self.game.DISPLAY_SIZE[1] - 16)
+
+    def mainframe_areas(self, p_rect, y):
+        """ The response text area (including the directive prompt under it) and the input box. """
+        input_box = pygame.Rect(p_rect.left + 10, p_rect.bottom - 25, p_rect.width - 20, 12)
+        return pygame.Rect(p_rect.left + 10, y, p_rect.width - 20, input_box.top - y), input_box
+
+    def watch_changes(self):
+        p_rect = self.panel_rect()
+        content_y = p_rect.top + 25
+        self.watch(self.game.display.get_rect(), 'artifacts' in self.game.unlock_notifications)
+        tab_name = self.tabs[self.current_tab]
+        if tab_name == "STATS":
+            self.watch(pygame.Rect(p_rect.left + 15, content_y, p_rect.width - 30, 14), int(self.game.save_data['stats']['play_time']))
+        elif tab_name == "MAINFRAME":
+            response_area, input_box = self.mainframe_areas(p_rect, content_y)
+            agent, directive = self.game.ai_agent, self.game.save_data.get('active_directive')
+            if agent: response = (agent.is_thinking, agent.partial_response, str(agent.response), int(self.master_clock/20) % 4 if agent.is_thinking else 0)
+            else: response = None
+            self.watch(response_area, response, directive, not directive and self.master_clock % 80 < 40)
+            self.watch(input_box, self.ai_input_text, self.ai_input_active and self.master_clock % 60 < 30)
 
     def ask_mainframe(self):
         if self.game.ai_agent and self.ai_input_text and not self.game.ai_agent.is_thinking:
             self.ai_input_active = False
             context = f"You are the Mainframe AI, a powerful and slightly cryptic guide in the sci-fi roguelike game 'Nex Miner'. Keep answers concise (2-3 sentences), thematic, and helpful. Player stats: {self.game.save_data['stats']}. Player question: "
             full_prompt = context + self.ai_input_text
-            self.game.ai_agent.get_threaded_response(full_prompt)
+            self.game.ai_agent.get_threaded_response(full_prompt, stream=True)
             self.ai_input_text = ""
 
     def seek_directive(self):
-        if not self.game.ai_agent or self.game.ai_agent.is_thinking or self.game.save_data.get('active_directive'): return
+        if not self.game.ai_agent or self.game.save_data.get('active_directive'): return
+        # Hand out a prefetched directive instantly, even mid-chat; only fall back to a live request if the pool is dry
+        directive = self.game.directive_pool.take()
+        if directive:
+            self.game.save_data['active_directive'] = directive
+            self.game.write_save(self.game.save_data)
+            if not self.game.ai_agent.is_thinking: # Leave a chat answer that's still streaming alone
+                self.game.ai_agent.response = "A new directive has been logged for your next mission..."
+            self.game.sounds.play('directive_complete')
+            return
+        if self.game.ai_agent.is_thinking: return
         self.ai_input_active = False
-        directive_insight = self.game.save_data['upgrades'].get('prophecy_clarity', 0) > 0
-        prompt = f"You are the Mainframe AI in the roguelike game 'Nex Miner'. Generate a mission directive for the player's next run. The directive must be a valid JSON object with keys 'objective_type', 'value', 'reward_type', 'reward_value', and 'flavor_text'. Objective types: 'collect_coins', 'destroy_tiles_dash', 'reach_combo'. Reward types: 'coins' (value 50-200) or 'item' (value 'shield', 'bomb', 'warp', etc.). {'Make the reward slightly better due to Directive Insight.' if directive_insight else ''} Respond ONLY with the JSON. Example: {{\"objective_type\": \"reach_combo\", \"value\": 15, \"reward_type\": \"item\", \"reward_value\": \"shield\", \"flavor_text\": \"System Overclock to 1500% efficiency is requested...\"}}"
-        self.game.ai_agent.get_threaded_response(prompt, is_directive=True)
+        self.game.ai_agent.get_threaded_response(build_directive_prompt(self.game.save_data), request_type='directive')
 
     def render(self, surface):
         surface.fill((22, 19, 40))
-        p_rect = pygame.Rect(10, 8, self.game.DISPLAY_SIZE[0] - 20, self.game.DISPLAY_SIZE[1] - 16)
+        p_rect = self.panel_rect()
         render_panel_9slice(surface, p_rect, self.panel_img, 8)
         
         tab_x = p_rect.left + 5
@@ -155,6 +195,8 @@ class PlayerHubState(State):
         
         if not self.game.ai_agent:
             self.game.white_font.render("Mainframe is offline. (Check API Key)", surface, response_box.topleft, response_box.width)
+        elif self.game.ai_agent.is_thinking and self.game.ai_agent.partial_response:
+            self.game.white_font.render(self.game.ai_agent.partial_response, surface, response_box.topleft, response_box.width)
         elif self.game.ai_agent.is_thinking:
             msg = "Mainframe processing" + "." * (int(self.master_clock/20) % 4)
             self.game.white_font.render(msg, surface, response_box.topleft, response_box.width)
@@ -173,7 +215,7 @@ class PlayerHubState(State):
         if not self.game.save_data.get('active_directive'): (self.font_highlight if self.master_clock % 80 < 40 else self.game.white_font).render(prophecy_prompt, surface, prophecy_pos)
         else: self.font_locked.render(prophecy_prompt, surface, prophecy_pos)
             
-        input_box = pygame.Rect(p_rect.left + 10, p_rect.bottom - 25, p_rect.width - 20, 12)
+        input_box = self.mainframe_areas(p_rect, y)[1]
         pygame.draw.rect(surface, (0, 0, 1, 150), input_box); pygame.draw.rect(surface, (255, 255, 255, 50), input_box, 1)
         render_text = self.ai_input_text + ('|' if self.ai_input_active and self.master_clock % 60 < 30 else '')
         self.game.white_font.render(render_text, surface, (input_box.x + 4, input_box.y + 3))
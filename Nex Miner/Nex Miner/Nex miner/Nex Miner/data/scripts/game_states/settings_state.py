@@ -2,15 +2,18 @@
 import pygame
 from ..state import State
 from ..text import Font 
+from ..quality import QUALITY_MODES
 
 class SettingsState(State):
     """
     A state for configuring game settings like volume and screen shake.
     """
+    DIRTY_RECTS = True # Only redrawn on input
+
     def __init__(self, game):
         super().__init__(game)
         # --- MODIFIED: Added resizable_window to the options list ---
-        self.options_keys = ["sfx_volume", "music_volume", "screen_shake", "resizable_window"]
+        self.options_keys = ["sfx_volume", "music_volume", "screen_shake", "resizable_window", "quality"]
         self.selection_index = 0
         self.bar_width = 80
         self.bar_height = 8
@@ -37,6 +40,7 @@ class SettingsState(State):
         super().handle_events(events)
         for event in events:
             if event.type == pygame.KEYDOWN:
+                self.mark_dirty()
                 if event.key in [pygame.K_DOWN, pygame.K_s]:
                     self.selection_index = (self.selection_index + 1) % len(self.options_keys)
                 elif event.key in [pygame.K_UP, pygame.K_w]:
@@ -58,7 +62,7 @@ class SettingsState(State):
             elif key in [pygame.K_LEFT, pygame.K_a]:
                 settings[current_option] = max(0.0, round(settings[current_option] - increment, 2))
             self.game.apply_settings()
-            if current_option == "sfx_volume": self.game.sounds['coin'].play()
+            if current_option == "sfx_volume": self.game.sounds.play('coin')
             
         elif current_option == "screen_shake":
             if key in [pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d, pygame.K_RETURN]:
@@ -71,6 +75,13 @@ class SettingsState(State):
                 # Tell the game to update the display mode immediately
                 self.game.update_window_mode()
 
+        elif current_option == "quality":
+            step = {pygame.K_LEFT: -1, pygame.K_a: -1, pygame.K_RIGHT: 1, pygame.K_d: 1, pygame.K_RETURN: 1}.get(key)
+            if step:
+                index = QUALITY_MODES.index(settings[current_option]) if settings[current_option] in QUALITY_MODES else 0
+                settings[current_option] = QUALITY_MODES[(index + step) % len(QUALITY_MODES)]
+                self.game.effects.set_mode(settings[current_option])
+
     def render(self, surface):
         surface.fill((22, 19, 40)) 
         p_rect = pygame.Rect(30, 15, self.game.DISPLAY_SIZE[0] - 60, self.game.DISPLAY_SIZE[1] - 30)
@@ -97,7 +108,7 @@ class SettingsState(State):
                 self.game.white_font.render(name_text, surface, name_pos)
 
             self.render_option_editor(surface, key, p_rect, y_pos)
-            y_pos += 25
+            y_pos += 20
 
         prompt = "Up/Down: Select - Left/Right: Change - Esc: Save & Back"
         w = self.game.white_font.width(prompt)
@@ -116,6 +127,11 @@ class SettingsState(State):
             percent_text = f"{int(value * 100)}%"
             self.game.white_font.render(percent_text, surface, (editor_x + self.bar_width + 8, y_pos + 1))
             
+        elif key == "quality":
+            text = f"[{value.upper()}]"
+            if value == "auto": text += f" {self.game.effects.level.upper()}" # The level it has settled on
+            self.highlight_font.render(text, surface, (editor_x, y_pos))
+
         elif isinstance(value, bool): 
             if value:
                 self.font_on.render("[ON]", surface, (editor_x, y_pos))
@@ -3,8 +3,12 @@ import pygame
 from ..state import State
 from ..text import Font
 from ..ui_utils import render_panel_9slice
+from ..asset_bundle import load_image
 
 class UpgradeShopState(State):
+    ANIMATIONS = ('player_run', 'coin_idle', 'warp_idle', 'turret_idle')
+    DIRTY_RECTS = True # Only redrawn on input
+
     def __init__(self, game):
         super().__init__(game)
         self.selection_index = 0
@@ -31,7 +35,7 @@ class UpgradeShopState(State):
             "curse_reroll": self.game.animation_manager.new('warp_idle').img,
             "prophecy_clarity": self.game.animation_manager.new('turret_idle').img, # Placeholder
         }
-        self.panel_img = pygame.image.load(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
+        self.panel_img = load_image(self.game.get_path('data', 'images', 'panel_9slice.png')).convert_alpha()
 
     def enter_state(self):
         self.selection_index = 0
@@ -40,12 +44,13 @@ class UpgradeShopState(State):
         super().handle_events(events)
         for event in events:
             if event.type == pygame.KEYDOWN:
+                self.mark_dirty()
                 if event.key in [pygame.K_DOWN, pygame.K_s]:
                     self.selection_index = (self.selection_index + 1) % len(self.upgrade_keys)
-                    if 'block_land' in self.game.sounds: self.game.sounds['block_land'].play()
+                    self.game.sounds.play('block_land')
                 elif event.key in [pygame.K_UP, pygame.K_w]:
                     self.selection_index = (self.selection_index - 1 + len(self.upgrade_keys)) % len(self.upgrade_keys)
-                    if 'block_land' in self.game.sounds: self.game.sounds['block_land'].play()
+                    self.game.sounds.play('block_land')
                 elif event.key == pygame.K_RETURN:
                     self.purchase_selected_upgrade()
                 elif event.key == pygame.K_ESCAPE:
@@ -64,7 +69,7 @@ class UpgradeShopState(State):
             self.game.save_data['banked_coins'] -= cost
             self.game.save_data['upgrades'][selected_key] += 1
             self.game.write_save(self.game.save_data)
-            if 'upgrade' in self.game.sounds: self.game.sounds['upgrade'].play()
+            self.game.sounds.play('upgrade')
 
     def render(self, surface):
         surface.fill((22, 19, 40))
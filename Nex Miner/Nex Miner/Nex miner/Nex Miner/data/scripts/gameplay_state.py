@@ -1,6 +1,7 @@
 
 
 import pygame, sys, random, math, json
+from bisect import bisect_left
 from pygame.locals import *
 
 # Core game state and entity imports
@@ -11,13 +12,21 @@ from .entities.item import Item
 from .entities.projectile import Projectile
 from .entities.turret import Turret 
 from .entities.turret_projectile import TurretProjectile
+from .entity_store import EntityStore
+from .entity_pool import EntityPool
+from .spatial_index import SpatialIndex
+from .texture_atlas import TextureAtlas
+from .coin_physics import CoinSimulator, HAS_NUMPY, COIN_BATCH_MIN
 
 # Imports for state transitions and utilities
 from .game_states.pause_state import PauseState
 from .game_states.perk_selection_state import PerkSelectionState
 from .game_states.curse_selection_state import CurseSelectionState
 from .core_funcs import load_img
-from .ui_utils import glow_img, render_panel_9slice
+from .ui_utils import glow_img, render_panel_9slice, PhaseFrames
+from .hud import HudWidget
+from .lighting import LightBuffer
+from .config_schema import compile_upgrade_stats, compile_spawn_sampler, flags_mask
 
 # Late import to prevent circular dependency
 GameOverState = None
@@ -28,6 +37,9 @@ GameOverState = None
 # =========================================================================
 
 class GameplayState(State):
+    ANIMATIONS = ('player_idle', 'player_run', 'player_jump', 'coin_idle', 'projectile_idle', 'turret_idle',
+                  'cube_idle', 'warp_idle', 'jump_idle', 'bomb_idle', 'freeze_idle')
+
     def __init__(self, game, mode="classic", challenge_config=None, start_biome_index=0, seeded_random=None):
         super().__init__(game)
         
@@ -46,7 +58,14 @@ class GameplayState(State):
 
         self.plasma_y = self.game.DISPLAY_SIZE[1] + 50
         self.special_entity_timer = 0
-        self.data_nodes = []
+        self.data_nodes = EntityStore()
+        # Recycled for the whole run; entities go back in when their store flushes them
+        self.coin_pool = EntityPool(Item)
+        self.projectile_pool = EntityPool(Projectile)
+        self.turret_projectile_pool = EntityPool(TurretProjectile)
+        self.spatial_index = SpatialIndex()
+        self.coin_simulator = CoinSimulator(self.game) if HAS_NUMPY else None
+        self.ghost_frames = {} # Player.ghost_image() cache, kept across runs
         self.load_state_assets()
         self.reset()
 
@@ -74,12 +93,21 @@ class GameplayState(State):
         self.greed_tile_img = load_img(self.game.get_path('data', 'images', 'greed_tile.png'))
         self.shield_aura_img = load_img(self.game.get_path('data', 'images', 'shield_aura.png'))
         self.shield_aura_img.set_alpha(150)
+        self.shield_aura_frames = self.bake_shield_aura()
+        self.bg_frame = pygame.Surface(self.game.DISPLAY_SIZE).convert() # render_background()'s composited layers
+        self.bg_frame_key = None
+        # Freeze tint: one overlay, refilled only when its pulsing alpha changes
+        self.freeze_overlay = pygame.Surface(self.game.DISPLAY_SIZE, pygame.SRCALPHA)
+        self.freeze_overlay_alpha = None
+        self.freeze_alphas = PhaseFrames(10 * math.pi, lambda clock: int(60 + math.sin(clock / 5) * 10))
+        self.lights = LightBuffer(self.game.DISPLAY_SIZE, self.game.effects.light_scale) # Spark glows, added over the frame in render_sparks()
         self.panel_img = load_img(self.game.get_path('data', 'images', 'panel_9slice.png'))
         
         # --- FIX: Define state-specific fonts here ---
         font_path = self.game.get_path('data', 'fonts', 'small_font.png')
         self.font_highlight = Font(font_path, (255, 230, 90))
         self.font_green = Font(font_path, (60, 255, 60))
+        self.create_hud_widgets()
         
         try:
             self.conveyor_l_img = load_img(self.game.get_path('data', 'images', 'conveyor_l.png'))
@@ -101,6 +129,20 @@ class GameplayState(State):
             self.data_node_img = pygame.Surface((16, 24)); self.data_node_img.fill((255, 0, 255))
             self.conduit_tile_img = pygame.Surface((16, 16)); self.conduit_tile_img.fill((0, 255, 255))
 
+        # Tile sprites are packed into one atlas so each tile layer goes out in a single blits() call.
+        # Regions are (page, area), or (img, None) for anything that didn't fit.
+        self.tile_atlas = TextureAtlas()
+        pack = lambda img: self.tile_atlas.add(img) or (img, None)
+        self.tile_region, self.tile_top_region = pack(self.tile_img), pack(self.tile_top_img)
+        self.chest_region, self.opened_chest_region, self.ghost_chest_region = pack(self.chest_img), pack(self.opened_chest_img), pack(self.ghost_chest_img)
+        shared = {'greed': pack(self.greed_tile_img), 'magnetic': pack(self.magnetic_tile_img), 'unstable': pack(self.unstable_tile_img),
+                  'sticky': pack(self.sticky_tile_img), 'fragile': pack(self.fragile_tile_img), 'bounce': pack(self.bounce_tile_img),
+                  'spike': pack(self.spike_tile_img), 'prism': pack(self.prism_tile_img), 'geyser': pack(self.geyser_tile_img),
+                  'conduit': pack(self.conduit_tile_img), 'conveyor_l': pack(self.conveyor_l_img), 'conveyor_r': pack(self.conveyor_r_img)}
+        # Anything not listed is drawn as a plain tile
+        self.placed_tile_regions = dict(shared, placed_tile=pack(self.placed_tile_img))
+        self.falling_tile_regions = dict(shared, motherlode=pack(self.motherlode_tile_img))
+
     def enter_state(self):
         super().enter_state()
         if self.mode == "classic" and self.perks_gained_this_run > 0 and self.perks_gained_this_run % 2 == 0:
@@ -110,8 +152,7 @@ class GameplayState(State):
                 available_curses = list(set(self.game.curses.keys()) - self.active_curses)
                 if available_curses:
                     curses_to_offer = self.random.sample(available_curses, k=min(3, len(available_curses)))
-                    background_surf = self.game.display.copy()
-                    self.render(background_surf)
+                    background_surf = self.game.capture_frame(self, tint=CurseSelectionState.BACKGROUND_TINT)
                     self.game.push_state(CurseSelectionState(self.game, self, curses_to_offer, background_surf))
 
     def reset(self):
@@ -122,28 +163,33 @@ class GameplayState(State):
         for key in self.game.upgrades:
             if key not in self.game.save_data['upgrades']:
                 self.game.save_data['upgrades'][key] = 0
+        # Upgrades can't change mid-run, so their derived numbers are worked out once here
+        self.stats = compile_upgrade_stats(self.game.save_data['upgrades'])
 
         self.player = Player(self.game.animation_manager, (self.game.DISPLAY_SIZE[0] // 2 - 5, 20), (8, 16), selected_char_key, self)
-        self.player.jumps_max = 2 + self.game.save_data['upgrades']['jumps']
-        self.player.speed = 1.4 + self.game.save_data['upgrades']['speed'] * 0.08
+        self.player.jumps_max = self.stats.jumps_max
+        self.player.speed = self.stats.speed
         self.player.jumps = self.player.jumps_max
         
         self.active_perks = set(character_data['mods'].get('innate_perks', []))
         self.player.FOCUS_DASH_COST = character_data['mods'].get('FOCUS_DASH_COST', 50)
         
         self.dead = False
-        self.tiles, self.tile_drops, self.sparks, self.projectiles, self.items = {}, [], [], [], []
-        self.turrets = []
-        self.turret_projectiles = []
-
-        self.ghosts = []
+        self.tiles, self.tile_drops, self.sparks = {}, EntityStore(), []
+        self.tile_version = 0
+        self.projectiles = EntityStore(on_free=self.projectile_pool.release)
+        self.items = EntityStore(on_free=self.release_item)
+        self.turrets = EntityStore()
+        self.turret_projectiles = EntityStore(on_free=self.turret_projectile_pool.release)
+
+        self.ghosts = EntityStore()
         self.freeze_timer, self.game_timer, self.master_clock = 0, 0, 0
         self.height, self.target_height = 0, 0
         self.coins = 0
         self.invincibility_timer = 0
         
         self.current_item = None
-        if self.game.save_data['upgrades'].get('starting_item', 0) > 0:
+        if self.stats.starting_item:
             possible_items = ['cube', 'jump', 'bomb', 'shield', 'freeze', 'hourglass']
             self.current_item = self.random.choice(possible_items)
             if self.current_item not in self.game.save_data['compendium']['items']:
@@ -174,7 +220,7 @@ class GameplayState(State):
         self.game.save_data['active_directive'] = None
         
         self.item_used = False
-        self.curse_rerolls_left = self.game.save_data['upgrades'].get('curse_reroll', 0)
+        self.curse_rerolls_left = self.stats.curse_rerolls
         
         self.time_meter = self.game.time_meter_max
         self.slowing_time = False
@@ -193,11 +239,11 @@ class GameplayState(State):
         elif self.mode == "challenge":
             self.player.pos[1] = 13 * 16
             self.tiles = {tuple(pos): {'type': tile_type, 'data': {}} for pos, tile_type in self.challenge_config['start_layout']}
-            self.tile_drops = [[(idx % 18 + 1) * self.game.TILE_SIZE, -self.height - self.game.TILE_SIZE, t_type] for idx, t_type in enumerate(self.challenge_config['falling_tiles'])]
+            self.tile_drops = EntityStore([(idx % 18 + 1) * self.game.TILE_SIZE, -self.height - self.game.TILE_SIZE, t_type] for idx, t_type in enumerate(self.challenge_config['falling_tiles']))
             self.spawn_timer_base, self.disabled_tiles, self.active_curses, self.combo_multiplier = 999999, set(), set(), 1.0
         elif self.mode == "zen":
             self.spawn_timer_base, self.disabled_tiles, self.active_curses, self.combo_multiplier = 80, {'spike', 'unstable'}, set(), 1.0
-            pygame.mixer.music.set_volume(0.3 * self.game.save_data['settings'].get('music_volume', 1.0))
+            self.game.music.set_volume(0.3 * self.game.save_data['settings'].get('music_volume', 1.0))
         elif self.mode == "hardcore":
             self.spawn_timer_base, self.disabled_tiles, self.combo_multiplier = 25, set(), 1.5
             curses_pool = list(self.game.curses.keys())
@@ -210,14 +256,55 @@ class GameplayState(State):
             self.tiles[(1, self.game.WINDOW_TILE_SIZE[1] - 2)] = {'type': 'tile', 'data': {}}
             self.tiles[(self.game.WINDOW_TILE_SIZE[0] - 2, self.game.WINDOW_TILE_SIZE[1] - 2)] = {'type': 'tile', 'data': {}}
 
-        self.plasma_y, self.data_nodes, self.special_entity_timer = self.game.DISPLAY_SIZE[1] + 50, [], 0
+        self.plasma_y, self.data_nodes, self.special_entity_timer = self.game.DISPLAY_SIZE[1] + 50, EntityStore(), 0
             
         self.current_biome_index = self.start_biome_index
+        self.biome = self.game.compiled_biomes[self.current_biome_index]
         self.last_place = 0
         self.game.load_biome_bgs(self.game.biomes[self.current_biome_index])
+        self.game.play_biome_music(self.current_biome_index)
         
+        self.refresh_modifiers()
         self.recalculate_stack_heights()
 
+    def add_perk(self, perk):
+        self.active_perks.add(perk)
+        self.refresh_modifiers()
+
+    def add_curse(self, curse):
+        self.active_curses.add(curse)
+        self.refresh_modifiers()
+
+    def refresh_modifiers(self):
+        # Perks and curses are packed into bitmasks and everything they switch on is
+        # cached here, so hot paths don't need set lookups. Call after any change.
+        self.perk_mask = flags_mask(self.game.perk_bits, self.active_perks)
+        self.curse_mask = flags_mask(self.game.curse_bits, self.active_curses)
+        perk = lambda name: bool(self.perk_mask & self.game.perk_bits.get(name, 0))
+        curse = lambda name: bool(self.curse_mask & self.game.curse_bits.get(name, 0))
+        self.combo_gain_mult = 2 if perk('glass_cannon') else 1
+        self.combo_drain_mult = self.combo_gain_mult * (1.5 if curse('short_fuse') else 1)
+        self.coin_mult = 2 if perk('greedy') else 1
+        self.player_gravity = 0.24 if perk('feather_fall') else 0.3
+        self.speed_mult = 0.85 if curse('heavy_feet') else 1
+        self.wall_jump = perk('acrobat')
+        self.projectile_health = 2 if perk('technician') else 1
+        self.recycle_items = perk('module_recycler')
+        self.shield_break_invincibility = perk('safeguard')
+        self.dash_coins = not curse('brittle_blocks')
+        self.fumble_items = curse('butter_fingers')
+        self.shock_conduits = curse('static_shock')
+        self.high_stakes = curse('high_stakes')
+        self.spawn_sampler = None # Curses feed into the spawn table, rebuilt on the next spawn
+
+    def get_spawn_sampler(self):
+        if self.spawn_sampler is None:
+            key = (self.current_biome_index, frozenset(self.disabled_tiles), self.curse_mask)
+            if key not in self.game.spawn_samplers:
+                self.game.spawn_samplers[key] = compile_spawn_sampler(self.biome, self.disabled_tiles, self.high_stakes)
+            self.spawn_sampler = self.game.spawn_samplers[key]
+        return self.spawn_sampler
+
     def handle_events(self, events):
         super().handle_events(events)
         for event in events:
@@ -232,7 +319,7 @@ class GameplayState(State):
                     if event.key in [K_UP, K_w, K_SPACE]:
                         self.player.jump_buffer_timer = 8
                         if self.player.air_time < 2 or self.player.coyote_timer > 0 or self.player.jumps > 0 or self.player.is_wall_sliding:
-                            if 'jump' in self.game.sounds and self.game.sounds['jump']: self.game.sounds['jump'].play()
+                            self.game.sounds.play('jump')
                             self.player.attempt_jump()
                     if event.key in [K_z, K_k] and len(self.projectiles) < 4: self.fire_projectile(pygame.key.get_pressed())
                     if event.key in [K_e, K_x] and self.current_item: self.use_item()
@@ -242,13 +329,14 @@ class GameplayState(State):
                     if self.player.focus_meter >= self.player.FOCUS_DASH_COST:
                         self.player.focus_meter -= self.player.FOCUS_DASH_COST
                         self.player.dash_timer = self.player.DASH_DURATION
-                        if 'explosion' in self.game.sounds and self.game.sounds['explosion']: self.game.sounds['explosion'].play()
+                        self.game.sounds.play('explosion')
                 if event.key in [K_RIGHT, K_d]: self.player.right = False
                 if event.key in [K_LEFT, K_a]: self.player.left = False
 
     def update(self):
         self.master_clock += 1
         self.update_time_scale()
+        self.game.animation_manager.update_shared(1 / 60, self.world_time_scale) # Coins, turrets and projectiles
 
         if not self.dead:
             if self.mode != "challenge":
@@ -269,62 +357,67 @@ class GameplayState(State):
         self.update_player()
 
         if self.mode == 'challenge': self.check_challenge_conditions()
+        self.flush_entities()
+
+    def release_item(self, item):
+        if item.type == 'coin': self.coin_pool.release(item)
+
+    def flush_entities(self):
+        # Anything killed this frame is actually removed here, once every update loop is done
+        for store in (self.items, self.projectiles, self.turrets, self.turret_projectiles, self.tile_drops, self.ghosts, self.data_nodes):
+            store.flush()
     
     def update_turrets(self):
         player_rect_world = self.player.rect.copy()
         player_rect_world.y += int(self.height)
 
-        for i, turret in sorted(enumerate(self.turrets), reverse=True):
+        for handle, turret in self.turrets.items():
             # If the tile the turret was on is gone, destroy the turret
             if turret.parent_tile_pos not in self.tiles:
-                self.destroy_turret(i, turret, cause='tile_destroyed')
+                self.destroy_turret(handle, turret, cause='tile_destroyed')
                 continue
                 
             turret.update(player_rect_world, self.world_time_scale)
             turret_render_rect = turret.rect.copy()
             turret_render_rect.y -= int(self.height)
             
-            # Check collision with player's projectiles
-            for j, p_proj in sorted(enumerate(self.projectiles), reverse=True):
-                proj_render_rect = p_proj.rect.copy()
-                proj_render_rect.y -= int(self.height)
-                if proj_render_rect.colliderect(turret_render_rect):
-                    self.projectiles.pop(j)
-                    if turret.take_damage(1):
-                        self.destroy_turret(i, turret, cause='player_shot')
-                    # Break inner loop if turret is destroyed or projectile is gone
-                    break 
-            if i >= len(self.turrets) or turret is not self.turrets[i]: continue
+            # Check collision with player's projectiles (indexed in world space by update_projectiles)
+            for proj_handle, proj_rect in self.spatial_index.query('projectiles', turret.rect):
+                if not self.projectiles.kill(proj_handle): continue # Already used up this frame
+                if turret.take_damage(1):
+                    self.destroy_turret(handle, turret, cause='player_shot')
+                # Break inner loop if turret is destroyed or projectile is gone
+                break 
+            if not self.turrets.is_alive(handle): continue
 
             # Check collision with dashing player
             if self.player.dash_timer > 0 and self.player.rect.colliderect(turret_render_rect):
-                self.destroy_turret(i, turret, cause='player_dash')
+                self.destroy_turret(handle, turret, cause='player_dash')
 
     def update_turret_projectiles(self):
-        for i, proj in sorted(enumerate(self.turret_projectiles), reverse=True):
+        for handle, proj in self.turret_projectiles.items():
             if proj.update(self.world_time_scale):
-                self.turret_projectiles.pop(i)
+                self.turret_projectiles.kill(handle)
                 continue
             
             # Check collision with player
             proj_render_rect = proj.rect.copy()
             proj_render_rect.y -= int(self.height)
             if proj_render_rect.colliderect(self.player.rect):
-                self.turret_projectiles.pop(i)
+                self.turret_projectiles.kill(handle)
                 self.handle_death()
     
-    def destroy_turret(self, index, turret, cause):
-        if index < len(self.turrets):
-            self.turrets.pop(index)
+    def destroy_turret(self, handle, turret, cause):
+        self.turrets.kill(handle)
 
-        if 'explosion' in self.game.sounds: self.game.sounds['explosion'].play()
+        self.game.sounds.play('explosion')
         self.screen_shake = max(self.screen_shake, 7)
         
         turret_center_render = turret.center.copy()
         turret_center_render[1] -= int(self.height)
         for _ in range(30):
             angle, speed = self.random.random() * math.pi * 2, self.random.random() * 2
-            self.sparks.append([turret_center_render, [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 2, 0.08, (180, 50, 50), True, 0.1])
+            self.add_spark([turret_center_render, [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 2, 0.08, (180, 50, 50), True, 0.1])
         
         if cause in ['player_shot', 'player_dash']:
             self.coins += 5 * int(self.combo_multiplier)
@@ -333,7 +426,7 @@ class GameplayState(State):
     
     def update_falling_tiles(self):
         tile_drop_rects = []
-        for i, tile in sorted(enumerate(self.tile_drops), reverse=True):
+        for handle, tile in self.tile_drops.items():
             if self.freeze_timer <= 0: tile[1] += (1.8 if tile[2] == 'motherlode' else 1.4) * self.world_time_scale
             
             r_real_world = pygame.Rect(tile[0], tile[1], self.game.TILE_SIZE, self.game.TILE_SIZE)
@@ -341,68 +434,68 @@ class GameplayState(State):
             tile_drop_rects.append(r)
             graze_r = self.player.rect.copy(); graze_r.inflate_ip(8, 8)
             if graze_r.colliderect(r) and not self.player.rect.colliderect(r):
-                self.combo_multiplier += 0.2 * (2 if 'glass_cannon' in self.active_perks else 1)
+                self.combo_multiplier += 0.2 * self.combo_gain_mult
                 self.combo_timer = self.game.COMBO_DURATION
             
             if self.player.dash_timer > 0 and r.colliderect(self.player.rect):
-                self.tile_drops.pop(i)
-                if 'brittle_blocks' not in self.active_curses:
+                self.tile_drops.kill(handle)
+                if self.dash_coins:
                     self.coins += 2 * int(self.combo_multiplier)
                 
                 if self.directive and not self.directive.get('completed', False) and self.directive.get('objective_type') == 'destroy_tiles_dash': self.directive_progress += 1
-                self.combo_multiplier += 0.3 * (2 if 'glass_cannon' in self.active_perks else 1); self.combo_timer = self.game.COMBO_DURATION
-                if 'explosion' in self.game.sounds: self.game.sounds['explosion'].play()
+                self.combo_multiplier += 0.3 * self.combo_gain_mult; self.combo_timer = self.game.COMBO_DURATION
+                self.game.sounds.play('explosion')
                 self.screen_shake = max(self.screen_shake, 6)
                 for k in range(15):
                     angle, speed = self.random.random() * math.pi * 2, self.random.random() * 2.5
-                    self.sparks.append([list(r.center), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.uniform(2, 5), 0.08, (251, 245, 239), True, 0.1])
+                    self.add_spark([list(r.center), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.uniform(2, 5), 0.08, (251, 245, 239), True, 0.1])
                 continue
                 
             if r.colliderect(self.player.rect): self.handle_death()
 
             check_pos_real = (int(r_real_world.centerx // self.game.TILE_SIZE), int(math.floor(r_real_world.bottom / self.game.TILE_SIZE)))
             if check_pos_real in self.tiles:
-                self.tile_drops.pop(i)
+                self.tile_drops.kill(handle)
                 place_pos = (check_pos_real[0], check_pos_real[1] - 1)
                 
                 if place_pos[1] < 0: continue
                 
                 self.tiles[place_pos] = {'type': tile[2], 'data': {}}
                 if tile[2] == 'unstable': self.tiles[place_pos]['data']['timer'] = 180
-                self.game.sounds['block_land'].play()
+                self.game.sounds.play('block_land')
 
                 if tile[2] in ['tile', 'placed_tile'] and self.mode not in ["zen", "hardcore"]:
                     if self.random.randint(1, 100) <= 8:
                         turret_pos = [place_pos[0] * self.game.TILE_SIZE, (place_pos[1] - 1) * self.game.TILE_SIZE]
-                        self.turrets.append(Turret(self.game.animation_manager, turret_pos, (16, 16), 'turret', self, place_pos))
+                        self.turrets.add(Turret(self.game.animation_manager, turret_pos, (16, 16), 'turret', self, place_pos))
 
                 if self.random.random() < self.tile_coin_drop_chance:
-                     self.items.append(Item(self.game.animation_manager, (place_pos[0] * 16 + 5, place_pos[1] * 16 + 5), (6, 6), 'coin', self, velocity=[self.random.random() * 2 - 1, self.random.random() * -2]))
+                     self.items.add(self.coin_pool.acquire(self.game.animation_manager, (place_pos[0] * 16 + 5, place_pos[1] * 16 + 5), (6, 6), 'coin', self, velocity=[self.random.random() * 2 - 1, self.random.random() * -2]))
 
                 self.recalculate_stack_heights()
                 continue
         self.tile_drop_rects = tile_drop_rects
     
     def use_item(self):
-        if 'butter_fingers' in self.active_curses and self.random.random() < 0.5:
-            self.game.sounds['combo_end'].play()
+        if self.fumble_items and self.random.random() < 0.5:
+            self.game.sounds.play('combo_end')
             self.current_item = None
             return
 
         self.item_used = True
         item = self.current_item
         if item == 'warp':
-            self.game.sounds['warp'].play(); self.screen_shake = 15
+            self.game.sounds.play('warp'); self.screen_shake = 15
             max_point = min(enumerate(self.stack_heights), key=lambda x: x[1])
             self.player.pos = [(max_point[0] + 1) * self.game.TILE_SIZE + 4, (max_point[1] - 2) * self.game.TILE_SIZE]
             for _ in range(60):
                 angle, speed = self.random.random() * math.pi * 2, self.random.random() * 1.75
-                self.sparks.append([self.player.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 3, 0.02, (12, 8, 2), True, 0.1 * self.random.choice([0,1])])
+                self.add_spark([self.player.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 3, 0.02, (12, 8, 2), True, 0.1 * self.random.choice([0,1])])
         elif item == 'jump': 
-            self.game.sounds['super_jump'].play(); self.screen_shake = 12;
+            self.game.sounds.play('super_jump'); self.screen_shake = 12;
             self.player.jumps = self.player.jumps_max + 1; self.player.attempt_jump(); self.player.velocity[1] = -8 
         elif item == 'cube':
-            self.game.sounds['block_land'].play(); 
+            self.game.sounds.play('block_land'); 
             place_pos_x = int(self.player.center[0] // self.game.TILE_SIZE)
             place_pos_y = int(self.player.pos[1] // self.game.TILE_SIZE) + 1
             base_row = (max(self.tiles, key=lambda x: x[1])[1] if self.tiles else self.game.WINDOW_TILE_SIZE[1]-1)
@@ -410,23 +503,23 @@ class GameplayState(State):
             self.recalculate_stack_heights()
         elif item == 'bomb':
             self.bomb_item()
-        elif item == 'freeze': self.game.sounds['warp'].play(); self.screen_shake = 10; self.freeze_timer = 360
+        elif item == 'freeze': self.game.sounds.play('warp'); self.screen_shake = 10; self.freeze_timer = 360
         elif item == 'hourglass':
-            if 'upgrade' in self.game.sounds: self.game.sounds['upgrade'].play()
+            self.game.sounds.play('upgrade')
             self.screen_shake = 8
             if self.combo_multiplier > 1.0:
                 self.combo_timer = self.game.COMBO_DURATION
                 for i in range(40):
                     angle, speed = self.random.random() * math.pi * 2, self.random.random() * 1.5
-                    self.sparks.append([[self.game.DISPLAY_SIZE[0]//2, 12], [math.cos(angle) * speed, math.sin(angle) * speed - 0.5], self.random.random() * 3 + 1, 0.04, (255,220,100), True, 0.02])
+                    self.add_spark([[self.game.DISPLAY_SIZE[0]//2, 12], [math.cos(angle) * speed, math.sin(angle) * speed - 0.5], self.random.random() * 3 + 1, 0.04, (255,220,100), True, 0.02])
         
-        if 'module_recycler' in self.active_perks and self.random.random() < 0.25:
-             if self.game.sounds.get('upgrade'): self.game.sounds['upgrade'].play()
+        if self.recycle_items and self.random.random() < 0.25:
+             self.game.sounds.play('upgrade')
         else:
             self.current_item = None
 
     def bomb_item(self):
-        if 'explosion' in self.game.sounds: self.game.sounds['explosion'].play()
+        self.game.sounds.play('explosion')
         self.screen_shake = 25
         
         player_center_world = self.player.center.copy()
@@ -441,21 +534,22 @@ class GameplayState(State):
                 render_pos = [pos[0] * 16 + 8, pos[1] * 16 + 8 - self.height]
                 for _ in range(15):
                     angle, speed = self.random.random() * math.pi * 2, self.random.random() * 2
-                    self.sparks.append([render_pos, [math.cos(angle)*speed, math.sin(angle)*speed], self.random.random()*4+2, 0.08, (12,2,2), True, 0.1])
+                    self.add_spark([render_pos, [math.cos(angle)*speed, math.sin(angle)*speed], self.random.random()*4+2, 0.08, (12,2,2), True, 0.1])
         if to_bomb_tiles:
             self.recalculate_stack_heights()
 
         # Bomb Turrets
-        for i, turret in sorted(enumerate(self.turrets), reverse=True):
+        for handle, turret in self.turrets.items():
             if (player_center_world[0] - turret.center[0])**2 + (player_center_world[1] - turret.center[1])**2 < bomb_radius_sq:
-                self.destroy_turret(i, turret, cause='bomb')
+                self.destroy_turret(handle, turret, cause='bomb')
 
     def render(self, surface):
         self.render_background(surface)
         if self.freeze_timer > 0:
-            freeze_overlay = pygame.Surface(self.game.DISPLAY_SIZE, pygame.SRCALPHA)
-            alpha = 60 + math.sin(self.master_clock / 5) * 10
-            freeze_overlay.fill((170, 200, 255, alpha)); surface.blit(freeze_overlay, (0, 0))
+            alpha = self.freeze_alphas.at(self.master_clock)
+            if alpha != self.freeze_overlay_alpha:
+                self.freeze_overlay.fill((170, 200, 255, alpha)); self.freeze_overlay_alpha = alpha
+            surface.blit(self.freeze_overlay, (0, 0))
         
         self.render_challenge_goal(surface)
         self.render_plasma(surface); self.render_data_nodes(surface); self.render_ghosts(surface)
@@ -499,7 +593,7 @@ class GameplayState(State):
     def handle_challenge_win(self):
         if not self.dead:
             self.dead = True
-            if self.game.sounds.get('upgrade'): self.game.sounds['upgrade'].play()
+            self.game.sounds.play('upgrade')
             self.game.pop_state()
 
     def render_challenge_goal(self, surface):
@@ -518,18 +612,18 @@ class GameplayState(State):
         if self.mode == "zen":
             self.player.pos[1] -= 20
             self.player.velocity[1] = -5
-            if 'time_slow_start' in self.game.sounds: self.game.sounds['time_slow_start'].play()
+            self.game.sounds.play('time_slow_start')
             return
             
         if self.player_shielded:
             self.player_shielded = False
-            self.game.sounds['explosion'].play() if 'explosion' in self.game.sounds else self.game.sounds['super_jump'].play()
+            self.game.sounds.play('explosion')
             self.screen_shake = 15
-            if 'safeguard' in self.active_perks:
+            if self.shield_break_invincibility:
                 self.invincibility_timer = 120 # 2 seconds
             for _ in range(60):
                 angle, speed = self.random.random() * math.pi * 2, self.random.random() * 2
-                self.sparks.append([self.player.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.uniform(2, 4), 0.05, (170, 200, 255), True, 0.05])
+                self.add_spark([self.player.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.uniform(2, 4), 0.05, (170, 200, 255), True, 0.05])
             return
 
         self.dead = True
@@ -541,15 +635,14 @@ class GameplayState(State):
         else:
              self.game.save_data['stats']['total_coins'] += self.coins
 
-        if 'death' in self.game.sounds: self.game.sounds['death'].play()
+        self.game.sounds.play('death')
         self.screen_shake = 20
         
         for i in range(120):
             angle, speed, physics = self.random.random() * math.pi * 2, self.random.random() * 2, self.random.choice([False, True])
-            self.sparks.append([self.player.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 3, 0.04, (18, 2, 2), physics, 0.1 * physics])
+            self.add_spark([self.player.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 3, 0.04, (18, 2, 2), physics, 0.1 * physics])
             
-        background_surf = self.game.display.copy()
-        self.render(background_surf)
+        background_surf = self.game.capture_frame(self)
         
         if self.mode == 'challenge':
             self.game.pop_state()
@@ -557,40 +650,53 @@ class GameplayState(State):
             if GameOverState: self.game.push_state(GameOverState(self.game, self.coins, background_surf))
             
     def update_ghosts(self):
-        for i, ghost in sorted(enumerate(self.ghosts), reverse=True):
+        for handle, ghost in self.ghosts.items():
             ghost[2] -= 1
-            if ghost[2] <= 0: self.ghosts.pop(i)
+            if ghost[2] <= 0: self.ghosts.kill(handle)
                 
     def render_ghosts(self, surface):
-        for img, pos, timer, flip in self.ghosts:
-            alpha = max(0, (timer / 15) * 120)
-            img.set_alpha(alpha)
-            render_img = pygame.transform.flip(img, flip, False)
-            surface.blit(render_img, (pos[0], pos[1] - self.height))
+        # Ghosts share their cached sprites, so the fade is set just before each blit
+        for img, pos, timer in self.ghosts:
+            img.set_alpha(max(0, (timer / 15) * 120))
+            surface.blit(img, (pos[0], pos[1] - self.height))
 
     def recalculate_stack_heights(self):
         new_heights = [self.game.WINDOW_TILE_SIZE[1] for _ in range(self.game.WINDOW_TILE_SIZE[0] - 2)]
         for tile_x, tile_y in self.tiles:
             if 1 <= tile_x < self.game.WINDOW_TILE_SIZE[0] - 1: new_heights[tile_x - 1] = min(new_heights[tile_x - 1], tile_y)
         self.stack_heights = new_heights
+        # Columns tall enough to drop into, kept in ascending order for update_tile_spawning
+        self.valid_columns = [i for i, h in enumerate(new_heights) if h > 4]
+
+        # Every tile change ends up here, so this is also where the turret line of sight grid
+        # is rebuilt: bit x of solid_rows[y] is set for each tile that blocks shots.
+        solid_rows = {}
+        for (tile_x, tile_y), tile in self.tiles.items():
+            if tile_x >= 0 and tile['type'] not in ('chest', 'opened_chest'):
+                solid_rows[tile_y] = solid_rows.get(tile_y, 0) | (1 << tile_x)
+        self.solid_rows = solid_rows
+        self.tile_version += 1 # Turrets compare this against their cached line of sight
 
     def update_biome(self):
         next_biome_index = self.current_biome_index
-        if self.mode not in ["zen", "daily_challenge"] and self.current_biome_index + 1 < len(self.game.biomes) and self.coins >= self.game.biomes[self.current_biome_index + 1]['score_req']:
+        if self.mode not in ["zen", "daily_challenge"] and self.current_biome_index + 1 < len(self.game.compiled_biomes) and self.coins >= self.game.compiled_biomes[self.current_biome_index + 1].score_req:
             next_biome_index += 1
         if next_biome_index != self.current_biome_index:
             self.current_biome_index = next_biome_index;
+            self.biome = self.game.compiled_biomes[self.current_biome_index]
+            self.spawn_sampler = None
             self.game.load_biome_bgs(self.game.biomes[self.current_biome_index])
-            new_biome_name = self.game.biomes[self.current_biome_index]['name']
+            self.game.play_biome_music(self.current_biome_index)
+            new_biome_name = self.biome.name
             if new_biome_name not in self.game.save_data['biomes_unlocked']:
                 self.game.save_data['biomes_unlocked'].append(new_biome_name)
                 self.game.write_save(self.game.save_data)
-            self.game.sounds['warp'].play(); self.screen_shake = 15; self.plasma_y = self.game.DISPLAY_SIZE[1] + 50; self.data_nodes = []
+            self.game.sounds.play('warp'); self.screen_shake = 15; self.plasma_y = self.game.DISPLAY_SIZE[1] + 50; self.data_nodes.clear()
             self.combo_shield_used = False
             
     def update_ambient_hazards(self):
-        if 'ambient_hazard' in self.game.biomes[self.current_biome_index]:
-            hazard = self.game.biomes[self.current_biome_index]['ambient_hazard']
+        hazard = self.biome.ambient_hazard
+        if hazard:
             if hazard['type'] == 'rising_plasma':
                 self.plasma_y -= hazard['speed'] * self.world_time_scale
             player_render_rect = self.player.rect.copy()
@@ -600,39 +706,38 @@ class GameplayState(State):
 
 
     def update_special_entities(self):
-        if 'special_entities' in self.game.biomes[self.current_biome_index]:
-            entity_config = self.game.biomes[self.current_biome_index]['special_entities']
+        entity_config = self.biome.special_entities
+        if entity_config:
             self.special_entity_timer += 1 * self.world_time_scale
             if self.special_entity_timer > entity_config['spawn_rate']:
                 self.special_entity_timer = 0
                 if entity_config['type'] == 'data_node':
-                    valid_cols = [i for i, h in enumerate(self.stack_heights) if h > 4]
-                    if valid_cols:
-                        x_pos = (self.random.choice(valid_cols) + 1) * self.game.TILE_SIZE
-                        self.data_nodes.append(pygame.Rect(x_pos, -self.height - 24, 16, 24))
+                    if self.valid_columns:
+                        x_pos = (self.random.choice(self.valid_columns) + 1) * self.game.TILE_SIZE
+                        self.data_nodes.add(pygame.Rect(x_pos, -self.height - 24, 16, 24))
                         
-        for i, data_node_rect in sorted(enumerate(self.data_nodes), reverse=True):
+        for handle, data_node_rect in self.data_nodes.items():
             data_node_render_rect = pygame.Rect(data_node_rect.x, data_node_rect.y - self.height, data_node_rect.width, data_node_rect.height)
             if self.player.dash_timer > 0 and self.player.rect.colliderect(data_node_render_rect):
-                self.data_nodes.pop(i)
+                self.data_nodes.kill(handle)
                 self.coins += 5 * int(self.combo_multiplier)
-                self.combo_multiplier += 0.5 * (2 if 'glass_cannon' in self.active_perks else 1)
+                self.combo_multiplier += 0.5 * self.combo_gain_mult
                 self.combo_timer = self.game.COMBO_DURATION
-                self.game.sounds['explosion'].play()
+                self.game.sounds.play('explosion')
                 self.screen_shake = max(self.screen_shake, 6)
                 for k in range(20):
                     angle, speed = self.random.random() * math.pi * 2, self.random.random() * 2.5
-                    self.sparks.append([list(data_node_render_rect.center), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.uniform(2, 5), 0.08, (200, 220, 255), True, 0.1])
+                    self.add_spark([list(data_node_render_rect.center), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.uniform(2, 5), 0.08, (200, 220, 255), True, 0.1])
                 continue
 
             if self.freeze_timer <= 0: data_node_rect.y += 1.6 * self.world_time_scale
-            if self.player.rect.colliderect(data_node_render_rect): self.data_nodes.pop(i); self.handle_death()
+            if self.player.rect.colliderect(data_node_render_rect): self.data_nodes.kill(handle); self.handle_death()
             
             check_pos_real_world = (int(data_node_rect.centerx // self.game.TILE_SIZE), int(math.floor(data_node_rect.bottom / self.game.TILE_SIZE)))
             if check_pos_real_world in self.tiles:
-                self.data_nodes.pop(i); self.screen_shake = max(self.screen_shake, 7); self.game.sounds['explosion'].play()
+                self.data_nodes.kill(handle); self.screen_shake = max(self.screen_shake, 7); self.game.sounds.play('explosion')
                 for k in range(self.random.randint(4, 8)):
-                    self.items.append(Item(self.game.animation_manager, (data_node_rect.centerx, data_node_rect.bottom - self.height), (6, 6), 'coin', self, velocity=[self.random.random() * 4 - 2, self.random.random() * 2 - 6]))
+                    self.items.add(self.coin_pool.acquire(self.game.animation_manager, (data_node_rect.centerx, data_node_rect.bottom - self.height), (6, 6), 'coin', self, velocity=[self.random.random() * 4 - 2, self.random.random() * 2 - 6]))
 
     def update_time_scale(self):
         self.player_time_scale = 1.0
@@ -645,9 +750,9 @@ class GameplayState(State):
         is_slowing_now = (pygame.key.get_pressed()[K_LSHIFT] and self.time_meter > 0) or self.player.is_charging_dash
         
         if is_slowing_now and not self.slowing_time:
-            self.game.sounds['time_slow_start'].play()
+            self.game.sounds.play('time_slow_start')
         elif not is_slowing_now and self.slowing_time:
-            self.game.sounds['time_slow_end'].play()
+            self.game.sounds.play('time_slow_end')
             
         self.slowing_time = is_slowing_now
 
@@ -658,34 +763,33 @@ class GameplayState(State):
                 if self.player.focus_meter <= 0: self.player.is_charging_dash = False
             elif pygame.key.get_pressed()[K_LSHIFT]:
                 self.time_meter = max(0, self.time_meter - 0.75)
-                if self.time_meter <= 0: self.game.sounds['time_empty'].play()
+                if self.time_meter <= 0: self.game.sounds.play('time_empty')
         else:
             self.time_meter = min(self.game.time_meter_max, self.time_meter + 0.2)
 
 
     def update_combo_meter(self):
         if self.combo_timer > 0:
-            combo_drain_multiplier = 1.5 if 'short_fuse' in self.active_curses else 1
-            self.combo_timer -= (2 if 'glass_cannon' in self.active_perks else 1) * self.world_time_scale * combo_drain_multiplier
+            self.combo_timer -= self.combo_drain_mult * self.world_time_scale
             
             if self.combo_timer <= 0 and self.combo_multiplier > 1.0:
                 self.combo_timer = 0
-                if 'combo_end' in self.game.sounds: self.game.sounds['combo_end'].play()
+                self.game.sounds.play('combo_end')
                 
-                shield_level = self.game.save_data['upgrades']['combo_shield']
+                shield_level = self.stats.combo_shield
                 if shield_level > 0 and not self.combo_shield_used:
                     self.combo_shield_used = True
                     self.combo_multiplier = 1.0 + shield_level * 1.5
-                    if 'explosion' in self.game.sounds: self.game.sounds['explosion'].play()
+                    self.game.sounds.play('explosion')
                     self.screen_shake = 10
                     for i in range(30):
                         angle, speed = self.random.random() * math.pi * 2, self.random.random() * 2
-                        self.sparks.append([[self.game.DISPLAY_SIZE[0] // 2, 10], [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 2 + 1, 0.05, (255, 200, 50), True, 0.05])
+                        self.add_spark([[self.game.DISPLAY_SIZE[0] // 2, 10], [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 2 + 1, 0.05, (255, 200, 50), True, 0.05])
                 else:
                     self.combo_multiplier = 1.0
                     for i in range(20):
                         angle, speed = self.random.random() * math.pi * 2, self.random.random() * 1.5
-                        self.sparks.append([[self.game.DISPLAY_SIZE[0] // 2, 10], [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 2 + 1, 0.05, (251, 245, 239), True, 0.05])
+                        self.add_spark([[self.game.DISPLAY_SIZE[0] // 2, 10], [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 2 + 1, 0.05, (251, 245, 239), True, 0.05])
 
     def update_perk_offering(self):
         if self.mode in ['zen', 'challenge', 'daily_challenge']: return
@@ -695,10 +799,9 @@ class GameplayState(State):
             available_perks = [p for p in self.game.perks.keys() if p not in self.active_perks]
             if available_perks:
                 perks_to_offer = self.random.sample(available_perks, k=min(3, len(available_perks)))
-                background_surf = self.game.display.copy()
-                self.render(background_surf)
+                background_surf = self.game.capture_frame(self, tint=PerkSelectionState.BACKGROUND_TINT)
                 self.game.push_state(PerkSelectionState(self.game, perks_to_offer, background_surf))
-                self.game.sounds['warp'].play()
+                self.game.sounds.play('warp')
 
     def update_directive(self):
         if not self.directive or self.directive.get('completed', False): return
@@ -709,7 +812,7 @@ class GameplayState(State):
 
         if self.directive_progress >= self.directive.get('value', float('inf')):
             self.directive['completed'] = True
-            self.game.sounds['directive_complete'].play()
+            self.game.sounds.play('directive_complete')
             reward_type = self.directive.get('reward_type')
             reward_value = self.directive.get('reward_value')
             if reward_type == 'coins' and reward_value: self.coins += reward_value
@@ -722,28 +825,28 @@ class GameplayState(State):
         if self.game_timer > current_spawn_rate:
             self.game_timer = 0
             
-            valid_columns = [i for i in range(len(self.stack_heights)) if self.stack_heights[i] > 4]
+            valid_columns = self.valid_columns
             if not valid_columns: return
 
-            choices = [col for col in valid_columns if col != self.last_place] if len(valid_columns) > 1 and self.last_place in valid_columns else valid_columns
-            chosen_col_index = self.random.choice(choices)
+            # Pick any valid column except the last one used, without building a filtered list
+            last_index = bisect_left(valid_columns, self.last_place)
+            if len(valid_columns) > 1 and last_index < len(valid_columns) and valid_columns[last_index] == self.last_place:
+                pick = self.random.randrange(len(valid_columns) - 1)
+                chosen_col_index = valid_columns[pick + 1 if pick >= last_index else pick]
+            else:
+                chosen_col_index = self.random.choice(valid_columns)
             self.last_place = chosen_col_index
 
-            biome = self.game.biomes[self.current_biome_index]
+            biome = self.biome
             final_tile_type = 'tile' 
             
             elite_roll = self.random.randint(1, 100)
-            if elite_roll <= 2 and 'motherlode' in biome['available_tiles']: final_tile_type = 'motherlode'
-            elif elite_roll <= 5 and 'unstable' in biome['available_tiles']: final_tile_type = 'unstable'
+            if elite_roll <= 2 and biome.has_motherlode: final_tile_type = 'motherlode'
+            elif elite_roll <= 5 and biome.has_unstable: final_tile_type = 'unstable'
             else:
-                spawn_weights = {'tile': 70, 'fragile': 8, 'bounce': 5, 'chest': 3, 'spike': 2, 'greed': 2}
-                for special, chance in biome.get('special_spawn_rate', {}).items(): spawn_weights[special] = spawn_weights.get(special, 0) + chance
-
-                available_choices = {k: v for k, v in spawn_weights.items() if k in biome['available_tiles'] and k not in self.disabled_tiles}
-                if available_choices: final_tile_type = self.random.choices(list(available_choices.keys()), list(available_choices.values()), k=1)[0]
-            
-            if final_tile_type == 'greed' and 'high_stakes' in self.active_curses: final_tile_type = 'spike'
-            self.tile_drops.append([(chosen_col_index + 1) * self.game.TILE_SIZE, -self.height - self.game.TILE_SIZE, final_tile_type])
+                sampler = self.get_spawn_sampler()
+                if sampler: final_tile_type = self.random.choices(sampler[0], cum_weights=sampler[1], k=1)[0]
+            self.tile_drops.add([(chosen_col_index + 1) * self.game.TILE_SIZE, -self.height - self.game.TILE_SIZE, final_tile_type])
             
     def update_placed_tiles(self):
         to_remove = []
@@ -753,20 +856,20 @@ class GameplayState(State):
             
             if tile_data['type'] == 'unstable' and 'timer' in tile_data['data']:
                 tile_data['data']['timer'] -= 1 * self.world_time_scale
-                if self.random.randint(1, 8) == 1: self.sparks.append([[(tile_pos[0] + 0.5) * self.game.TILE_SIZE, (tile_pos[1] + 0.5) * self.game.TILE_SIZE - self.height], [self.random.uniform(-0.5, 0.5), self.random.uniform(-0.5, 0.5)], self.random.uniform(2, 4), 0.1, (255, 100, 20), False, 0])
+                if self.random.randint(1, 8) == 1: self.add_spark([[(tile_pos[0] + 0.5) * self.game.TILE_SIZE, (tile_pos[1] + 0.5) * self.game.TILE_SIZE - self.height], [self.random.uniform(-0.5, 0.5), self.random.uniform(-0.5, 0.5)], self.random.uniform(2, 4), 0.1, (255, 100, 20), False, 0])
                 if tile_data['data']['timer'] <= 0:
                     if tile_pos not in to_remove: to_remove.append(tile_pos)
 
             if tile_data['type'] == 'fragile' and 'timer' in tile_data['data']:
                 tile_data['data']['timer'] -= 1 * self.world_time_scale
-                if self.random.randint(1, 10) == 1: self.sparks.append([[tile_pos[0] * self.game.TILE_SIZE + self.random.random() * 16, tile_pos[1] * self.game.TILE_SIZE + 14 - self.height], [self.random.random() * 0.5 - 0.25, self.random.random() * 0.5], self.random.random() * 2 + 1, 0.08, (6, 4, 1), True, 0.05])
+                if self.random.randint(1, 10) == 1: self.add_spark([[tile_pos[0] * self.game.TILE_SIZE + self.random.random() * 16, tile_pos[1] * self.game.TILE_SIZE + 14 - self.height], [self.random.random() * 0.5 - 0.25, self.random.random() * 0.5], self.random.random() * 2 + 1, 0.08, (6, 4, 1), True, 0.05])
                 if tile_data['data']['timer'] <= 0:
                     if tile_pos not in to_remove: to_remove.append(tile_pos)
                     for _ in range(20):
                         angle, speed = self.random.random() * math.pi * 2, self.random.random() * 1.5
-                        self.sparks.append([[tile_pos[0] * self.game.TILE_SIZE + 8, tile_pos[1] * self.game.TILE_SIZE + 8 - self.height], [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 4 + 2, 0.05, (6, 4, 1), True, 0.1])
+                        self.add_spark([[tile_pos[0] * self.game.TILE_SIZE + 8, tile_pos[1] * self.game.TILE_SIZE + 8 - self.height], [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 4 + 2, 0.05, (6, 4, 1), True, 0.1])
             
-            if tile_data['type'] == 'conduit' and 'static_shock' in self.active_curses:
+            if tile_data['type'] == 'conduit' and self.shock_conduits:
                 if 'timer' not in tile_data['data']: tile_data['data']['timer'] = 0
                 
                 if player_on_tile:
@@ -783,7 +886,7 @@ class GameplayState(State):
             for p in to_remove:
                 if p in self.tiles: del self.tiles[p]
                 if self.random.random() < self.tile_coin_drop_chance:
-                     self.items.append(Item(self.game.animation_manager, (p[0] * 16 + 5, p[1] * 16 + 5 - self.height), (6, 6), 'coin', self, velocity=[self.random.random() * 2 - 1, self.random.random() * -2]))
+                     self.items.add(self.coin_pool.acquire(self.game.animation_manager, (p[0] * 16 + 5, p[1] * 16 + 5 - self.height), (6, 6), 'coin', self, velocity=[self.random.random() * 2 - 1, self.random.random() * -2]))
             self.recalculate_stack_heights()
 
     def update_tile_interactions(self):
@@ -793,91 +896,126 @@ class GameplayState(State):
                 chest_render_pos = (pos[0]*self.game.TILE_SIZE, (pos[1]-1)*self.game.TILE_SIZE - self.height)
                 r = pygame.Rect(chest_render_pos[0]+2, chest_render_pos[1]+6, self.game.TILE_SIZE-4, self.game.TILE_SIZE-6)
                 if self.player.rect.colliderect(r):
-                    self.game.sounds['chest_open'].play()
-                    self.combo_multiplier += 1.0*(2 if 'glass_cannon' in self.active_perks else 1)
+                    self.game.sounds.play('chest_open')
+                    self.combo_multiplier += 1.0*self.combo_gain_mult
                     self.combo_timer = self.game.COMBO_DURATION
                     for _ in range(50):
-                        self.sparks.append([[chest_render_pos[0]+8, chest_render_pos[1]+8], [self.random.random()*2-1, self.random.random()-2], self.random.random()*3+3, 0.01, (12,8,2), True, 0.05])
+                        self.add_spark([[chest_render_pos[0]+8, chest_render_pos[1]+8], [self.random.random()*2-1, self.random.random()-2], self.random.random()*3+3, 0.01, (12,8,2), True, 0.05])
                     self.tiles[pos]['type'] = 'opened_chest'
                     self.player.jumps = min(self.player.jumps + 1, self.player.jumps_max)
                     self.player.attempt_jump()
                     self.player.velocity[1] = -3.5
                     
-                    item_luck = 3 + self.game.save_data['upgrades']['item_luck']
-                    if self.random.randint(1, 5) < item_luck:
+                    if self.random.randint(1, 5) < self.stats.item_luck:
                         item_type = self.random.choice(['warp', 'cube', 'jump', 'bomb', 'freeze', 'shield', 'hourglass'])
-                        self.items.append(Item(self.game.animation_manager, (pos[0]*self.game.TILE_SIZE+5, (pos[1]-1)*self.game.TILE_SIZE+5 - self.height), (6,6), item_type, self, velocity=[self.random.random()*5-2.5, self.random.random()*2-5]))
+                        self.items.add(Item(self.game.animation_manager, (pos[0]*self.game.TILE_SIZE+5, (pos[1]-1)*self.game.TILE_SIZE+5 - self.height), (6,6), item_type, self, velocity=[self.random.random()*5-2.5, self.random.random()*2-5]))
                     else:
-                        coins_mult = 2 if 'greedy' in self.active_perks else 1
-                        for _ in range(self.random.randint(2,6)*coins_mult):
-                            self.items.append(Item(self.game.animation_manager, (pos[0]*self.game.TILE_SIZE+5, (pos[1]-1)*self.game.TILE_SIZE+5 - self.height), (6,6), 'coin', self, velocity=[self.random.random()*5-2.5, self.random.random()*2-7]))
+                        for _ in range(self.random.randint(2,6)*self.coin_mult):
+                            self.items.add(self.coin_pool.acquire(self.game.animation_manager, (pos[0]*self.game.TILE_SIZE+5, (pos[1]-1)*self.game.TILE_SIZE+5 - self.height), (6,6), 'coin', self, velocity=[self.random.random()*5-2.5, self.random.random()*2-7]))
 
     def update_items(self):
-        solid_rects = [pygame.Rect(p[0] * self.game.TILE_SIZE, p[1] * self.game.TILE_SIZE - self.height, self.game.TILE_SIZE, self.game.TILE_SIZE) for p in self.tiles]
-        edge_rects = [pygame.Rect(0, 0, self.game.TILE_SIZE, self.game.DISPLAY_SIZE[1]), pygame.Rect(self.game.DISPLAY_SIZE[0] - self.game.TILE_SIZE, 0, self.game.TILE_SIZE, self.game.DISPLAY_SIZE[1])]
-        for i, item in sorted(enumerate(self.items), reverse=True):
-            item.update(solid_rects + edge_rects, self.world_time_scale)
+        # Coins go through CoinSimulator in one batch once there are enough of them to pay
+        # for the NumPy overhead; everything else is stepped one Item at a time
+        coin_handles, coins, single = [], [], []
+        for handle, item in self.items.items():
+            if item.type == 'coin' and self.coin_simulator: coin_handles.append(handle); coins.append(item)
+            else: single.append((handle, item))
+        if len(coins) < COIN_BATCH_MIN:
+            single += zip(coin_handles, coins)
+            coin_handles, coins = [], []
+        else:
+            self.coin_simulator.refresh_grid(self.tiles, self.tile_version)
+            stuck = self.coin_simulator.overlapping(coins, self.height)
+            if any(stuck):
+                single += [(handle, coin) for handle, coin, inside in zip(coin_handles, coins, stuck) if inside]
+                coin_handles = [handle for handle, inside in zip(coin_handles, stuck) if not inside]
+                coins = [coin for coin, inside in zip(coins, stuck) if not inside]
+
+        magnet_lvl, magnet_radius_sq = self.stats.magnet_level, self.stats.magnet_radius_sq
+        if single:
+            solid_rects = [pygame.Rect(p[0] * self.game.TILE_SIZE, p[1] * self.game.TILE_SIZE - self.height, self.game.TILE_SIZE, self.game.TILE_SIZE) for p in self.tiles]
+            edge_rects = [pygame.Rect(0, 0, self.game.TILE_SIZE, self.game.DISPLAY_SIZE[1]), pygame.Rect(self.game.DISPLAY_SIZE[0] - self.game.TILE_SIZE, 0, self.game.TILE_SIZE, self.game.DISPLAY_SIZE[1])]
+            solid_rects += edge_rects
+        for handle, item in single:
+            item.update(solid_rects, self.world_time_scale)
 
             if item.type == 'coin' and not self.dead:
-                magnet_lvl = self.game.save_data['upgrades']['coin_magnet']
                 if magnet_lvl > 0:
                     dist_x, dist_y = self.player.center[0] - item.center[0], self.player.center[1] - item.center[1]
                     dist_sq = dist_x**2 + dist_y**2
-                    if dist_sq < (20 + magnet_lvl * 10)**2:
+                    if dist_sq < magnet_radius_sq:
                         dist = math.sqrt(dist_sq) if dist_sq > 0 else 1
-                        pull_strength = 0.05 + magnet_lvl * 0.05
                         item.velocity[0] += (dist_x / dist) * self.world_time_scale
                         item.velocity[1] += (dist_y / dist) * self.world_time_scale
             
             if item.time > 30 and item.rect.colliderect(self.player.rect):
-                if item.type == 'coin':
-                    self.game.sounds['coin'].play()
-                    self.coins += int(1 * self.combo_multiplier)
-                    self.combo_multiplier += 0.1 * (2 if 'glass_cannon' in self.active_perks else 1)
-                    self.combo_timer = self.game.COMBO_DURATION
-                    for _ in range(25):
-                        angle, speed, physics = self.random.random() * math.pi * 2, self.random.random() * 0.4, self.random.choice([False, False, False, False, True])
-                        self.sparks.append([item.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 3, 0.02, (12, 8, 2), physics, 0.1 * physics])
-                else:
-                    self.game.sounds['collect_item'].play()
-                    for _ in range(50): self.sparks.append([item.center.copy(), [self.random.random() * 0.3 - 0.15, self.random.random() * 6 - 3], self.random.random() * 4 + 3, 0.01, (12, 8, 2), False, 0])
-                    if item.type == 'shield': self.player_shielded = True; (self.game.sounds['upgrade'] if 'upgrade' in self.game.sounds else self.game.sounds['collect_item']).play()
-                    else: self.current_item = item.type
-                self.items.pop(i)
+                self.collect_item(handle, item)
+
+        if coins:
+            picked = self.coin_simulator.step(coins, self.world_time_scale, self.height, self.player, 0 if self.dead else magnet_lvl, magnet_radius_sq)
+            for i in picked: self.collect_item(coin_handles[i], coins[i])
+
+    def collect_item(self, handle, item):
+        if item.type == 'coin':
+            self.game.sounds.play('coin')
+            self.coins += int(1 * self.combo_multiplier)
+            self.combo_multiplier += 0.1 * self.combo_gain_mult
+            self.combo_timer = self.game.COMBO_DURATION
+            for _ in range(25):
+                angle, speed, physics = self.random.random() * math.pi * 2, self.random.random() * 0.4, self.random.choice([False, False, False, False, True])
+                self.add_spark([item.center.copy(), [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 3, 0.02, (12, 8, 2), physics, 0.1 * physics])
+        else:
+            self.game.sounds.play('collect_item')
+            for _ in range(50): self.add_spark([item.center.copy(), [self.random.random() * 0.3 - 0.15, self.random.random() * 6 - 3], self.random.random() * 4 + 3, 0.01, (12, 8, 2), False, 0])
+            if item.type == 'shield': self.player_shielded = True; self.game.sounds.play('upgrade')
+            else: self.current_item = item.type
+        self.items.kill(handle)
+
+    def build_spatial_index(self):
+        # World-space broadphase shared by this frame's projectile checks (update_projectiles, update_turrets)
+        index = self.spatial_index
+        index.clear()
+        for handle, tile in self.tile_drops.items(): index.insert('tile_drops', handle, pygame.Rect(tile[0], tile[1], self.game.TILE_SIZE, self.game.TILE_SIZE))
+        for handle, data_node_rect in self.data_nodes.items(): index.insert('data_nodes', handle, data_node_rect)
+        for handle, p in self.projectiles.items(): index.insert('projectiles', handle, p.rect.copy())
 
     def update_projectiles(self):
-        for i, p in sorted(enumerate(self.projectiles), reverse=True):
+        display_rect = self.game.display.get_rect()
+        for handle, p in self.projectiles.items():
             p.update(self.world_time_scale)
             proj_render_rect = p.rect.copy()
             proj_render_rect.y -= int(self.height)
+            if not proj_render_rect.colliderect(display_rect): self.projectiles.kill(handle)
 
-            if not proj_render_rect.colliderect(self.game.display.get_rect()): self.projectiles.pop(i); continue
-            
+        # Everything has moved for this frame, so the index can be built once and shared
+        self.build_spatial_index()
+
+        for handle, p in self.projectiles.items():
             hit_tile = False
-            for j, tile_drop in sorted(enumerate(self.tile_drops), reverse=True):
-                r = pygame.Rect(tile_drop[0], tile_drop[1] - self.height, self.game.TILE_SIZE, self.game.TILE_SIZE)
-                if proj_render_rect.colliderect(r):
-                    self.game.sounds['block_land'].play(); p.health -= 1
+            for drop_handle, drop_rect in self.spatial_index.query('tile_drops', p.rect):
+                if self.tile_drops.is_alive(drop_handle):
+                    r = pygame.Rect(drop_rect.x, drop_rect.y - self.height, self.game.TILE_SIZE, self.game.TILE_SIZE)
+                    self.game.sounds.play('block_land'); p.health -= 1
                     for _ in range(15):
                         angle, speed = self.random.random() * math.pi * 2, self.random.random() * 2
-                        self.sparks.append([[r.centerx, r.centery], [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 2, 0.08, (251, 245, 239), True, 0.1])
-                    self.tile_drops.pop(j)
+                        self.add_spark([[r.centerx, r.centery], [math.cos(angle) * speed, math.sin(angle) * speed], self.random.random() * 3 + 2, 0.08, (251, 245, 239), True, 0.1])
+                    self.tile_drops.kill(drop_handle)
                     if p.health <= 0:
                         hit_tile = True
-                        if i < len(self.projectiles): self.projectiles.pop(i)
+                        self.projectiles.kill(handle)
                     self.coins += 1; self.combo_multiplier += 0.05; self.combo_timer = self.game.COMBO_DURATION; break
             if hit_tile: continue
             
-            for k, data_node_rect in sorted(enumerate(self.data_nodes), reverse=True):
-                data_node_render_rect = data_node_rect.copy()
-                data_node_render_rect.y -= int(self.height)
-                if proj_render_rect.colliderect(data_node_render_rect):
-                    self.data_nodes.pop(k)
-                    if i < len(self.projectiles): self.projectiles.pop(i)
+            for node_handle, data_node_rect in self.spatial_index.query('data_nodes', p.rect):
+                if self.data_nodes.is_alive(node_handle):
+                    data_node_render_rect = data_node_rect.copy()
+                    data_node_render_rect.y -= int(self.height)
+                    self.data_nodes.kill(node_handle)
+                    self.projectiles.kill(handle)
                     self.screen_shake = max(self.screen_shake, 7)
-                    self.game.sounds['explosion'].play()
+                    self.game.sounds.play('explosion')
                     for _ in range(self.random.randint(4, 8)):
-                        self.items.append(Item(self.game.animation_manager, (data_node_render_rect.centerx, data_node_render_rect.bottom), (6, 6), 'coin', self, velocity=[self.random.random() * 4 - 2, self.random.random() * 2 - 6]))
+                        self.items.add(self.coin_pool.acquire(self.game.animation_manager, (data_node_render_rect.centerx, data_node_render_rect.bottom), (6, 6), 'coin', self, velocity=[self.random.random() * 4 - 2, self.random.random() * 2 - 6]))
                     break
 
     def update_player(self):
@@ -896,7 +1034,7 @@ class GameplayState(State):
             edge_rects = [pygame.Rect(0, 0, self.game.TILE_SIZE, self.game.DISPLAY_SIZE[1]), pygame.Rect(self.game.TILE_SIZE * (self.game.WINDOW_TILE_SIZE[0] - 1), 0, self.game.TILE_SIZE, self.game.DISPLAY_SIZE[1])]
             
             original_speed = self.player.speed
-            if 'heavy_feet' in self.active_curses: self.player.speed *= 0.85
+            self.player.speed *= self.speed_mult
             
             collisions = self.player.update(self.tile_drop_rects + edge_rects + tile_rects, self.player_time_scale)
             self.player.speed = original_speed
@@ -910,15 +1048,15 @@ class GameplayState(State):
             if collisions['bottom']:
                 if tile_pos_below_player in self.tiles:
                     tile_type = self.tiles[tile_pos_below_player]['type']
-                    if tile_type == 'fragile' and 'timer' not in self.tiles[tile_pos_below_player]['data']: self.game.sounds['block_land'].play(); self.tiles[tile_pos_below_player]['data']['timer'] = 90
+                    if tile_type == 'fragile' and 'timer' not in self.tiles[tile_pos_below_player]['data']: self.game.sounds.play('block_land'); self.tiles[tile_pos_below_player]['data']['timer'] = 90
                     elif tile_type == 'geyser' and self.tiles[tile_pos_below_player].get('data', {}).get('timer', 0) <= 0: self.tiles[tile_pos_below_player]['data']['timer'] = 120 # Cooldown
-                    elif tile_type == 'bounce': self.player.velocity[1] = -9; self.player.jumps = self.player.jumps_max; self.game.sounds['super_jump'].play(); self.screen_shake = 10; self.combo_multiplier += 0.5; self.combo_timer = self.game.COMBO_DURATION
+                    elif tile_type == 'bounce': self.player.velocity[1] = -9; self.player.jumps = self.player.jumps_max; self.game.sounds.play('super_jump'); self.screen_shake = 10; self.combo_multiplier += 0.5; self.combo_timer = self.game.COMBO_DURATION
                     elif tile_type == 'spike': self.handle_death(); self.player.velocity = [0, -4]
                     elif tile_type == 'conduit':
                         for _ in range(4):
                             angle = self.random.random() * math.pi * 2
                             speed = self.random.random() * 1.5
-                            self.sparks.append([list(self.player.rect.midbottom), [math.cos(angle) * speed, math.sin(angle) * speed - 0.5], self.random.random() * 2 + 1, 0.1, (100, 150, 255), True, 0.02])
+                            self.add_spark([list(self.player.rect.midbottom), [math.cos(angle) * speed, math.sin(angle) * speed - 0.5], self.random.random() * 2 + 1, 0.1, (100, 150, 255), True, 0.02])
                         self.player.focus_meter = min(self.player.FOCUS_METER_MAX, self.player.focus_meter + 1.5)
 
             # Update tile timers (like geyser)
@@ -926,11 +1064,11 @@ class GameplayState(State):
                 if data.get('type') == 'geyser' and data.get('data', {}).get('timer', 0) > 0:
                     data['data']['timer'] -= 1 * self.world_time_scale
                     if int(data['data']['timer']) == 90: # Erupt
-                        self.game.sounds['super_jump'].play(); self.screen_shake = 10
+                        self.game.sounds.play('super_jump'); self.screen_shake = 10
                         for _ in range(40):
                             angle = self.random.uniform(math.pi * 1.2, math.pi * 1.8)
                             speed = self.random.uniform(1.5, 3.5)
-                            self.sparks.append([[pos[0]*16 + 8, pos[1]*16 - self.height], [math.cos(angle) * speed, math.sin(angle) * speed * 2], self.random.random() * 3 + 2, 0.04, (200, 200, 255), True, 0.1])
+                            self.add_spark([[pos[0]*16 + 8, pos[1]*16 - self.height], [math.cos(angle) * speed, math.sin(angle) * speed * 2], self.random.random() * 3 + 2, 0.04, (200, 200, 255), True, 0.1])
                         p_rect = self.player.rect.copy(); p_rect.y += 2
                         geyser_render_rect = pygame.Rect(pos[0]*16, pos[1]*16 - self.height, 16, 16)
                         if p_rect.colliderect(geyser_render_rect):
@@ -938,6 +1076,10 @@ class GameplayState(State):
         else:
             self.player.opacity = 80; self.player.update([], self.player_time_scale); self.player.rotation -= 16
     
+    def add_spark(self, spark):
+        # Every spark goes through the quality budget, which may thin or drop it
+        self.game.effects.spawn(self.sparks, spark)
+
     def update_sparks(self):
         for i, spark in sorted(enumerate(self.sparks), reverse=True):
             if len(spark) < 8: spark.append(False)
@@ -981,7 +1123,7 @@ class GameplayState(State):
         tile_pos_below = (self.player.rect.midbottom[0] // self.game.TILE_SIZE, (self.player.rect.midbottom[1] + self.height) // self.game.TILE_SIZE)
         player_on_prism = self.player.collisions['bottom'] and tile_pos_below in self.tiles and self.tiles.get(tile_pos_below, {}).get('type') == 'prism'
 
-        self.game.sounds['shoot'].play(); speed = 4;
+        self.game.sounds.play('shoot'); speed = 4;
         if keys[K_UP] or keys[K_w]: vel, pos = [0, -speed], [self.player.rect.centerx, self.player.rect.top]
         elif keys[K_DOWN] or keys[K_s]: vel, pos = [0, speed], [self.player.rect.centerx, self.player.rect.bottom]
         elif self.player.flip[0]: vel, pos = [speed, 0], [self.player.rect.right, self.player.rect.centery]
@@ -996,25 +1138,37 @@ class GameplayState(State):
             angle = random.random() * math.pi * 2
             speed = random.random() * 1.5
             spark_vel = [math.cos(angle) * speed, math.sin(angle) * speed]
-            self.sparks.append([spark_pos_screen.copy(), spark_vel, random.random() * 2 + 1, 0.1, (255, 230, 180), False, 0])
+            self.add_spark([spark_pos_screen.copy(), spark_vel, random.random() * 2 + 1, 0.1, (255, 230, 180), False, 0])
 
         if player_on_prism:
-            self.game.sounds['upgrade'].play()
+            self.game.sounds.play('upgrade')
             angle, spread = math.atan2(vel[1], vel[0]), 0.4
-            self.projectiles.append(Projectile(self.game.animation_manager, pos, (6, 2), 'projectile', self, velocity=vel))
-            self.projectiles.append(Projectile(self.game.animation_manager, pos, (6, 2), 'projectile', self, velocity=[math.cos(angle - spread) * speed, math.sin(angle - spread) * speed]))
-            self.projectiles.append(Projectile(self.game.animation_manager, pos, (6, 2), 'projectile', self, velocity=[math.cos(angle + spread) * speed, math.sin(angle + spread) * speed]))
+            self.projectiles.add(self.projectile_pool.acquire(self.game.animation_manager, pos, (6, 2), 'projectile', self, velocity=vel))
+            self.projectiles.add(self.projectile_pool.acquire(self.game.animation_manager, pos, (6, 2), 'projectile', self, velocity=[math.cos(angle - spread) * speed, math.sin(angle - spread) * speed]))
+            self.projectiles.add(self.projectile_pool.acquire(self.game.animation_manager, pos, (6, 2), 'projectile', self, velocity=[math.cos(angle + spread) * speed, math.sin(angle + spread) * speed]))
         else:
-            self.projectiles.append(Projectile(self.game.animation_manager, pos, (6, 2), 'projectile', self, velocity=vel))
+            self.projectiles.add(self.projectile_pool.acquire(self.game.animation_manager, pos, (6, 2), 'projectile', self, velocity=vel))
         
     def render_background(self, surf):
-        biome = self.game.biomes[self.current_biome_index]; surf.fill(biome['bg_color'])
-        if 'far' in self.game.backgrounds and self.game.backgrounds['far']:
-            scroll_y = (self.height * 0.2) % self.game.DISPLAY_SIZE[1]
-            surf.blit(self.game.backgrounds['far'], (0, scroll_y)); surf.blit(self.game.backgrounds['far'], (0, scroll_y - self.game.DISPLAY_SIZE[1]))
-        if 'near' in self.game.backgrounds and self.game.backgrounds['near']:
-            scroll_y = (self.height * 0.4) % self.game.DISPLAY_SIZE[1]
-            surf.blit(self.game.backgrounds['near'], (0, scroll_y)); surf.blit(self.game.backgrounds['near'], (0, scroll_y - self.game.DISPLAY_SIZE[1]))
+        backgrounds = self.game.backgrounds
+        far, near = backgrounds.get('far'), backgrounds.get('near')
+        if far and not self.game.effects.parallax: near = None # Just the far layer at low quality
+        w, h = self.game.DISPLAY_SIZE
+        far_y, near_y = int((self.height * 0.2) % h), int((self.height * 0.4) % h)
+        if not far:
+            surf.fill(self.biome.bg_color)
+            if near: surf.blit(near, (0, 0), (0, h - near_y, w, h))
+            return
+        # The two layers are composited into bg_frame, which is only redrawn when a layer's
+        # scroll offset moves by a whole pixel; every other frame is one opaque blit
+        key = (far, near, far_y, near_y if near else None)
+        if key != self.bg_frame_key:
+            self.bg_frame.blit(far, (0, 0), (0, h - far_y, w, h))
+            # A layer drawn over itself at the same offset changes nothing
+            if near and not (backgrounds['same'] and near_y == far_y):
+                self.bg_frame.blit(near, (0, 0), (0, h - near_y, w, h))
+            self.bg_frame_key = key
+        surf.blit(self.bg_frame, (0, 0))
 
     def render_plasma(self, surf):
         if self.plasma_y < self.game.DISPLAY_SIZE[1] + self.height:
@@ -1024,7 +1178,7 @@ class GameplayState(State):
             pygame.draw.rect(surf, color, plasma_rect)
             if self.master_clock % 4 == 0:
                 pos = [self.random.randint(0, self.game.DISPLAY_SIZE[0]), self.plasma_y - self.height + 5]
-                self.sparks.append([pos, [0, -self.random.random() * 0.5], self.random.random() * 2 + 1, 0.08, color, False, 0])
+                self.add_spark([pos, [0, -self.random.random() * 0.5], self.random.random() * 2 + 1, 0.08, color, False, 0])
 
     def render_data_nodes(self, surf):
         for data_node_rect in self.data_nodes:
@@ -1033,51 +1187,46 @@ class GameplayState(State):
                 surf.blit(self.data_node_img, render_pos)
 
     def render_placed_tiles(self, surf):
+        regions, tile_region = self.placed_tile_regions, self.tile_region
+        blits = []
         for pos, data in self.tiles.items():
             blit_pos = (pos[0] * self.game.TILE_SIZE, pos[1] * self.game.TILE_SIZE - int(self.height))
             if blit_pos[1] < -self.game.TILE_SIZE or blit_pos[1] > self.game.DISPLAY_SIZE[1]: continue
                 
-            img_map = {'placed_tile': self.placed_tile_img, 'greed': self.greed_tile_img, 'magnetic': self.magnetic_tile_img,
-                       'unstable': self.unstable_tile_img, 'sticky': self.sticky_tile_img, 'fragile': self.fragile_tile_img,
-                       'bounce': self.bounce_tile_img, 'spike': self.spike_tile_img, 'prism': self.prism_tile_img, 
-                       'geyser': self.geyser_tile_img, 'conduit': self.conduit_tile_img,
-                       'conveyor_l': self.conveyor_l_img, 'conveyor_r': self.conveyor_r_img}
-            
-            img_to_blit = img_map.get(data.get('type'), self.tile_img)
-            surf.blit(img_to_blit, blit_pos)
+            page, area = regions.get(data.get('type'), tile_region)
+            blits.append((page, blit_pos, area))
 
-            if data['type'] in ['tile', 'placed_tile'] and (pos[0], pos[1]-1) not in self.tiles: surf.blit(self.tile_top_img, blit_pos)
+            if data['type'] in ['tile', 'placed_tile'] and (pos[0], pos[1]-1) not in self.tiles: blits.append((self.tile_top_region[0], blit_pos, self.tile_top_region[1]))
             if data.get('type') == 'chest':
-                surf.blit(self.chest_img, (blit_pos[0], blit_pos[1] - self.game.TILE_SIZE))
-            elif data.get('type') == 'opened_chest': surf.blit(self.opened_chest_img, (blit_pos[0], blit_pos[1] - self.game.TILE_SIZE))
+                blits.append((self.chest_region[0], (blit_pos[0], blit_pos[1] - self.game.TILE_SIZE), self.chest_region[1]))
+            elif data.get('type') == 'opened_chest': blits.append((self.opened_chest_region[0], (blit_pos[0], blit_pos[1] - self.game.TILE_SIZE), self.opened_chest_region[1]))
             
             if data.get('type') == 'geyser' and data.get('data', {}).get('timer', 0) > 90 and self.master_clock % 5 < 3:
                 angle, speed = self.random.uniform(math.pi * 1.3, math.pi * 1.7), self.random.uniform(0.5, 1.2)
-                self.sparks.append([[blit_pos[0]+8, blit_pos[1]+2], [math.cos(angle)*speed*0.5, math.sin(angle)*speed], self.random.uniform(1,3), 0.1, (200,200,255), False, 0])
+                self.add_spark([[blit_pos[0]+8, blit_pos[1]+2], [math.cos(angle)*speed*0.5, math.sin(angle)*speed], self.random.uniform(1,3), 0.1, (200,200,255), False, 0])
             if data.get('type') == 'conduit' and self.master_clock % 4 == 0:
-                self.sparks.append([
+                self.add_spark([
                     [blit_pos[0] + self.random.random() * 16, blit_pos[1] + self.random.random() * 16],
                     [0, 0], self.random.random() * 1.5, 0.1, (150, 180, 255), False, 0
                 ])
+        surf.blits(blits, doreturn=False)
 
 
     def render_falling_tiles(self, surf):
+        regions, tile_region = self.falling_tile_regions, self.tile_region
+        blits = []
         for tile in self.tile_drops:
             pos = (tile[0], tile[1] - self.height)
             if pos[1] < -self.game.TILE_SIZE or pos[1] > self.game.DISPLAY_SIZE[1]: continue
             
-            img_map = {'greed': self.greed_tile_img, 'motherlode': self.motherlode_tile_img, 'unstable': self.unstable_tile_img,
-                       'magnetic': self.magnetic_tile_img, 'sticky': self.sticky_tile_img, 'fragile': self.fragile_tile_img,
-                       'bounce': self.bounce_tile_img, 'spike': self.spike_tile_img, 'prism': self.prism_tile_img, 
-                       'geyser': self.geyser_tile_img, 'conduit': self.conduit_tile_img,
-                       'conveyor_l': self.conveyor_l_img, 'conveyor_r': self.conveyor_r_img}
-            img_to_blit = img_map.get(tile[2], self.tile_img)
-            surf.blit(img_to_blit, pos)
+            page, area = regions.get(tile[2], tile_region)
+            blits.append((page, pos, area))
             
-            if tile[2] == 'chest': surf.blit(self.ghost_chest_img, (pos[0], pos[1] - self.game.TILE_SIZE))
+            if tile[2] == 'chest': blits.append((self.ghost_chest_region[0], (pos[0], pos[1] - self.game.TILE_SIZE), self.ghost_chest_region[1]))
             if self.random.randint(1, 4) == 1:
                 side = self.random.choice([-1, 1])
-                self.sparks.append([[pos[0] + self.game.TILE_SIZE * (side > 0), pos[1]], [self.random.uniform(-0.05, 0.05), self.random.uniform(0, 0.5)], self.random.uniform(3,5), 0.15, (4,2,12), False, 0])
+                self.add_spark([[pos[0] + self.game.TILE_SIZE * (side > 0), pos[1]], [self.random.uniform(-0.05, 0.05), self.random.uniform(0, 0.5)], self.random.uniform(3,5), 0.15, (4,2,12), False, 0])
+        surf.blits(blits, doreturn=False)
 
     def render_items(self, surf):
         for item in self.items:
@@ -1086,28 +1235,42 @@ class GameplayState(State):
     def render_projectiles(self, surf):
         for p in self.projectiles: p.render(surf, (0, self.height))
 
+    def bake_shield_aura(self):
+        # One (scaled image, alpha) per tick of the pulse. The pulse only spans a few
+        # whole-pixel sizes, so the frames share one scaled image per size.
+        scaled = {}
+        def frame(clock):
+            pulse = math.sin(clock / 8) * 2
+            size = (int(self.shield_aura_img.get_width() + pulse), int(self.shield_aura_img.get_height() + pulse))
+            if size not in scaled: scaled[size] = pygame.transform.scale(self.shield_aura_img, size)
+            return scaled[size], 150 - pulse * 10
+        return PhaseFrames(16 * math.pi, frame)
+
     def render_shield_aura(self, surf):
         if self.player_shielded and not self.dead:
-            # 1. Determine the pulsing size and create the new scaled image first.
-            pulse = math.sin(self.master_clock / 8) * 2
-            pulsing_size = (int(self.shield_aura_img.get_width() + pulse), int(self.shield_aura_img.get_height() + pulse))
-            pulsing = pygame.transform.scale(self.shield_aura_img, pulsing_size)
-
-            # 2. Now, calculate the position based on the NEW scaled image's dimensions to keep it centered.
+            pulsing, alpha = self.shield_aura_frames.at(self.master_clock)
+            # Centered on the player at the frame's own size
             aura_pos = (self.player.rect.centerx - pulsing.get_width() // 2, self.player.rect.centery - pulsing.get_height() // 2)
-            
-            # 3. Set transparency and blit the correctly centered, pulsing aura.
-            pulsing.set_alpha(150 - pulse * 10)
+            pulsing.set_alpha(alpha) # Set per blit, since frames share images
             surf.blit(pulsing, aura_pos, special_flags=BLEND_RGBA_ADD)
         
     def render_sparks(self, surf):
+        glow = self.game.effects.glow
+        if glow and self.lights.scale != self.game.effects.light_scale:
+            self.lights = LightBuffer(self.game.DISPLAY_SIZE, self.game.effects.light_scale)
+        lights, scale = self.lights, self.lights.scale
+        cores = []
         for spark in self.sparks:
             size = int(spark[2])
             pos = (spark[0][0], spark[0][1])
             if size > 0:
-                glow_size = int(size * 1.5 + 2)
-                surf.blit(glow_img(glow_size, (int(spark[4][0]/2),int(spark[4][1]/2),int(spark[4][2]/2))), (pos[0]-glow_size, pos[1]-glow_size), special_flags=BLEND_RGBA_ADD)
-                surf.blit(glow_img(size, spark[4]), (pos[0]-size, pos[1]-size), special_flags=BLEND_RGBA_ADD)
+                if glow: # The halo goes to the light buffer, at its resolution
+                    glow_size = max(1, round(int(size * 1.5 + 2) / scale))
+                    # glow_img circles sit one pixel right of and below the spot they're blitted for
+                    lights.add(glow_img(glow_size, (int(spark[4][0]/2),int(spark[4][1]/2),int(spark[4][2]/2))), (pos[0] + 1, pos[1] + 1))
+                cores.append((glow_img(size, spark[4]), (pos[0]-size, pos[1]-size), None, BLEND_RGBA_ADD))
+        surf.blits(cores, doreturn=False)
+        lights.render(surf)
     
     def render_borders(self, surf):
         scroll_offset = self.height % self.game.TILE_SIZE
@@ -1116,94 +1279,119 @@ class GameplayState(State):
             surf.blit(self.edge_tile_img, (0, y_pos))
             surf.blit(self.edge_tile_img, (self.game.TILE_SIZE * (self.game.WINDOW_TILE_SIZE[0] - 1), y_pos))
 
+    # Focus ring arc resolution: the arc is redrawn when the meter crosses one of this many steps
+    FOCUS_BUCKETS = 96
+
+    def create_hud_widgets(self):
+        w, h = self.game.DISPLAY_SIZE
+        line_height = self.game.white_font.line_height
+        self.hud_widgets = {
+            'coins': HudWidget((w // 2 - 16, max(self.coin_icon.get_height(), 2 + line_height)), self.draw_coin_widget),
+            'combo': HudWidget((160, 20), self.draw_combo_widget),
+            'focus': HudWidget((32, 32), self.draw_focus_widget),
+            'directive': HudWidget((w, line_height + 1), self.draw_directive_widget),
+            'perks': HudWidget((w, 20), self.draw_perk_widget),
+        }
+        self.combo_fonts = {} # color -> Font, for the flashing combo text
+        # Perk bin outline vertices, relative to the bin's center
+        self.perk_hex_offsets = [(8 * math.cos(math.radians(60 * i - 30)), 8 * math.sin(math.radians(60 * i - 30))) for i in range(6)]
+
     def render_hud(self, surface):
+        # Each widget redraws itself only when the values in its key change
+        widgets = self.hud_widgets
+        w, h = self.game.DISPLAY_SIZE
+
         # --- Top-Left HUD (Coins) ---
-        surface.blit(self.coin_icon, (16, 5))
-        self.game.white_font.render(str(self.coins), surface, (26, 7))
+        widgets['coins'].render(surface, (16, 5), self.coins)
 
         # --- Combo Meter ---
         if self.combo_multiplier > 1.0:
-            text = f"{self.combo_multiplier:.1f}x"
-            w = self.game.white_font.width(text, 2)
-            x, y = self.game.DISPLAY_SIZE[0] // 2 - w // 2, 7
-            
             color = (255, 255, 255)
             if self.combo_timer < 60 and self.master_clock % 10 < 5: color = (255, 100, 100)
             elif self.master_clock % 30 < 15 : color = (255, 230, 90)
-
-            combo_font = Font(self.game.get_path('data', 'fonts', 'small_font.png'), color)
-            self.game.black_font.render(text, surface, (x + 1, y + 1), scale=2)
-            combo_font.render(text, surface, (x, y), scale=2)
-            
-            bar_w = (self.combo_timer / self.game.COMBO_DURATION) * 60
-            bar_x = self.game.DISPLAY_SIZE[0] // 2 - 30
-            pygame.draw.rect(surface, (0, 0, 1, 150), [bar_x, y + 15, 60, 4])
-            pygame.draw.rect(surface, color, [bar_x, y + 15, bar_w, 4])
+            bar_w = int((self.combo_timer / self.game.COMBO_DURATION) * 60)
+            widgets['combo'].render(surface, (w // 2 - 80, 7), (f"{self.combo_multiplier:.1f}x", color, bar_w))
 
         # --- Top-Right HUD (Item & Focus Ring) ---
-        item_slot_center = (self.game.DISPLAY_SIZE[0] - 22, 18)
-        focus_bg_radius = 13
-        focus_radius = 12
-        focus_pct = self.player.focus_meter / self.player.FOCUS_METER_MAX
-        
+        player = self.player
+        ready = player.focus_meter >= player.FOCUS_DASH_COST
         # Pulsing background when ready
-        ready_pulse = 0
-        if self.player.focus_meter >= self.player.FOCUS_DASH_COST:
-            ready_pulse = math.sin(self.master_clock / 8) * 2
-        
-        pygame.draw.circle(surface, (40, 50, 60), item_slot_center, int(focus_bg_radius + ready_pulse))
-        
-        if self.player.is_charging_dash:
+        ready_pulse = math.sin(self.master_clock / 8) * 2 if ready else 0
+        if player.is_charging_dash:
             focus_color = (255, 255, 255) if self.master_clock % 10 < 5 else (255, 150, 40)
         else:
-            focus_color = (80, 150, 255) if self.player.focus_meter >= self.player.FOCUS_DASH_COST else (100, 60, 20)
-        
-        pygame.draw.circle(surface, (10, 20, 40), item_slot_center, focus_radius, 3)
-        
-        if focus_pct > 0:
-            start_angle = math.pi / 2
-            end_angle = start_angle - (2 * math.pi * focus_pct)
-            pygame.draw.arc(surface, focus_color, pygame.Rect(item_slot_center[0]-focus_radius, item_slot_center[1]-focus_radius, focus_radius*2, focus_radius*2), end_angle, start_angle, 3)
-        
-        if self.current_item:
-            icon = self.game.item_icons[self.current_item]
-            surface.blit(icon, (item_slot_center[0] - icon.get_width() // 2, item_slot_center[1] - icon.get_height() // 2))
+            focus_color = (80, 150, 255) if ready else (100, 60, 20)
+        focus_pct = player.focus_meter / player.FOCUS_METER_MAX
+        focus_step = math.ceil(focus_pct * self.FOCUS_BUCKETS) if focus_pct > 0 else 0
+        widgets['focus'].render(surface, (w - 22 - 16, 18 - 16), (int(13 + ready_pulse), focus_color, focus_step, self.current_item))
 
         # --- Bottom HUD ---
         # Directive
         if self.directive:
-            y_pos = self.game.DISPLAY_SIZE[1] - 15 
-            prefix = "// DIRECTIVE: "
-            text = self.directive.get('flavor_text', "...")
-            progress = f"({int(self.directive_progress)}/{self.directive.get('value', '?')})"
-            
-            if self.directive.get('completed', False):
-                font = self.font_green # --- FIX ---
-                full_text = ">> DIRECTIVE COMPLETE! <<"
-                w = font.width(full_text); font.render(full_text, surface, (self.game.DISPLAY_SIZE[0]//2 - w//2, y_pos))
-            else:
-                self.game.white_font.render(prefix, surface, (15, y_pos))
-                self.font_highlight.render(text, surface, (15 + self.game.white_font.width(prefix), y_pos)) # --- FIX ---
-                self.game.white_font.render(progress, surface, (15 + self.game.white_font.width(prefix) + self.font_highlight.width(text) + 5, y_pos))
+            completed = self.directive.get('completed', False)
+            progress = None if completed else f"({int(self.directive_progress)}/{self.directive.get('value', '?')})"
+            widgets['directive'].render(surface, (0, h - 15), (self.directive.get('flavor_text', "..."), progress))
 
         # Perk Icons in stylized hex bins
         if self.active_perks:
-            perk_list = sorted(list(self.active_perks))
-            num_perks = len(perk_list)
-            total_width = num_perks * 14
-            x_off = self.game.DISPLAY_SIZE[0]//2 - total_width//2
-            y_pos = self.game.DISPLAY_SIZE[1] - (30 if self.directive else 18)
-
-            for key in perk_list:
-                if key in self.game.perk_icons:
-                    icon = self.game.perk_icons[key]
-                    hex_points = []
-                    for i in range(6):
-                        angle = math.radians(60 * i - 30)
-                        hex_points.append((x_off + 7 + 8 * math.cos(angle), y_pos + 7 + 8 * math.sin(angle)))
-                    
-                    pygame.draw.polygon(surface, (140, 245, 250, 50), hex_points)
-                    pygame.draw.polygon(surface, (140, 245, 250), hex_points, 1)
-                    
-                    surface.blit(icon, (x_off + 2, y_pos + 2))
-                    x_off += 16
\ No newline at end of file
+            y_pos = h - (30 if self.directive else 18)
+            widgets['perks'].render(surface, (0, y_pos - 2), (tuple(sorted(self.active_perks)), y_pos))
+
+    def draw_coin_widget(self, surf, coins):
+        surf.blit(self.coin_icon, (0, 0))
+        self.game.white_font.render(str(coins), surf, (10, 2))
+
+    def draw_combo_widget(self, surf, key):
+        text, color, bar_w = key
+        center_x = surf.get_width() // 2
+        w = self.game.white_font.width(text, 2)
+        x = center_x - w // 2
+        if color not in self.combo_fonts:
+            self.combo_fonts[color] = Font(self.game.get_path('data', 'fonts', 'small_font.png'), color)
+        self.game.black_font.render(text, surf, (x + 1, 1), scale=2)
+        self.combo_fonts[color].render(text, surf, (x, 0), scale=2)
+
+        bar_x = center_x - 30
+        pygame.draw.rect(surf, (0, 0, 1, 150), [bar_x, 15, 60, 4])
+        pygame.draw.rect(surf, color, [bar_x, 15, bar_w, 4])
+
+    def draw_focus_widget(self, surf, key):
+        bg_radius, focus_color, focus_step, item = key
+        item_slot_center = (16, 16)
+        focus_radius = 12
+        pygame.draw.circle(surf, (40, 50, 60), item_slot_center, bg_radius)
+        pygame.draw.circle(surf, (10, 20, 40), item_slot_center, focus_radius, 3)
+
+        if focus_step > 0:
+            start_angle = math.pi / 2
+            end_angle = start_angle - (2 * math.pi * focus_step / self.FOCUS_BUCKETS)
+            pygame.draw.arc(surf, focus_color, pygame.Rect(item_slot_center[0]-focus_radius, item_slot_center[1]-focus_radius, focus_radius*2, focus_radius*2), end_angle, start_angle, 3)
+
+        if item:
+            icon = self.game.item_icons[item]
+            surf.blit(icon, (item_slot_center[0] - icon.get_width() // 2, item_slot_center[1] - icon.get_height() // 2))
+
+    def draw_directive_widget(self, surf, key):
+        text, progress = key
+        prefix = "// DIRECTIVE: "
+        if progress is None:
+            font = self.font_green # --- FIX ---
+            full_text = ">> DIRECTIVE COMPLETE! <<"
+            w = font.width(full_text); font.render(full_text, surf, (surf.get_width()//2 - w//2, 0))
+        else:
+            self.game.white_font.render(prefix, surf, (15, 0))
+            self.font_highlight.render(text, surf, (15 + self.game.white_font.width(prefix), 0)) # --- FIX ---
+            self.game.white_font.render(progress, surf, (15 + self.game.white_font.width(prefix) + self.font_highlight.width(text) + 5, 0))
+
+    def draw_perk_widget(self, surf, key):
+        perk_list, y_pos = key
+        total_width = len(perk_list) * 14
+        x_off = surf.get_width()//2 - total_width//2
+        top = y_pos - 2 # The widget's screen y; vertices are placed as on screen, then shifted, so they round the same
+        for key in perk_list:
+            if key in self.game.perk_icons:
+                hex_points = [(x_off + 7 + dx, y_pos + 7 + dy - top) for dx, dy in self.perk_hex_offsets]
+                pygame.draw.polygon(surf, (140, 245, 250, 50), hex_points)
+                pygame.draw.polygon(surf, (140, 245, 250), hex_points, 1)
+                surf.blit(self.game.perk_icons[key], (x_off + 2, 4))
+                x_off += 16
@@ -1,48 +1,86 @@
 # data/scripts/gemini_agent.py
-import google.generativeai as genai
-import os
 import json
 import threading
 
+from .ai_backends import create_backend
+
+DIRECTIVE_OBJECTIVES = ['collect_coins', 'destroy_tiles_dash', 'reach_combo']
+DIRECTIVE_REWARDS = ['coins', 'item']
+
+def validate_directive(data):
+    """Returns True if `data` is a directive the gameplay state can track."""
+    if not isinstance(data, dict): return False
+    if data.get('objective_type') not in DIRECTIVE_OBJECTIVES: return False
+    if not isinstance(data.get('value'), (int, float)) or data['value'] <= 0: return False
+    if data.get('reward_type') not in DIRECTIVE_REWARDS: return False
+    if data['reward_type'] == 'coins' and not isinstance(data.get('reward_value'), int): return False
+    if data['reward_type'] == 'item' and not isinstance(data.get('reward_value'), str): return False
+    return isinstance(data.get('flavor_text'), str)
+
+def validate_character(data):
+    """Returns True if `data` can be loaded as a playable character."""
+    if not isinstance(data, dict): return False
+    if not isinstance(data.get('name'), str) or not isinstance(data.get('desc'), str): return False
+    mods = data.get('mods', {})
+    if not isinstance(mods, dict): return False
+    perks = mods.get('innate_perks', [])
+    if not isinstance(perks, list) or not all(isinstance(p, str) for p in perks): return False
+    return isinstance(mods.get('starting_item', ''), str)
+
+VALIDATORS = {'directive': validate_directive, 'character': validate_character}
+
 class GeminiAgent:
-    def __init__(self, api_key):
-        # Configure the API key
-        genai.configure(api_key=api_key)
-        # --- MODIFIED: Use the recommended 'gemini-1.5-flash' model
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+    def __init__(self, api_key=None, backend=None):
+        # The backend produces the raw text (Gemini or the offline LocalBackend);
+        # the agent owns threading and parsing so both behave the same in-game.
+        self.backend = backend if backend else create_backend('gemini', api_key=api_key)
         self.response = None
+        self.partial_response = "" # Raw text received so far while a streamed request is running
         self.is_thinking = False
 
-    def get_threaded_response(self, prompt, is_directive=False):
+    def get_threaded_response(self, prompt, is_directive=False, request_type=None, stream=False):
         # Starts the API call in a new thread
         if self.is_thinking:
             return # Don't start a new request if one is in progress
-        
+
         self.is_thinking = True
         self.response = None # Clear old response
+        self.partial_response = ""
 
-        thread = threading.Thread(target=self._get_response, args=(prompt, is_directive))
+        if request_type is None:
+            request_type = 'directive' if is_directive else 'chat'
+        thread = threading.Thread(target=self._get_response, args=(prompt, request_type, stream))
         thread.start()
 
-    def _get_response(self, prompt, is_directive):
+    def _get_response(self, prompt, request_type, stream=False):
         # This is the function the thread will run
         try:
-            api_response = self.model.generate_content(prompt)
-            # --- NEW: Prophecy JSON parsing logic ---
-            if is_directive:
-                try:
-                    # The model might return the JSON string within markdown backticks
-                    cleaned_text = api_response.text.strip().replace('```json', '').replace('```', '')
-                    directive_data = json.loads(cleaned_text)
-                    # This response is handled differently, it's saved directly
-                    # to game.save_data['active_directive'] in PlayerHubState
-                    self.response = directive_data 
-                except (json.JSONDecodeError, TypeError):
-                    self.response = "The Mainframe's directive is corrupted. Try again."
+            if stream and hasattr(self.backend, 'generate_stream'):
+                for chunk in self.backend.generate_stream(prompt, request_type):
+                    self.partial_response += chunk
+                self.response = self.parse_response(self.partial_response, request_type)
             else:
-                 self.response = api_response.text
-            # ---
+                self.response = self.generate(prompt, request_type)
         except Exception as e:
             self.response = f"Connection to Mainframe lost... (Error: {e})"
         finally:
-            self.is_thinking = False
\ No newline at end of file
+            self.is_thinking = False
+
+    def generate(self, prompt, request_type='chat'):
+        # Blocking call that leaves self.response alone, for background workers like the DirectivePool
+        return self.parse_response(self.backend.generate(prompt, request_type), request_type)
+
+    def parse_response(self, text, request_type):
+        if request_type == 'chat':
+            return text
+        try:
+            # The model might return the JSON string within markdown backticks
+            cleaned_text = text.strip().replace('```json', '').replace('```', '')
+            data = json.loads(cleaned_text)
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            data = None
+        validator = VALIDATORS.get(request_type)
+        if data is None or (validator and not validator(data)):
+            return "The Mainframe's directive is corrupted. Try again."
+        # Directives are saved directly to game.save_data['active_directive'] in PlayerHubState
+        return data
@@ -0,0 +1,28 @@
+# data/scripts/hud.py
+import pygame
+
+class HudWidget:
+    """
+    One piece of the HUD, drawn into a colorkeyed surface of its own. render() takes
+    a key built from the values the widget shows and only calls draw(surf, key) again
+    when the key changes; otherwise it's a single blit of the last drawing. draw()
+    works in the widget's local coordinates.
+    """
+    def __init__(self, size, draw, colorkey=(0, 0, 0)):
+        self.surf = pygame.Surface(size).convert()
+        self.surf.set_colorkey(colorkey)
+        self.draw = draw
+        self.colorkey = colorkey
+        self.key = None
+        self.redraws = 0
+
+    def invalidate(self):
+        self.key = None
+
+    def render(self, surface, pos, key):
+        if key != self.key:
+            self.surf.fill(self.colorkey)
+            self.draw(self.surf, key)
+            self.key = key
+            self.redraws += 1
+        surface.blit(self.surf, pos)
@@ -0,0 +1,110 @@
+# data/scripts/quality.py
+import time
+
+# What each quality level allows. 'high' is the game as it always looked.
+#   particle_cap:   most sparks alive at once; new ones past it are dropped
+#   particle_scale: share of each burst that's actually spawned
+#   glow:           the soft halo drawn around every spark
+#   light_scale:    the glow light buffer is 1/light_scale of the display's resolution
+#   parallax:       the near background layer (off leaves just the far one)
+#   scanlines:      full-screen scanline overlays on the menus
+#   screen_shake:   camera shake (the player's own setting can still turn it off)
+#   ghost_trails:   afterimages left by jumps
+QUALITY_PRESETS = {
+    'low': {'particle_cap': 120, 'particle_scale': 0.35, 'glow': False, 'light_scale': 2, 'parallax': False, 'scanlines': False, 'screen_shake': False, 'ghost_trails': False},
+    'medium': {'particle_cap': 400, 'particle_scale': 0.7, 'glow': True, 'light_scale': 2, 'parallax': True, 'scanlines': False, 'screen_shake': True, 'ghost_trails': True},
+    'high': {'particle_cap': 2000, 'particle_scale': 1.0, 'glow': True, 'light_scale': 1, 'parallax': True, 'scanlines': True, 'screen_shake': True, 'ghost_trails': True},
+}
+QUALITY_LEVELS = ('low', 'medium', 'high') # Worst to best, the order auto mode steps through
+QUALITY_MODES = ('auto',) + QUALITY_LEVELS # Values of save_data['settings']['quality']
+
+# Auto mode: the average frame time (update + render + present, without the wait for the
+# next tick) is checked once per window of frames. Over budget steps one level down; well
+# under it for several windows in a row steps back up.
+FRAME_BUDGET_MS = 1000 / 60
+AUTO_WINDOW = 120
+AUTO_DOWN_AT = 0.9 # of the budget
+AUTO_UP_AT = 0.5
+AUTO_UP_WINDOWS = 5
+
+
+class EffectBudget:
+    """
+    Applies the quality setting. Everything that spawns sparks does it through
+    spawn(), which thins bursts down to the level's particle_scale and drops
+    sparks over its particle_cap; the other flags are read straight off it
+    (budget.glow, budget.parallax, ...) by the code that draws those effects.
+
+    Thinning is done with a running credit instead of random rolls, so bursts lose
+    the same share every time and the gameplay RNG is never touched.
+    """
+    def __init__(self, mode='auto'):
+        # Metrics, shown by the debug overlay
+        self.spawned = 0
+        self.thinned = 0
+        self.capped = 0
+        self.level_changes = 0
+        self.level = 'high'
+        self.set_level(self.level) # Auto mode starts from the top
+        self.spawn_credit = 0.0
+        self.frame_started = 0.0
+        self.frame_times = []
+        self.fast_windows = 0
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        self.mode = mode if mode in QUALITY_MODES else 'auto'
+        if self.mode != 'auto': self.set_level(self.mode)
+        self.frame_times.clear()
+        self.fast_windows = 0
+
+    def set_level(self, level):
+        if level != self.level: self.level_changes += 1
+        self.level = level
+        self.preset = QUALITY_PRESETS[level]
+        self.particle_cap = self.preset['particle_cap']
+        self.particle_scale = self.preset['particle_scale']
+        self.glow = self.preset['glow']
+        self.light_scale = self.preset['light_scale']
+        self.parallax = self.preset['parallax']
+        self.scanlines = self.preset['scanlines']
+        self.screen_shake = self.preset['screen_shake']
+        self.ghost_trails = self.preset['ghost_trails']
+
+    def spawn(self, sparks, spark):
+        """Adds `spark` to `sparks` if the budget has room for it. Returns True if it did."""
+        self.spawn_credit += self.particle_scale
+        if self.spawn_credit < 1:
+            self.thinned += 1
+            return False
+        self.spawn_credit -= 1
+        if len(sparks) >= self.particle_cap:
+            self.capped += 1
+            return False
+        sparks.append(spark)
+        self.spawned += 1
+        return True
+
+    def frame_start(self):
+        self.frame_started = time.perf_counter()
+
+    def frame_end(self):
+        if self.mode != 'auto': return
+        self.frame_times.append(time.perf_counter() - self.frame_started)
+        if len(self.frame_times) < AUTO_WINDOW: return
+        average_ms = sum(self.frame_times) / len(self.frame_times) * 1000
+        self.frame_times.clear()
+        index = QUALITY_LEVELS.index(self.level)
+        if average_ms > FRAME_BUDGET_MS * AUTO_DOWN_AT:
+            self.fast_windows = 0
+            if index > 0: self.set_level(QUALITY_LEVELS[index - 1])
+        elif average_ms < FRAME_BUDGET_MS * AUTO_UP_AT:
+            self.fast_windows += 1
+            if self.fast_windows >= AUTO_UP_WINDOWS and index < len(QUALITY_LEVELS) - 1:
+                self.set_level(QUALITY_LEVELS[index + 1])
+                self.fast_windows = 0
+        else:
+            self.fast_windows = 0
+
+    def get_stats(self):
+        return {'mode': self.mode, 'level': self.level, 'spawned': self.spawned, 'thinned': self.thinned, 'capped': self.capped, 'level_changes': self.level_changes}
@@ -0,0 +1,241 @@
+# data/scripts/sound_manager.py
+import io
+import os
+import threading
+import time
+
+import pygame
+
+from .asset_bundle import open_asset
+
+SFX_CHANNELS = 12
+
+# name -> (priority, max voices, min retrigger interval in ms). Higher priority sounds can
+# steal channels from lower ones; bursty sounds (coin showers, tile landings, explosions,
+# turret fire) are capped so they can't flood the mixer.
+SOUND_RULES = {
+    'coin': (1, 3, 45), 'coin_end': (1, 1, 40), 'block_land': (1, 3, 60), 'land': (1, 1, 80),
+    'shoot': (2, 2, 70), 'explosion': (2, 3, 70), 'collect_item': (3, 2, 30),
+    'chest_open': (3, 2, 30), 'chest_destroy': (3, 2, 30), 'combo_end': (3, 1, 100),
+    'jump': (4, 2, 0), 'super_jump': (4, 2, 0), 'warp': (4, 1, 0), 'artifact_equip': (4, 1, 0),
+    'time_slow_start': (4, 1, 0), 'time_slow_end': (4, 1, 0), 'time_empty': (4, 1, 0),
+    'upgrade': (5, 2, 0), 'directive_complete': (5, 1, 0), 'death': (5, 1, 0),
+}
+DEFAULT_RULE = (2, 2, 30)
+
+# Menu/UI feedback, decoded at startup so the first button press never waits on a decode.
+# Everything else is decoded by the background loader, or on first play if that's sooner.
+RESIDENT_SOUNDS = ('coin', 'combo_end', 'upgrade', 'coin_end', 'artifact_equip')
+
+
+class MixerBackend:
+    """ Plays sounds through a fixed set of pygame.mixer channels. """
+    def __init__(self, num_channels):
+        pygame.mixer.set_num_channels(num_channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(num_channels)]
+
+    def load(self, path):
+        with open_asset(path) as f: return pygame.mixer.Sound(f)
+
+    def play(self, channel, sound, volume):
+        self.channels[channel].play(sound)
+        self.channels[channel].set_volume(volume) # After play(), which resets it
+
+    def is_busy(self, channel):
+        return self.channels[channel].get_busy()
+
+
+class NullBackend:
+    """
+    Silent stand-in for headless runs (no audio device, benchmarks, CI). Sounds are
+    "loaded" as their paths and every channel is always free, so SoundManager's
+    rules and counters still run as they would with a real mixer.
+    """
+    def __init__(self, num_channels):
+        self.channels = [None] * num_channels
+
+    def load(self, path):
+        return path
+
+    def play(self, channel, sound, volume):
+        pass
+
+    def is_busy(self, channel):
+        return False
+
+
+def create_audio_backend(name, num_channels=SFX_CHANNELS):
+    """ Builds the audio backend registered under `name` ('mixer' or 'null'). """
+    if name == 'null':
+        return NullBackend(num_channels)
+    if name == 'mixer':
+        return MixerBackend(num_channels)
+    raise ValueError(f"Unknown audio backend '{name}'. Expected 'mixer' or 'null'.")
+
+
+class SoundManager:
+    """
+    Front-end for sound effects. Game code just calls play(name): unknown names are
+    ignored, and each sound's SOUND_RULES entry decides whether it actually starts.
+    A sound re-triggered within its interval is skipped, one already at its voice
+    limit restarts on its oldest channel, and when every channel is busy it steals
+    the oldest one of equal or lower priority (or is dropped if there is none).
+
+    Files are only registered by load(); they're decoded on first use, by
+    load_in_background(), or straight away for RESIDENT_SOUNDS. Volume is applied
+    per voice, so aliases sharing one decoded sound keep their own volume.
+    """
+    def __init__(self, backend, rules=SOUND_RULES):
+        self.backend = backend
+        self.rules = rules
+        self.paths = {} # name -> file, for every sound with a file of its own
+        self.aliases = {} # name -> name it falls back to
+        self.sounds = {} # name -> decoded sound
+        self.volumes = {}
+        self.decode_lock = threading.Lock()
+        num_channels = len(backend.channels)
+        self.voice_names = [None] * num_channels # What each channel was last given
+        self.voice_priority = [0] * num_channels
+        self.voice_started = [0.0] * num_channels
+        self.last_played = {}
+        # Metrics, shown by the debug overlay
+        self.played = 0
+        self.throttled = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def __contains__(self, name):
+        return self.resolve(name) is not None
+
+    def load(self, name, path):
+        self.paths[name] = path
+        if name in RESIDENT_SOUNDS: self.get(name)
+
+    def alias(self, name, target):
+        # Fallback for a sound with no file of its own, like dict.setdefault
+        if name not in self.paths and name not in self.aliases: self.aliases[name] = target
+        if name in RESIDENT_SOUNDS: self.get(name)
+
+    def resolve(self, name):
+        """Name of the file-backed sound `name` plays, following aliases, or None."""
+        seen = set()
+        while name not in self.paths:
+            if name in seen or name not in self.aliases: return None
+            seen.add(name)
+            name = self.aliases[name]
+        return name
+
+    def get(self, name):
+        """The decoded sound for `name`, decoding it now if the loader hasn't got to it yet."""
+        source = self.resolve(name)
+        if source is None: return None
+        sound = self.sounds.get(source)
+        if sound is None:
+            with self.decode_lock:
+                sound = self.sounds.get(source)
+                if sound is None:
+                    sound = self.sounds[source] = self.backend.load(self.paths[source])
+        return sound
+
+    def load_in_background(self):
+        threading.Thread(target=self._decode_all, daemon=True).start()
+
+    def _decode_all(self):
+        for name in list(self.paths):
+            try:
+                self.get(name)
+            except pygame.error:
+                pass # Left for play(), which fails the same way it always did
+
+    def set_volumes(self, base_volumes, sfx_volume):
+        for name in list(self.paths) + list(self.aliases):
+            self.volumes[name] = base_volumes.get(name, 1.0) * sfx_volume
+
+    def play(self, name):
+        """Starts `name` if its rules allow it. Returns True if it's playing."""
+        sound = self.get(name)
+        if sound is None: return False
+        priority, max_voices, min_interval = self.rules.get(name, DEFAULT_RULE)
+        now = time.perf_counter()
+        if (now - self.last_played.get(name, -1.0)) * 1000 < min_interval:
+            self.throttled += 1
+            return False
+
+        backend, names, started = self.backend, self.voice_names, self.voice_started
+        free, own, stealable = None, [], None
+        for channel in range(len(names)):
+            if not backend.is_busy(channel):
+                if free is None: free = channel
+                names[channel] = None
+            elif names[channel] == name:
+                own.append(channel)
+            elif self.voice_priority[channel] <= priority:
+                if stealable is None or started[channel] < started[stealable]: stealable = channel
+
+        if len(own) >= max_voices:
+            channel = min(own, key=lambda c: started[c])
+        elif free is not None:
+            channel = free
+        elif stealable is not None:
+            channel = stealable
+            self.stolen += 1
+        else:
+            self.dropped += 1
+            return False
+
+        backend.play(channel, sound, self.volumes.get(name, 1.0))
+        names[channel], self.voice_priority[channel], started[channel] = name, priority, now
+        self.last_played[name] = now
+        self.played += 1
+        return True
+
+    def get_stats(self):
+        active = sum(1 for channel in range(len(self.voice_names)) if self.backend.is_busy(channel))
+        return {'channels': len(self.voice_names), 'active': active, 'decoded': len(self.sounds), 'played': self.played, 'throttled': self.throttled, 'stolen': self.stolen, 'dropped': self.dropped}
+
+
+class MusicPlayer:
+    """
+    Background music, streamed by pygame.mixer.music rather than decoded up front.
+    Tracks are switched per biome; preload() reads the next one into memory on a
+    background thread so the switch doesn't wait on the disk. Does nothing if the
+    mixer isn't available.
+    """
+    def __init__(self, fade_ms=1000):
+        self.enabled = pygame.mixer.get_init() is not None
+        self.fade_ms = fade_ms
+        self.current = None
+        self.preloaded = {} # path -> file contents
+        self.lock = threading.Lock()
+
+    def play(self, path):
+        if not self.enabled or path == self.current: return
+        with self.lock: data = self.preloaded.pop(path, None)
+        try:
+            if data is not None:
+                pygame.mixer.music.load(io.BytesIO(data), os.path.splitext(path)[1][1:])
+            else:
+                pygame.mixer.music.load(path)
+            pygame.mixer.music.play(-1, fade_ms=self.fade_ms if self.current else 0)
+        except pygame.error as e:
+            print(f"Warning: Could not play music '{path}'. Reason: {e}")
+        self.current = path
+
+    def preload(self, path):
+        if not self.enabled or path == self.current: return
+        with self.lock:
+            if path in self.preloaded: return
+            self.preloaded[path] = None # Claimed, so it's only read once
+        threading.Thread(target=self._read, args=(path,), daemon=True).start()
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f: data = f.read()
+        except OSError:
+            data = None
+        with self.lock:
+            if data is None: self.preloaded.pop(path, None)
+            else: self.preloaded[path] = data
+
+    def set_volume(self, volume):
+        if self.enabled: pygame.mixer.music.set_volume(volume)
@@ -0,0 +1,35 @@
+# data/scripts/spatial_index.py
+
+class SpatialIndex:
+    """
+    Uniform grid over world-space rects, rebuilt once per frame by GameplayState.
+    Entries are filed under a layer name ('tile_drops', 'projectiles', ...) so a single
+    index answers every broadphase query of the frame. A query only looks at the
+    cells the rect overlaps, so its cost depends on what's nearby, not on list sizes.
+    """
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.cells = {} # (layer, cell_x, cell_y) -> [(handle, rect), ...]
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, layer, handle, rect):
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                key = (layer, cell_x, cell_y)
+                if key in self.cells: self.cells[key].append((handle, rect))
+                else: self.cells[key] = [(handle, rect)]
+
+    def query(self, layer, rect):
+        """Returns the (handle, rect) entries of `layer` that collide with rect, each once."""
+        size = self.cell_size
+        hits = []
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                bucket = self.cells.get((layer, cell_x, cell_y))
+                if not bucket: continue
+                for entry in bucket:
+                    if entry[1].colliderect(rect) and entry not in hits: hits.append(entry)
+        return hits
@@ -3,8 +3,35 @@ import pygame, sys
 
 class State:
     """ Base class for all game states. """
+    # Animation ids this state, and the states it leads into, will want. Game.push_state
+    # has the AnimationManager load them in the background; anything left out is still
+    # loaded the first time it's used.
+    ANIMATIONS = ()
+    # Mostly-static screens set this and report what changed each frame through
+    # mark_dirty()/watch(). Game.run then skips frames where nothing did and only
+    # copies the changed regions to the window on the rest.
+    DIRTY_RECTS = False
+
     def __init__(self, game):
         self.game = game
+        self.dirty_rects = None # Changed display regions this frame; None is the whole screen
+        self.watched = {} # rect -> values it was last drawn with, for watch()
+
+    def mark_dirty(self, rect=None):
+        """ Flags a display region (or, with no rect, the whole screen) as needing a redraw. """
+        if rect is None or self.game.display.get_rect() == rect: self.dirty_rects = None
+        elif self.dirty_rects is not None: self.dirty_rects.append(pygame.Rect(rect))
+
+    def watch(self, rect, *values):
+        """ Marks `rect` dirty if the values drawn in it differ from last frame's. """
+        key = tuple(rect)
+        if self.watched.get(key) != values:
+            self.watched[key] = values
+            self.mark_dirty(rect)
+
+    def take_dirty_rects(self):
+        rects, self.dirty_rects = self.dirty_rects, []
+        return rects
 
     def handle_events(self, events):
         """ Process all events for this state. """
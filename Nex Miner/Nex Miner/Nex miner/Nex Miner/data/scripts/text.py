@@ -2,11 +2,12 @@
 import pygame, sys
 from .core_funcs import *
 from .clip import clip
+from .asset_bundle import load_image
 
 def load_font_img(path, font_color):
     fg_color = (255, 0, 0)
     bg_color = (0, 0, 0)
-    font_img = pygame.image.load(path).convert()
+    font_img = load_image(path).convert()
     font_img = swap_color(font_img, fg_color, font_color)
     last_x = 0
     letters = []
@@ -0,0 +1,45 @@
+# data/scripts/texture_atlas.py
+import pygame
+
+class TextureAtlas:
+    """
+    Packs small colorkeyed images (animation frames, tiles) into a few shared page
+    surfaces, left to right in shelves. add() returns the image's region as
+    (page, rect): blit it with surf.blit(page, pos, rect), or in bulk with
+    surf.blits([(page, pos, rect), ...]). subsurface() gives a Surface view of a
+    region for code that wants a plain image; it shares the page's pixels and colorkey.
+    Images bigger than a page aren't packed and add() returns None for them.
+    """
+    def __init__(self, page_size=(256, 256), colorkey=(0, 0, 0), padding=1):
+        self.page_size = page_size
+        self.colorkey = colorkey
+        self.padding = padding
+        self.pages = []
+        self.shelf_x = self.shelf_y = self.shelf_height = 0
+
+    def new_page(self):
+        page = pygame.Surface(self.page_size).convert()
+        page.fill(self.colorkey)
+        page.set_colorkey(self.colorkey)
+        self.pages.append(page)
+        self.shelf_x = self.shelf_y = self.shelf_height = 0
+        return page
+
+    def add(self, img):
+        w, h = img.get_size()
+        pad = self.padding
+        if w + pad > self.page_size[0] or h + pad > self.page_size[1]: return None
+        if not self.pages: self.new_page()
+        if self.shelf_x + w + pad > self.page_size[0]: # Next shelf
+            self.shelf_x, self.shelf_y, self.shelf_height = 0, self.shelf_y + self.shelf_height, 0
+        if self.shelf_y + h + pad > self.page_size[1]:
+            self.new_page()
+        page = self.pages[-1]
+        rect = pygame.Rect(self.shelf_x, self.shelf_y, w, h)
+        page.blit(img, rect)
+        self.shelf_x += w + pad
+        self.shelf_height = max(self.shelf_height, h + pad)
+        return page, rect
+
+    def subsurface(self, region):
+        return region[0].subsurface(region[1])
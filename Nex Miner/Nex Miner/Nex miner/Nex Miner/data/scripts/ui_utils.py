@@ -1,4 +1,5 @@
 # data/scripts/ui_utils.py
+import math
 import pygame
 
 # Cache for generated glow surfaces to improve performance
@@ -15,6 +16,22 @@ def glow_img(size, color):
         GLOW_CACHE[key] = surf
     return GLOW_CACHE[key]
 
+class PhaseFrames:
+    """
+    A periodic effect (a pulse driven by sin(master_clock / k), which repeats every
+    2*pi*k ticks) baked once into a table of frames spread over one period.
+    make_frame(clock) builds the frame for that clock value; at(clock) returns the
+    baked frame nearest below the clock's phase, so per-frame rendering is a lookup.
+    By default there's one frame per tick of the period.
+    """
+    def __init__(self, period, make_frame, count=None):
+        self.period = period
+        count = count or math.ceil(period)
+        self.frames = [make_frame(period * i / count) for i in range(count)]
+
+    def at(self, clock):
+        return self.frames[int(clock % self.period / self.period * len(self.frames)) % len(self.frames)]
+
 def render_panel_9slice(surface, rect, panel_img, corner_size):
     """
     Renders a resizable panel using a 9-slice image.